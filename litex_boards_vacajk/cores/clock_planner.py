@@ -0,0 +1,196 @@
+#
+# This file is part of LiteX-Boards.
+
+import math
+import logging
+import functools
+
+from litex.soc.cores.clock.common import compute_config_log
+from litex.soc.cores.clock.xilinx_s7 import S7MMCM
+
+# MMCM Solver --------------------------------------------------------------------------------------
+
+# 7-Series MMCME2 limits (DS182/UG472): VCO and phase detector frequencies per speedgrade.
+s7mmcm_limits = {
+    -1: {"vco": (600e6, 1200e6), "pfd": (10e6, 450e6)},
+    -2: {"vco": (600e6, 1440e6), "pfd": (10e6, 500e6)},
+    -3: {"vco": (600e6, 1600e6), "pfd": (10e6, 550e6)},
+}
+s7mmcm_nclkouts = 7
+
+@functools.lru_cache(maxsize=None)
+def vco_configs(clkin_freq, speedgrade=-2):
+    """Valid (vco_freq, divclk_divide, clkfbout_mult) of a MMCM (CLKFBOUT_MULT_F by 1/8 steps)."""
+    limits = s7mmcm_limits[speedgrade]
+    r = []
+    for divclk_divide in range(1, 106 + 1):
+        pfd_freq = clkin_freq/divclk_divide
+        if not (limits["pfd"][0] <= pfd_freq <= limits["pfd"][1]):
+            continue
+        # Only the multipliers keeping the VCO in range.
+        mult_min = max(2*8,  math.ceil(limits["vco"][0]/pfd_freq*8))
+        mult_max = min(64*8, math.floor(limits["vco"][1]/pfd_freq*8))
+        for mult in range(mult_min, mult_max + 1):
+            r.append((pfd_freq*mult/8, divclk_divide, mult/8))
+    return tuple(r)
+
+def jitter_estimate(freq, vco_freq, pfd_freq, fractional=False):
+    """Rough output period jitter estimate (ps, peak-to-peak), following the Clocking Wizard trends
+    (lower with higher output, VCO and phase detector frequencies and integer dividers). Only meant
+    to rank configurations and report orders of magnitude, not for timing closure."""
+    return 20 + 500/math.sqrt(freq/1e6) + 1e4/(vco_freq/1e6) + 300/math.sqrt(pfd_freq/1e6) + 25*fractional
+
+def _dividers(ratio, fractional):
+    """Nearest CLKOUT dividers of `ratio` (integer 1-128, fractional 2-128 by 1/8 steps)."""
+    if fractional:
+        return {min(max(f(ratio*8)/8, 2), 128) for f in [math.floor, math.ceil]}
+    return {min(max(f(ratio), 1), 128) for f in [math.floor, math.ceil]}
+
+@functools.lru_cache(maxsize=None)
+def solve_mmcm(clkin_freq, clocks, speedgrade=-2):
+    """Best MMCM configuration for `clocks`: tuple of (freq, margin, fractional) where `fractional`
+    allows the fractional CLKOUT0 divider (only one clock can use it).
+
+    For each VCO configuration, dividers are computed directly from the frequency ratios (instead
+    of searched) and the configuration with the lowest total frequency error, then lowest jitter,
+    is selected. Returns None when no configuration fits the margins, else {vco, divclk_divide,
+    clkfbout_mult, divides, freqs, errors, jitters, fractional (clock index or None)}.
+    """
+    best, best_cost = None, None
+    for vco_freq, divclk_divide, clkfbout_mult in vco_configs(clkin_freq, speedgrade):
+        divides, fractional = [], None
+        for n, (freq, margin, allow_fractional) in enumerate(clocks):
+            d = min(_dividers(vco_freq/freq, False), key=lambda d: abs(vco_freq/d - freq))
+            if abs(vco_freq/d - freq) > freq*margin:
+                if not allow_fractional or fractional is not None:
+                    break
+                d = min(_dividers(vco_freq/freq, True), key=lambda d: abs(vco_freq/d - freq))
+                if abs(vco_freq/d - freq) > freq*margin:
+                    break
+                fractional = n
+            divides.append(d)
+        else:
+            pfd_freq = clkin_freq/divclk_divide
+            errors   = [(vco_freq/d - f)/f for d, (f, _, _) in zip(divides, clocks)]
+            jitters  = [jitter_estimate(vco_freq/d, vco_freq, pfd_freq,
+                fractional = (n == fractional) or (clkfbout_mult != int(clkfbout_mult)))
+                for n, d in enumerate(divides)]
+            cost = (round(sum(abs(e) for e in errors), 12), max(jitters))
+            if best_cost is None or cost < best_cost:
+                best_cost = cost
+                best = {
+                    "vco"           : vco_freq,
+                    "divclk_divide" : divclk_divide,
+                    "clkfbout_mult" : clkfbout_mult,
+                    "divides"       : divides,
+                    "freqs"         : [vco_freq/d for d in divides],
+                    "errors"        : errors,
+                    "jitters"       : jitters,
+                    "fractional"    : fractional,
+                }
+    return best
+
+# Clock Planner ------------------------------------------------------------------------------------
+
+def _partitions(units):
+    """Set partitions of `units` (list)."""
+    if not units:
+        yield []
+        return
+    first, rest = units[0], units[1:]
+    for partition in _partitions(rest):
+        yield [[first]] + partition
+        for i in range(len(partition)):
+            yield partition[:i] + [[first] + partition[i]] + partition[i + 1:]
+
+def plan_clocks(clkin_freq, clocks, groups=[], speedgrade=-2):
+    """Pack `clocks` ({name: (freq, margin, fractional)}) into as few MMCMs as possible.
+
+    Clocks of a same group (e.g. clocks with a phase relationship) are kept in the same MMCM. The
+    MMCM of the first clock is listed first. Returns a list of {clocks: [names], **solve_mmcm()}.
+    """
+    names = list(clocks.keys())
+    units = []
+    for name in names:
+        group = next((list(g) for g in groups if name in g), [name])
+        if not any(name in unit for unit in units):
+            units.append([n for n in names if n in group])
+    for nmmcms in range(1, len(units) + 1):
+        best, best_cost = None, None
+        for partition in _partitions(units):
+            if len(partition) != nmmcms:
+                continue
+            plan = []
+            for block in partition:
+                block_names = [n for n in names if any(n in unit for unit in block)]
+                if len(block_names) > s7mmcm_nclkouts:
+                    break
+                mmcm = solve_mmcm(clkin_freq, tuple(clocks[n] for n in block_names), speedgrade)
+                if mmcm is None:
+                    break
+                plan.append({"clocks": block_names, **mmcm})
+            else:
+                cost = (sum(sum(abs(e) for e in mmcm["errors"]) for mmcm in plan),
+                        max(max(mmcm["jitters"]) for mmcm in plan))
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = plan, cost
+        if best is not None:
+            return sorted(best, key=lambda mmcm: names.index(mmcm["clocks"][0]))
+    raise ValueError(f"No MMCM configuration found for {', '.join(names)}.")
+
+def plan_report(plan, logger=logging.getLogger("ClockPlanner")):
+    for n, mmcm in enumerate(plan):
+        logger.info(f"MMCM{n}: VCO {mmcm['vco']/1e6:.3f}MHz (DIVCLK {mmcm['divclk_divide']}, MULT {mmcm['clkfbout_mult']:g}).")
+        for name, divide, freq, error, jitter in zip(mmcm["clocks"], mmcm["divides"], mmcm["freqs"], mmcm["errors"], mmcm["jitters"]):
+            logger.info(f"  {name:<8} {freq/1e6:10.4f}MHz ({error*1e6:+8.1f}ppm), DIVIDE {divide:<6g} ~{jitter:.0f}ps jitter.")
+
+def achievable_frequencies(clkin_freq, fmin, fmax, ratios=[1], fractional=False, speedgrade=-2):
+    """Frequencies between `fmin` and `fmax` reachable exactly by a single MMCM together with their
+    `ratios` multiples (e.g. [1, 4] for sys/sys4x), with integer dividers (and integer CLKFBOUT
+    multiplier unless `fractional`)."""
+    r = set()
+    for vco_freq, _, clkfbout_mult in vco_configs(clkin_freq, speedgrade):
+        if not (fractional or clkfbout_mult.is_integer()):
+            continue
+        for d in range(1, 128 + 1):
+            freq = vco_freq/d
+            if fmin <= freq <= fmax and all((vco_freq/(freq*k)).is_integer() for k in ratios):
+                r.add(round(freq, 3))
+    return sorted(r)
+
+# Planned S7MMCM -----------------------------------------------------------------------------------
+
+class PlannedS7MMCM(S7MMCM):
+    """S7MMCM configured by the memoized solver (fractional CLKFBOUT multiplier and CLKOUT0 divider
+    supported) instead of LiteX's exhaustive search. Clocks created with `fractional=True` can be
+    moved to CLKOUT0 to use its fractional divider."""
+    def __init__(self, speedgrade=-1):
+        S7MMCM.__init__(self, speedgrade)
+        self.speedgrade = speedgrade
+        self.fractional = {}
+
+    def create_clkout(self, cd, freq, fractional=False, **kwargs):
+        self.fractional[self.nclkouts] = fractional
+        S7MMCM.create_clkout(self, cd, freq, **kwargs)
+
+    def compute_config(self):
+        clkouts = [self.clkouts[n] for n in sorted(self.clkouts)]
+        clocks  = tuple((f, m, self.fractional[n] and p == 0) for n, (clk, f, p, m) in enumerate(clkouts))
+        mmcm    = solve_mmcm(self.clkin_freq, clocks, self.speedgrade)
+        if mmcm is None:
+            raise ValueError("No PLL config found")
+        # Fractional divider is only available on CLKOUT0.
+        order = list(range(len(clkouts)))
+        if mmcm["fractional"] is not None:
+            order[0], order[mmcm["fractional"]] = order[mmcm["fractional"]], order[0]
+        self.clkouts = {n: clkouts[i] for n, i in enumerate(order)}
+        config = {}
+        config["divclk_divide"] = mmcm["divclk_divide"]
+        for n, i in enumerate(order):
+            config[f"clkout{n}_freq"]   = mmcm["freqs"][i]
+            config[f"clkout{n}_divide"] = mmcm["divides"][i]
+            config[f"clkout{n}_phase"]  = clkouts[i][2]
+        config["vco"]           = mmcm["vco"]
+        config["clkfbout_mult"] = mmcm["clkfbout_mult"]
+        compute_config_log(self.logger, config)
+        return config
@@ -0,0 +1,190 @@
+#
+# This file is part of LiteX-Boards.
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# DRAM Benchmark -----------------------------------------------------------------------------------
+
+class DRAMBench(LiteXModule):
+    """LiteDRAM native port bandwidth/latency benchmark.
+
+    Issues `length` word accesses starting at `base`, in bursts of `burst` consecutive words. With
+    `random` set, each burst starts at a pseudo-random offset (`lfsr & mask`) from `base` instead
+    of following the previous one. Bursts are writes or reads, `write_ratio` bursts out of 256
+    being writes (evenly spread). Reads are pipelined (up to `max_pending_reads` in flight) and
+    their latency (read command accepted to read data) is collected in min/max/sum registers and
+    in a `nbins` histogram of `2**hist_shift` cycles wide bins (last bin: overflow).
+
+    Written data is not checked: see LiteDRAM's BIST (sdram_generator/sdram_checker) for that.
+    """
+    def __init__(self, port, nbins=32, max_pending_reads=64):
+        assert port.mode == "both"
+        self.port = port
+
+        self._base        = CSRStorage(32,           description="Base address (bytes, DRAM relative).")
+        self._length      = CSRStorage(32,           description="Number of words to access.")
+        self._burst       = CSRStorage(16, reset=1,  description="Consecutive words per burst.")
+        self._mask        = CSRStorage(32,           description="Random burst offset mask (bytes, burst-aligned).")
+        self._random      = CSRStorage(1,            description="Start bursts at random offsets.")
+        self._write_ratio = CSRStorage(9,            description="Write bursts per 256 bursts (0: Read only, 256: Write only).")
+        self._hist_shift  = CSRStorage(4,  reset=2,  description="Latency histogram bin width (log2, cycles).")
+        self._start       = CSR()
+        self._done        = CSRStatus()
+        self._cycles      = CSRStatus(32, description="Cycles taken by the last run.")
+        self._reads       = CSRStatus(32, description="Words read by the last run.")
+        self._writes      = CSRStatus(32, description="Words written by the last run.")
+        self._latency_min = CSRStatus(32, description="Best read latency of the last run (cycles).")
+        self._latency_max = CSRStatus(32, description="Worst read latency of the last run (cycles).")
+        self._latency_sum = CSRStatus(32, description="Sum of the read latencies of the last run (cycles).")
+        self._hist_index  = CSRStorage(bits_for(nbins - 1), description="Latency histogram bin to read.")
+        self._hist_count  = CSRStatus(32, description="Reads of the selected latency histogram bin.")
+
+        # # #
+
+        word_shift = log2_int(port.data_width//8)
+
+        adr       = Signal(port.address_width)
+        remaining = Signal(32)
+        beat      = Signal(16)
+        we        = Signal()
+        mix       = Signal(8)
+        lfsr      = Signal(32, reset=1)
+        timer     = Signal(32)
+        start     = Signal()
+
+        lfsr_next = Mux(lfsr[0], (lfsr >> 1) ^ 0xa3000000, lfsr >> 1)
+        burst_adr = (self._base.storage + (lfsr_next & self._mask.storage))[word_shift:]
+
+        # Read/Write mix: Bresenham-like accumulator, evenly spreading write bursts.
+        mix_sum = Signal(10)
+        self.comb += mix_sum.eq(Mux(start, 0, mix) + self._write_ratio.storage)
+
+        # Pending Reads: Timestamps of the read commands, in order.
+        self.timestamps = timestamps = stream.SyncFIFO([("timer", 32)], max_pending_reads, buffered=False)
+        # Pending Writes: Write commands accepted, waiting for their data.
+        pending_writes = Signal(32)
+
+        # Command.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        self.comb += [
+            start.eq(fsm.ongoing("IDLE") & self._start.re),
+            self._done.status.eq(fsm.ongoing("IDLE")),
+        ]
+        fsm.act("IDLE",
+            If(self._start.re,
+                NextValue(adr,       self._base.storage[word_shift:]),
+                NextValue(remaining, self._length.storage),
+                NextValue(beat,      0),
+                NextValue(we,        mix_sum[8]),
+                NextValue(mix,       mix_sum[:8]),
+                NextValue(lfsr,      1),
+                NextState("RUN"),
+            )
+        )
+        fsm.act("RUN",
+            If(remaining == 0,
+                NextState("WAIT")
+            ).Else(
+                port.cmd.valid.eq(we | timestamps.sink.ready),
+                port.cmd.we.eq(we),
+                port.cmd.addr.eq(adr),
+                If(port.cmd.ready & port.cmd.valid,
+                    NextValue(remaining, remaining - 1),
+                    If(beat + 1 == self._burst.storage,
+                        NextValue(beat, 0),
+                        NextValue(we,   mix_sum[8]),
+                        NextValue(mix,  mix_sum[:8]),
+                        NextValue(lfsr, lfsr_next),
+                        NextValue(adr,  Mux(self._random.storage, burst_adr, adr + 1)),
+                    ).Else(
+                        NextValue(beat, beat + 1),
+                        NextValue(adr,  adr + 1),
+                    )
+                )
+            )
+        )
+        fsm.act("WAIT",
+            If((pending_writes == 0) & ~timestamps.source.valid,
+                NextState("IDLE")
+            )
+        )
+        self.sync += [
+            If(start,
+                timer.eq(0),
+                self._cycles.status.eq(0),
+            ).Else(
+                timer.eq(timer + 1),
+                If(~fsm.ongoing("IDLE"),
+                    self._cycles.status.eq(timer + 1)
+                )
+            )
+        ]
+
+        # Write Data.
+        self.comb += [
+            port.wdata.valid.eq(pending_writes != 0),
+            port.wdata.we.eq(2**len(port.wdata.we) - 1),
+            port.wdata.data.eq(Replicate(self._writes.status, len(port.wdata.data)//32)),
+        ]
+        write_cmd  = port.cmd.valid & port.cmd.ready &  port.cmd.we
+        write_data = port.wdata.valid & port.wdata.ready
+        self.sync += [
+            pending_writes.eq(pending_writes + write_cmd - write_data),
+            If(start,
+                self._writes.status.eq(0)
+            ).Elif(write_data,
+                self._writes.status.eq(self._writes.status + 1)
+            )
+        ]
+
+        # Read Data / Latency.
+        latency       = Signal(32)
+        latency_valid = Signal()
+        self.comb += [
+            timestamps.sink.valid.eq(port.cmd.valid & port.cmd.ready & ~port.cmd.we),
+            timestamps.sink.timer.eq(timer),
+            port.rdata.ready.eq(1),
+            timestamps.source.ready.eq(port.rdata.valid),
+        ]
+        self.sync += [
+            latency_valid.eq(port.rdata.valid),
+            latency.eq(timer - timestamps.source.timer),
+            If(start,
+                self._reads.status.eq(0),
+                self._latency_min.status.eq(2**32 - 1),
+                self._latency_max.status.eq(0),
+                self._latency_sum.status.eq(0),
+            ).Elif(latency_valid,
+                self._reads.status.eq(self._reads.status + 1),
+                If(latency < self._latency_min.status,
+                    self._latency_min.status.eq(latency)
+                ),
+                If(latency > self._latency_max.status,
+                    self._latency_max.status.eq(latency)
+                ),
+                self._latency_sum.status.eq(self._latency_sum.status + latency),
+            )
+        ]
+
+        # Latency Histogram.
+        bins      = [Signal(32) for _ in range(nbins)]
+        bin_value = Signal(32)
+        bin_index = Signal(bits_for(nbins - 1))
+        self.comb += [
+            bin_value.eq(latency >> self._hist_shift.storage),
+            bin_index.eq(Mux(bin_value >= nbins - 1, nbins - 1, bin_value)),
+            self._hist_count.status.eq(Array(bins)[self._hist_index.storage]),
+        ]
+        for i, b in enumerate(bins):
+            self.sync += [
+                If(start,
+                    b.eq(0)
+                ).Elif(latency_valid & (bin_index == i),
+                    b.eq(b + 1)
+                )
+            ]
@@ -0,0 +1,145 @@
+#
+# This file is part of LiteX-Boards.
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+
+# Performance Probe --------------------------------------------------------------------------------
+
+class PerfProbe(LiteXModule):
+    """Busy/transaction/stall/byte counters of one interface.
+
+    Counters are accumulated over a sampling period and latched (snapshot) at its end. The busy
+    ratio of each period is also collected in a `nbins` utilization histogram (bin `i`: periods
+    with a busy ratio in [i/nbins, (i + 1)/nbins[, last bin including fully busy periods).
+    """
+    def __init__(self, busy, transaction, nbytes, sample, enable, period_shift, hist_index, hist_clear, nbins=8):
+        self._busy         = CSRStatus(32, description="Busy cycles (request pending) of the last period.")
+        self._transactions = CSRStatus(32, description="Transactions of the last period.")
+        self._stalls       = CSRStatus(32, description="Stall cycles (request pending, not accepted) of the last period.")
+        self._bytes        = CSRStatus(32, description="Bytes transferred during the last period.")
+        self._hist_count   = CSRStatus(32, description="Periods of the selected utilization histogram bin.")
+
+        # # #
+
+        stall = Signal()
+        self.comb += stall.eq(busy & ~transaction)
+
+        busy_counter = Signal(32)
+        counters = [
+            (busy_counter, self._busy.status,         busy),
+            (Signal(32),   self._transactions.status, transaction),
+            (Signal(32),   self._stalls.status,       stall),
+            (Signal(32),   self._bytes.status,        Mux(transaction, nbytes, 0)),
+        ]
+        for counter, status, increment in counters:
+            self.sync += [
+                If(sample,
+                    status.eq(counter),
+                    counter.eq(Mux(enable, increment, 0)),
+                ).Elif(enable,
+                    counter.eq(counter + increment),
+                )
+            ]
+
+        # Utilization Histogram.
+        bins      = [Signal(32) for _ in range(nbins)]
+        bin_shift = Signal(5) # period_shift is at least log2(nbins) (clamped by PerfCounters).
+        bin_value = Signal(32)
+        bin_index = Signal(bits_for(nbins - 1))
+        self.comb += [
+            bin_shift.eq(period_shift - log2_int(nbins)),
+            bin_value.eq(busy_counter >> bin_shift),
+            bin_index.eq(Mux(bin_value >= nbins - 1, nbins - 1, bin_value)),
+            self._hist_count.status.eq(Array(bins)[hist_index]),
+        ]
+        for i, b in enumerate(bins):
+            self.sync += [
+                If(hist_clear,
+                    b.eq(0)
+                ).Elif(sample & (bin_index == i),
+                    b.eq(b + 1)
+                )
+            ]
+
+# Performance Counters -----------------------------------------------------------------------------
+
+class PerfCounters(LiteXModule):
+    """Always-on performance counters.
+
+    Probes are added with `add_wishbone_probe`/`add_stream_probe` and sampled every
+    `2**period_shift` cycles: each probe exposes the busy/transaction/stall/byte counts of the
+    last period and a utilization histogram of all periods since `hist_clear`. `snapshot` is
+    incremented on each period, allowing hosts to detect a snapshot update during their reads.
+    `period_shift` is at least `log2(nbins)` (lower values are raised to it) so that the periods
+    can be binned.
+    """
+    def __init__(self, nbins=8):
+        self.nbins  = nbins
+        self.probes = []
+
+        self._enable       = CSRStorage(1, reset=1,  description="Enable counting.")
+        self._period_shift = CSRStorage(5, reset=20, write_from_dev=True, description="Sampling period (log2, cycles, min: log2(nbins)).")
+        self._snapshot     = CSRStatus(32, description="Snapshot (sampling period) counter.")
+        self._cycles       = CSRStatus(64, description="Free-running cycle counter.")
+        self._hist_index   = CSRStorage(bits_for(nbins - 1), description="Utilization histogram bin to read.")
+        self._hist_clear   = CSR()
+
+        # # #
+
+        self.sample       = Signal()
+        self.period_shift = period_shift = Signal(5)
+        timer             = Signal(32)
+        period_mask       = Signal(32)
+        min_shift         = log2_int(nbins)
+        self.comb += [
+            # Clamp (and raise the CSR) to the minimum period.
+            If(self._period_shift.storage < min_shift,
+                period_shift.eq(min_shift)
+            ).Else(
+                period_shift.eq(self._period_shift.storage)
+            ),
+            self._period_shift.we.eq(self._period_shift.storage < min_shift),
+            self._period_shift.dat_w.eq(min_shift),
+        ]
+        self.sync += [
+            self._cycles.status.eq(self._cycles.status + 1),
+            period_mask.eq((1 << period_shift) - 1),
+            timer.eq(timer + 1),
+            self.sample.eq(0),
+            If(timer >= period_mask,
+                timer.eq(0),
+                self.sample.eq(1),
+                self._snapshot.status.eq(self._snapshot.status + 1),
+            )
+        ]
+
+    def add_probe(self, name, busy, transaction, nbytes):
+        probe = PerfProbe(busy, transaction, nbytes,
+            sample       = self.sample,
+            enable       = self._enable.storage,
+            period_shift = self.period_shift,
+            hist_index   = self._hist_index.storage,
+            hist_clear   = self._hist_clear.re,
+            nbins        = self.nbins,
+        )
+        self.add_module(name=name, module=probe)
+        self.probes.append(name)
+        return probe
+
+    def add_wishbone_probe(self, name, bus):
+        return self.add_probe(name,
+            busy        = bus.cyc & bus.stb,
+            transaction = bus.cyc & bus.stb & bus.ack,
+            nbytes      = len(bus.dat_r)//8,
+        )
+
+    def add_stream_probe(self, name, endpoint, nbytes=None):
+        return self.add_probe(name,
+            busy        = endpoint.valid,
+            transaction = endpoint.valid & endpoint.ready,
+            nbytes      = len(endpoint.data)//8 if nbytes is None else nbytes,
+        )
@@ -0,0 +1,95 @@
+#
+# This file is part of LiteX-Boards.
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import *
+
+# Wishbone Read Benchmark --------------------------------------------------------------------------
+
+class WishboneReadBench(LiteXModule):
+    """Wishbone read bandwidth/latency benchmark.
+
+    Issues `length` word reads starting at `base`, in bursts of `burst` consecutive words. With
+    `random` set, each burst starts at a pseudo-random offset (`lfsr & mask`) from `base` instead
+    of following the previous one: sequential reads measure bulk bandwidth, random bursts of a
+    cache line mimic execute-in-place instruction fetches.
+    """
+    def __init__(self, data_width=32, address_width=32):
+        self.bus = bus = wishbone.Interface(data_width=data_width, address_width=address_width, addressing="word")
+
+        self._base     = CSRStorage(address_width, description="Base address (bytes).")
+        self._length   = CSRStorage(32,            description="Number of words to read.")
+        self._burst    = CSRStorage(16, reset=1,   description="Consecutive words per burst.")
+        self._mask     = CSRStorage(address_width, description="Random burst offset mask (bytes, burst-aligned).")
+        self._random   = CSRStorage(1,             description="Start bursts at random offsets.")
+        self._start    = CSR()
+        self._done     = CSRStatus()
+        self._cycles   = CSRStatus(32, description="Cycles taken by the last run.")
+        self._latency  = CSRStatus(32, description="Worst access latency of the last run (cycles).")
+        self._checksum = CSRStatus(data_width, description="Sum of the words read by the last run.")
+
+        # # #
+
+        word_shift = log2_int(data_width//8)
+
+        adr       = Signal(address_width - word_shift)
+        remaining = Signal(32)
+        beat      = Signal(16)
+        latency   = Signal(32)
+        lfsr      = Signal(32, reset=1)
+
+        lfsr_next = Mux(lfsr[0], (lfsr >> 1) ^ 0xa3000000, lfsr >> 1)
+        burst_adr = (self._base.storage + (lfsr & self._mask.storage))[word_shift:]
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        self.comb += self._done.status.eq(fsm.ongoing("IDLE"))
+        fsm.act("IDLE",
+            If(self._start.re,
+                NextValue(adr,                    self._base.storage[word_shift:]),
+                NextValue(remaining,              self._length.storage),
+                NextValue(beat,                   0),
+                NextValue(lfsr,                   1),
+                NextValue(self._cycles.status,    0),
+                NextValue(self._latency.status,   0),
+                NextValue(self._checksum.status,  0),
+                NextState("CHECK"),
+            )
+        )
+        fsm.act("CHECK",
+            NextValue(self._cycles.status, self._cycles.status + 1),
+            NextValue(latency, 0),
+            If(remaining == 0,
+                NextState("IDLE")
+            ).Else(
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            NextValue(self._cycles.status, self._cycles.status + 1),
+            NextValue(latency, latency + 1),
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.we.eq(0),
+            bus.sel.eq(2**len(bus.sel) - 1),
+            bus.adr.eq(adr),
+            If(bus.ack,
+                NextValue(self._checksum.status, self._checksum.status + bus.dat_r),
+                If(latency + 1 > self._latency.status,
+                    NextValue(self._latency.status, latency + 1)
+                ),
+                NextValue(remaining, remaining - 1),
+                If((beat + 1 == self._burst.storage) & self._random.storage,
+                    NextValue(beat, 0),
+                    NextValue(lfsr, lfsr_next),
+                    NextValue(adr,  burst_adr),
+                ).Else(
+                    NextValue(beat, Mux(beat + 1 == self._burst.storage, 0, beat + 1)),
+                    NextValue(adr,  adr + 1),
+                ),
+                NextState("CHECK")
+            )
+        )
@@ -0,0 +1,86 @@
+#
+# This file is part of LiteX-Boards.
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+
+# SDCard Transfer Timer ----------------------------------------------------------------------------
+
+class SDCardTimer(LiteXModule):
+    """SDCard transfer timer.
+
+    Accumulates the cycles during which a transfer is ongoing (from a `start` to a `done` pulse),
+    the cycles during which the card link is busy (`link`), the number of transfers and the number
+    of data bytes moved (`data` pulses). Time spent by the software (or the host bridge) between
+    transfers is excluded. In native mode the link is busy during the whole transfer; in SPI mode,
+    where the software handles each byte, transfers span the card selection (CS assert to CS
+    deassert) and the link is only busy while bytes are shifted (link rate).
+    """
+    def __init__(self):
+        self.start  = Signal()
+        self.done   = Signal()
+        self.data   = Signal()
+        self.link   = Signal()
+        self.active = active = Signal()
+
+        self._clear       = CSR()
+        self._cycles      = CSRStatus(32, description="Cycles spent in transfers since clear.")
+        self._link_cycles = CSRStatus(32, description="Cycles the card link is busy since clear.")
+        self._transfers   = CSRStatus(32, description="Transfers since clear.")
+        self._bytes       = CSRStatus(32, description="Data bytes since clear.")
+
+        # # #
+
+        self.sync += [
+            If(self._clear.re,
+                active.eq(0),
+                self._cycles.status.eq(0),
+                self._link_cycles.status.eq(0),
+                self._transfers.status.eq(0),
+                self._bytes.status.eq(0),
+            ).Else(
+                If(self.start,
+                    active.eq(1),
+                    self._transfers.status.eq(self._transfers.status + 1),
+                ).Elif(self.done,
+                    active.eq(0),
+                ),
+                If(active | self.start,
+                    self._cycles.status.eq(self._cycles.status + 1),
+                ),
+                If(self.link,
+                    self._link_cycles.status.eq(self._link_cycles.status + 1),
+                ),
+                If(self.data,
+                    self._bytes.status.eq(self._bytes.status + 1),
+                ),
+            )
+        ]
+
+    def add_native(self, core):
+        """Time the data commands of a LiteSDCard SDCore (command send to data done)."""
+        done_d = Signal()
+        self.sync += done_d.eq(core.data_event.fields.done)
+        self.comb += [
+            self.start.eq(core.cmd_send.re & (core.cmd_command.fields.data_type != 0)),
+            self.done.eq(core.data_event.fields.done & ~done_d),
+            self.link.eq(self.active | self.start),
+            self.data.eq((core.source.valid & core.source.ready) | (core.sink.valid & core.sink.ready)),
+        ]
+
+    def add_spi(self, spi):
+        """Time the card selections of a SPIMaster (SPI mode: commands, polling and data, with the
+        per-byte software handling), the link being busy from each byte start to its end."""
+        cs_d  = Signal()
+        cs_dd = Signal()
+        self.sync += [cs_d.eq(spi.cs[0]), cs_dd.eq(cs_d)]
+        self.comb += [
+            # Edges of the registered CS (deselect seen on the cycle after the last selected one).
+            self.start.eq(cs_d & ~cs_dd),
+            self.done.eq(~spi.cs[0] & cs_d),
+            self.link.eq(~spi.done),
+            self.data.eq(spi.irq),
+        ]
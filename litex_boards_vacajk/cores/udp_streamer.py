@@ -0,0 +1,121 @@
+#
+# This file is part of LiteX-Boards.
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import *
+
+from litedram.frontend.dma import LiteDRAMDMAReader
+
+# DRAM UDP Streamer --------------------------------------------------------------------------------
+
+class DRAMUDPStreamer(LiteXModule):
+    """Stream a DRAM region to a remote UDP port, without CPU involvement.
+
+    `length` bytes starting at `base` are read through a LiteDRAM DMA and sent as UDP packets of
+    `packet_size` bytes (the last one can be shorter) to `ip_address:dst_port`. `base`/`length` are
+    truncated to the DRAM port data width and `packet_size` to the UDP data width, then clamped to
+    [one UDP word, `max_packet_size`] (default: 1472 bytes, the UDP payload of a 1500 bytes MTU).
+    """
+    def __init__(self, dram_port, udp_port, ip_address=0, src_port=5000, dst_port=5000, packet_size=1024, max_packet_size=1472, fifo_depth=64):
+        udp_dw   = len(udp_port.sink.data)
+        dram_dw  = dram_port.data_width
+        assert dram_dw % udp_dw == 0
+        assert udp_dw//8 <= packet_size <= max_packet_size
+
+        self._base        = CSRStorage(32,                    description="DRAM base address (bytes).")
+        self._length      = CSRStorage(32,                    description="Length to stream (bytes).")
+        self._packet_size = CSRStorage(16, reset=packet_size, description="UDP payload size (bytes, clamped to [UDP word, MTU payload]).")
+        self._ip_address  = CSRStorage(32, reset=ip_address,  description="Remote IP address.")
+        self._dst_port    = CSRStorage(16, reset=dst_port,    description="Remote UDP port.")
+        self._start       = CSR()
+        self._done        = CSRStatus()
+        self._packets     = CSRStatus(32, description="Packets sent by the last/current run.")
+        self._cycles      = CSRStatus(32, description="Cycles taken by the last/current run.")
+
+        # # #
+
+        dram_shift = log2_int(dram_dw//8)
+        udp_shift  = log2_int(udp_dw//8)
+        busy       = Signal()
+        start      = Signal()
+        self.comb += start.eq(self._start.re & ~busy) # Start is ignored while streaming.
+
+        # DMA Reader: issue one read per DRAM word of the region.
+        self.reader = reader = LiteDRAMDMAReader(dram_port, fifo_depth=fifo_depth, fifo_buffered=True)
+        cmd_address   = Signal(dram_port.address_width)
+        cmd_remaining = Signal(32)
+        self.comb += [
+            reader.sink.valid.eq(cmd_remaining != 0),
+            reader.sink.address.eq(cmd_address),
+        ]
+        self.sync += [
+            If(start,
+                cmd_address.eq(self._base.storage[dram_shift:]),
+                cmd_remaining.eq(self._length.storage[dram_shift:]),
+            ).Elif(reader.sink.valid & reader.sink.ready,
+                cmd_address.eq(cmd_address + 1),
+                cmd_remaining.eq(cmd_remaining - 1),
+            )
+        ]
+
+        # Data-Width Conversion (DRAM words are little-endian: low bytes are sent first).
+        self.converter = converter = stream.Converter(dram_dw, udp_dw)
+        self.comb += reader.source.connect(converter.sink)
+
+        # Packetizer.
+        remaining   = Signal(32) # UDP words left at start of current packet.
+        beat        = Signal(16)
+        packet_size = Signal(16) # In UDP words, latched on start.
+        words       = Signal(16) # UDP words of current packet.
+        max_words   = max_packet_size >> udp_shift
+        self.comb += [
+            If(remaining < packet_size,
+                words.eq(remaining)
+            ).Else(
+                words.eq(packet_size)
+            ),
+            busy.eq(remaining != 0),
+            self._done.status.eq(~busy),
+        ]
+        sink = udp_port.sink
+        self.comb += [
+            sink.valid.eq(converter.source.valid & busy),
+            sink.last.eq(beat == (words - 1)),
+            sink.data.eq(converter.source.data),
+            sink.last_be.eq(Mux(sink.last, 1 << (udp_dw//8 - 1), 0)),
+            sink.src_port.eq(src_port),
+            sink.dst_port.eq(self._dst_port.storage),
+            sink.ip_address.eq(self._ip_address.storage),
+            sink.length.eq(words << udp_shift),
+            converter.source.ready.eq(sink.ready & busy),
+        ]
+        self.sync += [
+            If(start,
+                remaining.eq(self._length.storage[dram_shift:] << (dram_shift - udp_shift)),
+                # Clamped to [1, max_words] UDP words (0 would never assert last).
+                If(self._packet_size.storage[udp_shift:] == 0,
+                    packet_size.eq(1)
+                ).Elif(self._packet_size.storage[udp_shift:] > max_words,
+                    packet_size.eq(max_words)
+                ).Else(
+                    packet_size.eq(self._packet_size.storage[udp_shift:])
+                ),
+                beat.eq(0),
+                self._packets.status.eq(0),
+                self._cycles.status.eq(0),
+            ).Elif(busy,
+                self._cycles.status.eq(self._cycles.status + 1),
+                If(sink.valid & sink.ready,
+                    beat.eq(beat + 1),
+                    If(sink.last,
+                        beat.eq(0),
+                        remaining.eq(remaining - words),
+                        self._packets.status.eq(self._packets.status + 1),
+                    )
+                )
+            )
+        ]
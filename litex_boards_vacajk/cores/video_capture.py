@@ -0,0 +1,680 @@
+#
+# This file is part of LiteX-Boards.
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+from migen.genlib.fifo import SyncFIFO
+
+from litex.gen import *
+
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import *
+from litex.soc.cores.code_tmds import control_tokens, TMDSEncoder
+
+from litedram.frontend.dma import LiteDRAMDMAWriter
+
+# Note: DVI decoding only (no HDMI data islands): the EDID below advertises a DVI sink, so sources
+# only send control tokens during blanking.
+
+# EDID ---------------------------------------------------------------------------------------------
+
+def edid_data(timings, name="Bochen K7", size_mm=(600, 340)):
+    """Return a 128-byte EDID 1.3 advertising `timings` (LiteX video timings dict) only."""
+    vt   = timings
+    h_mm = size_mm[0]
+    v_mm = size_mm[1]
+    def text(tag, s):
+        s = s.encode()[:13]
+        if len(s) < 13:
+            s += b"\n" + b" "*(12 - len(s))
+        return [0x00, 0x00, 0x00, tag, 0x00] + list(s)
+    edid  = [0x00, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00]       # Header.
+    edid += [0x32, 0x98, 0x01, 0x00, 0x01, 0x00, 0x00, 0x00]       # Manufacturer "LTX", Product, Serial.
+    edid += [0x01, 34, 0x01, 0x03]                                 # Week/Year (2024), EDID 1.3.
+    edid += [0x80, h_mm//10, v_mm//10, 0x78, 0x0a]                 # Digital, Size (cm), Gamma 2.2, RGB/Preferred timing.
+    edid += [0xee, 0x91, 0xa3, 0x54, 0x4c, 0x99, 0x26, 0x0f, 0x50, 0x54] # Chromaticity (sRGB).
+    edid += [0x00, 0x00, 0x00]                                     # No Established Timings.
+    edid += [0x01, 0x01]*8                                         # No Standard Timings.
+    # Detailed Timing Descriptor (Preferred).
+    pix_clk = int(vt["pix_clk"]//10e3)
+    hso, hsw = vt["h_sync_offset"], vt["h_sync_width"]
+    vso, vsw = vt["v_sync_offset"], vt["v_sync_width"]
+    edid += [
+        pix_clk & 0xff, pix_clk >> 8,
+        vt["h_active"] & 0xff, vt["h_blanking"] & 0xff, ((vt["h_active"] >> 8) << 4) | (vt["h_blanking"] >> 8),
+        vt["v_active"] & 0xff, vt["v_blanking"] & 0xff, ((vt["v_active"] >> 8) << 4) | (vt["v_blanking"] >> 8),
+        hso & 0xff, hsw & 0xff, ((vso & 0xf) << 4) | (vsw & 0xf),
+        ((hso >> 8) << 6) | ((hsw >> 8) << 4) | ((vso >> 4) << 2) | (vsw >> 4),
+        h_mm & 0xff, v_mm & 0xff, ((h_mm >> 8) << 4) | (v_mm >> 8),
+        0x00, 0x00,
+        0x1e, # Digital Separate Sync, +HSync/+VSync.
+    ]
+    edid += text(0xfc, name)                                       # Display Name.
+    edid += text(0xfe, "DVI Capture")                              # Unspecified Text.
+    edid += [0x00, 0x00, 0x00, 0x10, 0x00] + [0x00]*13             # Dummy Descriptor.
+    edid += [0x00]                                                 # No Extension (DVI).
+    edid += [(-sum(edid)) & 0xff]
+    assert len(edid) == 128
+    return edid
+
+class EDID(LiteXModule):
+    """DDC EDID EEPROM emulation (I2C slave at 0x50, read with 8-bit word offset)."""
+    def __init__(self, edid, pads=None, address=0x50):
+        self.scl    = Signal(reset=1)
+        self.sda_i  = Signal(reset=1)
+        self.sda_oe = Signal() # Drive SDA low.
+
+        # # #
+
+        # Open-Drain SDA.
+        if pads is not None:
+            sda = TSTriple()
+            self.specials += sda.get_tristate(pads.sda)
+            self.comb += [
+                self.scl.eq(pads.scl),
+                self.sda_i.eq(sda.i),
+                sda.o.eq(0),
+                sda.oe.eq(self.sda_oe),
+            ]
+        scl_i = Signal()
+        sda_i = Signal()
+        sda_o = self.sda_oe
+        self.specials += MultiReg(self.scl,   scl_i)
+        self.specials += MultiReg(self.sda_i, sda_i)
+
+        # Memory.
+        mem  = Memory(8, 256, init=edid)
+        port = mem.get_port(async_read=True)
+        self.specials += mem, port
+
+        # Bus Conditions.
+        scl_r = Signal()
+        sda_r = Signal()
+        self.sync += scl_r.eq(scl_i), sda_r.eq(sda_i)
+        start       = Signal()
+        stop        = Signal()
+        scl_rising  = Signal()
+        scl_falling = Signal()
+        self.comb += [
+            start.eq(scl_i & scl_r & sda_r & ~sda_i),
+            stop.eq( scl_i & scl_r & ~sda_r & sda_i),
+            scl_rising.eq( scl_i & ~scl_r),
+            scl_falling.eq(~scl_i & scl_r),
+        ]
+
+        # Shift Register / Offset.
+        sr     = Signal(8)
+        count  = Signal(4)
+        offset = Signal(8)
+        data   = Signal(8)
+        self.comb += port.adr.eq(offset)
+        self.sync += If(scl_rising, sr.eq(Cat(sda_i, sr[:7])))
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(count, 0)
+        )
+        fsm.act("ADDR",
+            If(scl_rising,
+                NextValue(count, count + 1)
+            ),
+            If(scl_falling & (count == 8),
+                NextValue(count, 0),
+                If(sr[1:] == address,
+                    If(sr[0],
+                        NextValue(data, port.dat_r),
+                        NextState("ACK-READ")
+                    ).Else(
+                        NextState("ACK-WRITE")
+                    )
+                ).Else(
+                    NextState("IDLE")
+                )
+            )
+        )
+        fsm.act("ACK-WRITE",
+            sda_o.eq(1),
+            If(scl_falling,
+                NextState("WRITE-OFFSET")
+            )
+        )
+        fsm.act("WRITE-OFFSET",
+            If(scl_rising,
+                NextValue(count, count + 1)
+            ),
+            If(scl_falling & (count == 8),
+                NextValue(count, 0),
+                NextValue(offset, sr),
+                NextState("ACK-WRITE-DATA")
+            )
+        )
+        fsm.act("ACK-WRITE-DATA",
+            sda_o.eq(1),
+            If(scl_falling,
+                NextState("WRITE-DATA")
+            )
+        )
+        fsm.act("WRITE-DATA",
+            # Data writes are acked but ignored (read-only EEPROM).
+            If(scl_rising,
+                NextValue(count, count + 1)
+            ),
+            If(scl_falling & (count == 8),
+                NextValue(count, 0),
+                NextState("ACK-WRITE-DATA")
+            )
+        )
+        fsm.act("ACK-READ",
+            sda_o.eq(1),
+            If(scl_falling,
+                NextValue(offset, offset + 1),
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            sda_o.eq(~data[7]),
+            If(scl_rising,
+                NextValue(count, count + 1)
+            ),
+            If(scl_falling,
+                NextValue(data, data << 1),
+                If(count == 8,
+                    NextValue(count, 0),
+                    NextState("READ-ACK")
+                )
+            )
+        )
+        fsm.act("READ-ACK",
+            If(scl_rising,
+                If(sda_i,
+                    NextState("IDLE") # NACK: End of read.
+                ).Else(
+                    NextValue(data, port.dat_r),
+                    NextState("ACK-READ-WAIT")
+                )
+            )
+        )
+        fsm.act("ACK-READ-WAIT",
+            If(scl_falling,
+                NextValue(offset, offset + 1),
+                NextState("READ")
+            )
+        )
+        # Start/Stop conditions override the FSM.
+        for state in fsm.actions.keys():
+            fsm.act(state,
+                If(start,
+                    NextValue(count, 0),
+                    NextState("ADDR")
+                ).Elif(stop,
+                    NextState("IDLE")
+                )
+            )
+
+# TMDS Decoding ------------------------------------------------------------------------------------
+
+class TMDSWordAligner(LiteXModule):
+    """Align the 10-bit TMDS word boundary on control tokens.
+
+    The bit offset is incremented when no run of `run` consecutive control tokens (blanking) is seen
+    in `timeout` words (longer than a video line).
+    """
+    def __init__(self, timeout=4096, run=8):
+        self.raw     = Signal(10) # Deserialized bits, first received bit in bit 0.
+        self.data    = Signal(10)
+        self.aligned = Signal()
+
+        # # #
+
+        # Bit Slip (over 2 consecutive words).
+        raw_r  = Signal(10)
+        offset = Signal(max=10)
+        window = Signal(20)
+        self.comb += window.eq(Cat(raw_r, self.raw))
+        self.sync += [
+            raw_r.eq(self.raw),
+            self.data.eq(Array(window[i:i+10] for i in range(10))[offset]),
+        ]
+
+        # Control Tokens Detection.
+        token     = Signal()
+        token_run = Signal(max=run + 1)
+        seen      = Signal()
+        timer     = Signal(max=timeout)
+        self.comb += token.eq(reduce(or_, [self.data == t for t in control_tokens]))
+        self.sync += [
+            If(token,
+                If(token_run != run, token_run.eq(token_run + 1))
+            ).Else(
+                token_run.eq(0)
+            ),
+            If(token_run == run, seen.eq(1)),
+            timer.eq(timer + 1),
+            If(timer == (timeout - 1),
+                timer.eq(0),
+                seen.eq(0),
+                self.aligned.eq(seen),
+                If(~seen,
+                    offset.eq(Mux(offset == 9, 0, offset + 1))
+                )
+            )
+        ]
+
+class TMDSDecoder(LiteXModule):
+    """TMDS (DVI) word decoder: control period (`de`=0, `c`) or video data (`de`=1, `d`)."""
+    def __init__(self):
+        self.raw = Signal(10)
+        self.de  = Signal()
+        self.c   = Signal(2)
+        self.d   = Signal(8)
+
+        # # #
+
+        # Control Tokens.
+        cases = {t: [self.de.eq(0), self.c.eq(i)] for i, t in enumerate(control_tokens)}
+        cases["default"] = self.de.eq(1)
+        self.sync += Case(self.raw, cases)
+
+        # Video Data.
+        d = Signal(8)
+        self.comb += d.eq(Mux(self.raw[9], ~self.raw[:8], self.raw[:8]))
+        self.sync += [
+            self.d[0].eq(d[0]),
+            [self.d[i].eq(Mux(self.raw[8], d[i] ^ d[i-1], ~(d[i] ^ d[i-1]))) for i in range(1, 8)],
+        ]
+
+class ChannelSync(LiteXModule):
+    """Deskew TMDS channels (up to `depth`-1 words) on the start of video data."""
+    def __init__(self, nchannels=3, depth=8):
+        self.de      = [Signal()   for _ in range(nchannels)]
+        self.c       = [Signal(2)  for _ in range(nchannels)]
+        self.d       = [Signal(8)  for _ in range(nchannels)]
+        self.synced  = Signal()
+        self.valid   = Signal()
+        self.de_o    = [Signal()   for _ in range(nchannels)]
+        self.c_o     = [Signal(2)  for _ in range(nchannels)]
+        self.d_o     = [Signal(8)  for _ in range(nchannels)]
+
+        # # #
+
+        fifos  = [ResetInserter()(SyncFIFO(11, depth)) for _ in range(nchannels)]
+        self.submodules += fifos
+        in_de  = Signal(nchannels)
+        out_de = Signal(nchannels)
+        ready  = Signal(nchannels)
+        all_de = Signal()
+        self.comb += [
+            [fifo.din.eq(Cat(self.d[i], self.c[i], self.de[i])) for i, fifo in enumerate(fifos)],
+            [fifo.we.eq(1) for fifo in fifos],
+            # Until synced, flush on blanking so that channels held on a previous attempt restart empty.
+            [in_de[i].eq(self.de[i]) for i in range(nchannels)],
+            [fifo.reset.eq(~self.synced & (in_de == 0)) for fifo in fifos],
+            [out_de[i].eq(fifo.dout[10]) for i, fifo in enumerate(fifos)],
+            [ready[i].eq(fifo.readable) for i, fifo in enumerate(fifos)],
+            all_de.eq((out_de == (2**nchannels - 1)) & (ready == (2**nchannels - 1))),
+            # Until synced, hold channels showing video data until all do.
+            [fifo.re.eq(fifo.readable & (self.synced | ~out_de[i] | all_de)) for i, fifo in enumerate(fifos)],
+        ]
+        self.sync += [
+            If(~self.synced,
+                If(all_de, self.synced.eq(1))
+            ).Elif((ready != (2**nchannels - 1)) | ((out_de != 0) & (out_de != (2**nchannels - 1))),
+                self.synced.eq(0)
+            ),
+            self.valid.eq(self.synced | all_de),
+            [self.de_o[i].eq(fifo.dout[10])  for i, fifo in enumerate(fifos)],
+            [self.c_o[i].eq(fifo.dout[8:10]) for i, fifo in enumerate(fifos)],
+            [self.d_o[i].eq(fifo.dout[:8])   for i, fifo in enumerate(fifos)],
+        ]
+
+# Frame Packer -------------------------------------------------------------------------------------
+
+class VideoFramePacker(LiteXModule):
+    """Video data to XRGB8888 words stream (`first` on first pixel of frame), with resolution measure."""
+    def __init__(self):
+        self.valid  = Signal()
+        self.de     = Signal()
+        self.hsync  = Signal()
+        self.vsync  = Signal()
+        self.r      = Signal(8)
+        self.g      = Signal(8)
+        self.b      = Signal(8)
+        self.source = source = stream.Endpoint([("data", 32)])
+        self.hres   = Signal(16)
+        self.vres   = Signal(16)
+
+        # # #
+
+        # Start of Frame: VSync edges only occur in vertical blanking, whatever the sync polarity.
+        vsync_r   = Signal()
+        de_r      = Signal()
+        new_frame = Signal()
+        hcount    = Signal(16)
+        vcount    = Signal(16)
+        self.sync += If(self.valid,
+            vsync_r.eq(self.vsync),
+            de_r.eq(self.de),
+            If(~self.de & (self.vsync != vsync_r),
+                new_frame.eq(1)
+            ),
+            If(self.de,
+                new_frame.eq(0),
+                hcount.eq(hcount + 1),
+                If(new_frame,
+                    self.vres.eq(vcount),
+                    vcount.eq(0),
+                )
+            ).Elif(de_r,
+                self.hres.eq(hcount),
+                hcount.eq(0),
+                vcount.eq(vcount + 1),
+            )
+        )
+        self.comb += [
+            source.valid.eq(self.valid & self.de),
+            source.first.eq(new_frame),
+            source.data.eq(Cat(self.b, self.g, self.r)),
+        ]
+
+# Frame DMA ----------------------------------------------------------------------------------------
+
+class VideoFrameDMA(LiteXModule):
+    """Write frames to a ring of `nbuffers` DRAM buffers of `frame_size` bytes from `base`.
+
+    A frame is complete when the first pixel of the next one is received (its last writes can still
+    be in the DMA FIFO for a few cycles). Partial DRAM words at end of frame are dropped, as are the
+    words exceeding `frame_size`.
+    """
+    def __init__(self, dram_port, frame_size, nbuffers=3, fifo_depth=16):
+        self.sink = sink = stream.Endpoint([("data", 32)])
+
+        self._enable      = CSRStorage()
+        self._base        = CSRStorage(32,                   description="DRAM base address of buffer 0 (bytes).")
+        self._frame_size  = CSRStorage(32, reset=frame_size, description="Buffer size/stride (bytes).")
+        self._nbuffers    = CSRStorage(8,  reset=nbuffers,   description="Number of buffers in the ring.")
+        self._frame_ready = CSRStatus(description="New frame(s) available since last ``frame_ack``.")
+        self._frame_ack   = CSR()
+        self._frame_count = CSRStatus(32, description="Completed frames.")
+        self._frame_index = CSRStatus(8,  description="Buffer index of the last completed frame.")
+        self._frame_words = CSRStatus(32, description="Pixels (words) received for the last completed frame.")
+
+        # # #
+
+        dram_dw    = dram_port.data_width
+        ratio      = dram_dw//32
+        dram_shift = log2_int(dram_dw//8)
+
+        self.writer = writer = LiteDRAMDMAWriter(dram_port, fifo_depth=fifo_depth)
+
+        # Buffer/Offset of current word (a new frame switches to the next buffer).
+        enable      = self._enable.storage
+        base        = self._base.storage[dram_shift:]
+        nbuffers    = self._nbuffers.storage
+        frame_size  = self._frame_size.storage[dram_shift:]
+        started     = Signal()
+        index       = Signal(8)
+        buffer_base = Signal(32) # In DRAM words.
+        offset      = Signal(32) # In DRAM words.
+        count       = Signal(max=max(ratio, 2))
+        words       = Signal(32)
+        cur_index   = Signal(8)
+        cur_base    = Signal(32)
+        cur_offset  = Signal(32)
+        cur_count   = Signal(max=max(ratio, 2))
+        self.comb += [
+            cur_index.eq(index),
+            cur_base.eq(buffer_base),
+            cur_offset.eq(offset),
+            cur_count.eq(count),
+            If(sink.first,
+                cur_offset.eq(0),
+                cur_count.eq(0),
+                If(started & (index != (nbuffers - 1)),
+                    cur_index.eq(index + 1),
+                    cur_base.eq(buffer_base + frame_size),
+                ).Else(
+                    cur_index.eq(0),
+                    cur_base.eq(base),
+                )
+            )
+        ]
+
+        # Words to DRAM words.
+        acc     = Signal(dram_dw)
+        pending = Signal()
+        self.comb += [
+            writer.sink.valid.eq(pending),
+            sink.ready.eq(~pending | writer.sink.ready),
+        ]
+        self.sync += [
+            If(writer.sink.valid & writer.sink.ready,
+                pending.eq(0)
+            ),
+            If(~enable,
+                started.eq(0),
+                pending.eq(0),
+            ).Elif(sink.valid & sink.ready & (started | sink.first),
+                started.eq(1),
+                index.eq(cur_index),
+                buffer_base.eq(cur_base),
+                words.eq(Mux(sink.first, 1, words + 1)),
+                If(sink.first & started,
+                    self._frame_ready.status.eq(1),
+                    self._frame_count.status.eq(self._frame_count.status + 1),
+                    self._frame_index.status.eq(index),
+                    self._frame_words.status.eq(words),
+                ),
+                Case(cur_count, {i: acc[32*i:32*(i+1)].eq(sink.data) for i in range(ratio)}),
+                If(cur_count == (ratio - 1),
+                    count.eq(0),
+                    offset.eq(cur_offset + 1),
+                    If(cur_offset < frame_size,
+                        pending.eq(1),
+                        writer.sink.address.eq(cur_base + cur_offset),
+                        writer.sink.data.eq(Cat(acc[:32*(ratio - 1)], sink.data)),
+                    )
+                ).Else(
+                    count.eq(cur_count + 1),
+                    offset.eq(cur_offset),
+                )
+            ),
+            If(self._frame_ack.re,
+                self._frame_ready.status.eq(0)
+            )
+        ]
+
+# Video Capture ------------------------------------------------------------------------------------
+
+class VideoCapture(LiteXModule):
+    """Capture DVI video from deserialized TMDS words (`phy.raw`, `clock_domain`) to DRAM buffers."""
+    def __init__(self, phy, dram_port, hres=1280, vres=720, nbuffers=3, clock_domain="hdmi_in",
+        align_timeout = 4096,
+        cdc_depth     = 256):
+        self._aligned = CSRStatus(3, description="TMDS channels word-aligned.")
+        self._synced  = CSRStatus(description="TMDS channels deskewed.")
+        self._hres    = CSRStatus(16, description="Measured horizontal resolution.")
+        self._vres    = CSRStatus(16, description="Measured vertical resolution.")
+
+        # # #
+
+        # TMDS Word Alignment / Decoding.
+        aligners = []
+        decoders = []
+        for raw in phy.raw:
+            aligner = ClockDomainsRenamer(clock_domain)(TMDSWordAligner(timeout=align_timeout))
+            decoder = ClockDomainsRenamer(clock_domain)(TMDSDecoder())
+            self.comb += aligner.raw.eq(raw)
+            self.comb += decoder.raw.eq(aligner.data)
+            aligners.append(aligner)
+            decoders.append(decoder)
+        self.submodules += aligners, decoders
+
+        # Channels Deskew.
+        self.chansync = chansync = ClockDomainsRenamer(clock_domain)(ChannelSync(len(decoders)))
+        for i, decoder in enumerate(decoders):
+            self.comb += [
+                chansync.de[i].eq(decoder.de),
+                chansync.c[i].eq(decoder.c),
+                chansync.d[i].eq(decoder.d),
+            ]
+
+        # Pixels Packing (b/g/r on channels 0/1/2, syncs on channel 0).
+        self.packer = packer = ClockDomainsRenamer(clock_domain)(VideoFramePacker())
+        self.comb += [
+            packer.valid.eq(chansync.valid),
+            packer.de.eq(chansync.de_o[0]),
+            packer.hsync.eq(chansync.c_o[0][0]),
+            packer.vsync.eq(chansync.c_o[0][1]),
+            packer.b.eq(chansync.d_o[0]),
+            packer.g.eq(chansync.d_o[1]),
+            packer.r.eq(chansync.d_o[2]),
+        ]
+
+        # CDC (no backpressure from the video source: words are dropped when full, see frame_words).
+        self.cdc = cdc = stream.ClockDomainCrossing([("data", 32)],
+            cd_from = clock_domain,
+            cd_to   = "sys",
+            depth   = cdc_depth,
+        )
+        self.comb += packer.source.connect(cdc.sink)
+
+        # DMA.
+        self.dma = VideoFrameDMA(dram_port, frame_size=4*hres*vres, nbuffers=nbuffers)
+        self.comb += cdc.source.connect(self.dma.sink)
+
+        # Status.
+        self.specials += MultiReg(Cat(*[aligner.aligned for aligner in aligners]), self._aligned.status)
+        self.specials += MultiReg(chansync.synced, self._synced.status)
+        self.specials += MultiReg(packer.hres,     self._hres.status)
+        self.specials += MultiReg(packer.vres,     self._vres.status)
+
+# 7-Series PHY -------------------------------------------------------------------------------------
+
+class S7HDMIInPHY(LiteXModule):
+    """7-Series TMDS receiver: MMCM on the TMDS clock and 1:10 ISERDESE2 deserialization.
+
+    Creates the `clock_domain` (pixel) and `clock_domain`5x clock domains for `pix_freq`. The sampling
+    point of each channel can be adjusted through its IDELAYE2 (IDELAYCTRL required).
+    """
+    def __init__(self, pads, pix_freq, clock_domain="hdmi_in"):
+        from litex.soc.cores.clock import S7MMCM
+        self.raw = [Signal(10) for _ in range(3)]
+
+        self._mmcm_reset = CSRStorage()
+        self._locked     = CSRStatus()
+        self._delay      = CSRStorage(15, description="IDELAYE2 taps (5-bit/channel).")
+
+        # # #
+
+        # Clocking.
+        setattr(self, f"cd_{clock_domain}",   ClockDomain(clock_domain))
+        setattr(self, f"cd_{clock_domain}5x", ClockDomain(clock_domain + "5x"))
+        clk = Signal()
+        self.specials += Instance("IBUFDS", i_I=pads.clk_p, i_IB=pads.clk_n, o_O=clk)
+        self.mmcm = mmcm = S7MMCM(speedgrade=-2)
+        self.comb += mmcm.reset.eq(self._mmcm_reset.storage)
+        mmcm.register_clkin(clk, pix_freq)
+        mmcm.create_clkout(getattr(self, f"cd_{clock_domain}"),   pix_freq,   margin=0)
+        mmcm.create_clkout(getattr(self, f"cd_{clock_domain}5x"), 5*pix_freq, margin=0)
+        self.specials += MultiReg(mmcm.locked, self._locked.status)
+
+        # Datas.
+        sync  = getattr(self.sync, clock_domain)
+        delay = Signal(15)
+        self.specials += MultiReg(self._delay.storage, delay, clock_domain)
+        for i in range(3):
+            # Differential Input / Delay.
+            pad       = Signal()
+            pad_delay = Signal()
+            self.specials += Instance("IBUFDS",
+                i_I  = getattr(pads, f"data{i}_p"),
+                i_IB = getattr(pads, f"data{i}_n"),
+                o_O  = pad,
+            )
+            tap   = delay[5*i:5*(i+1)]
+            tap_r = Signal(5)
+            sync += tap_r.eq(tap)
+            self.specials += Instance("IDELAYE2",
+                p_DELAY_SRC             = "IDATAIN",
+                p_SIGNAL_PATTERN        = "DATA",
+                p_CINVCTRL_SEL          = "FALSE",
+                p_HIGH_PERFORMANCE_MODE = "TRUE",
+                p_REFCLK_FREQUENCY      = 200.0,
+                p_PIPE_SEL              = "FALSE",
+                p_IDELAY_TYPE           = "VAR_LOAD",
+                p_IDELAY_VALUE          = 0,
+                i_C           = ClockSignal(clock_domain),
+                i_LD          = tap != tap_r,
+                i_CE          = 0,
+                i_INC         = 0,
+                i_LDPIPEEN    = 0,
+                i_CINVCTRL    = 0,
+                i_REGRST      = 0,
+                i_CNTVALUEIN  = tap,
+                i_IDATAIN     = pad,
+                o_DATAOUT     = pad_delay,
+            )
+
+            # 1:10 Deserialization (Master/Slave ISERDESE2, Q8 of Master is the first received bit
+            # of its 8 bits, Slave Q3/Q4 extend the word with the 2 first received bits).
+            q     = Signal(10)
+            shift = Signal(2)
+            for serdes in ["master", "slave"]:
+                self.specials += Instance("ISERDESE2",
+                    p_DATA_WIDTH     = 10,
+                    p_DATA_RATE      = "DDR",
+                    p_SERDES_MODE    = serdes.upper(),
+                    p_INTERFACE_TYPE = "NETWORKING",
+                    p_NUM_CE         = 1,
+                    p_IOBDELAY       = "IFD",
+                    i_DDLY     = pad_delay if serdes == "master" else 0,
+                    i_CE1      = 1,
+                    i_RST      = ResetSignal(clock_domain),
+                    i_CLK      = ClockSignal(clock_domain + "5x"),
+                    i_CLKB     = ~ClockSignal(clock_domain + "5x"),
+                    i_CLKDIV   = ClockSignal(clock_domain),
+                    i_BITSLIP  = 0,
+                    i_SHIFTIN1 = shift[0] if serdes == "slave" else 0,
+                    i_SHIFTIN2 = shift[1] if serdes == "slave" else 0,
+                    o_SHIFTOUT1 = shift[0] if serdes == "master" else Open(),
+                    o_SHIFTOUT2 = shift[1] if serdes == "master" else Open(),
+                    **({f"o_Q{n+1}": q[9-n] for n in range(8)} if serdes == "master" else
+                       {"o_Q3": q[1], "o_Q4": q[0]}),
+                )
+            sync += self.raw[i].eq(q)
+
+# Simulation Source --------------------------------------------------------------------------------
+
+class TMDSPatternGenerator(LiteXModule):
+    """Synthetic TMDS words (color bars), with per-channel bit offsets and word skews."""
+    def __init__(self, timings, clock_domain="hdmi_in", bit_offsets=[3, 7, 1], skews=[0, 2, 1]):
+        from litex.soc.cores.video import VideoTimingGenerator, ColorBarsPattern
+        self.raw = [Signal(10) for _ in range(3)]
+
+        # # #
+
+        self.vtg     = vtg     = ClockDomainsRenamer(clock_domain)(VideoTimingGenerator(timings))
+        self.pattern = pattern = ClockDomainsRenamer(clock_domain)(ColorBarsPattern())
+        self.comb += vtg.source.connect(pattern.vtg_sink)
+        self.comb += pattern.source.ready.eq(1)
+
+        sync = getattr(self.sync, clock_domain)
+        for i, color in enumerate(["b", "g", "r"]):
+            encoder = ClockDomainsRenamer(clock_domain)(TMDSEncoder())
+            self.submodules += encoder
+            self.comb += [
+                encoder.d.eq(getattr(pattern.source, color)),
+                encoder.c.eq(Cat(pattern.source.hsync, pattern.source.vsync) if i == 0 else 0),
+                encoder.de.eq(pattern.source.de),
+            ]
+            # Word skew.
+            word = encoder.out
+            for n in range(skews[i]):
+                word_r = Signal(10)
+                sync  += word_r.eq(word)
+                word   = word_r
+            # Bit offset (serial stream seen from an unaligned deserializer).
+            word_r = Signal(10)
+            sync  += word_r.eq(word)
+            self.comb += self.raw[i].eq(Cat(word_r, word)[bit_offsets[i]:bit_offsets[i] + 10])
@@ -184,8 +184,25 @@ class Platform(Xilinx7SeriesPlatform):
             {build_name}.bit\" -file {build_name}.bin"
         ]
 
+    def add_incremental_implementation(self, reference):
+        # Place/Route incrementally from the routed checkpoint of the previous build (when present)
+        # and keep the new routed checkpoint as reference for the next one. -auto_incremental lets
+        # Vivado fall back to the default flow when the design changed too much to reuse it.
+        # Note: Commands are formatted with build_name by the toolchain, so Tcl braces are doubled.
+        self.toolchain.pre_placement_commands.append("\n".join([
+            "if {{[file exists %s]}} {{" % reference,
+            "    if {{[catch {{read_checkpoint -incremental -auto_incremental %s}} err]}} {{" % reference,
+            "        puts \"Incremental reference unusable, using default implementation: $err\"",
+            "    }}",
+            "}}",
+        ]))
+        self.toolchain.additional_commands.append("\n".join([
+            "file mkdir [file dirname %s]" % reference,
+            "file copy -force {build_name}_route.dcp %s" % reference,
+        ]))
+
     def create_programmer(self):
-        return OpenOCD("openocd_xc7_ft232.cfg", "bochen_kintex7_base.bit")
+        return OpenOCD("openocd_xc7_ft232.cfg", "bscan_spi_xc7k325t.bit")
 
     def create_programmer_vivado(self):
         return VivadoProgrammer(flash_part="mx25l25645g-spi-x1_x2_x4")
@@ -193,5 +210,6 @@ class Platform(Xilinx7SeriesPlatform):
     def do_finalize(self, fragment):
         Xilinx7SeriesPlatform.do_finalize(self, fragment)
         self.add_period_constraint(self.lookup_request("clk50", loose=True), 1e9/50e6)
-        self.add_period_constraint(self.lookup_request("eth_clocks:rx", 0, loose=True), 1e9/125e6)
+        for i in range(2):
+            self.add_period_constraint(self.lookup_request("eth_clocks:rx", i, loose=True), 1e9/125e6)
         self.add_platform_command("set_property DCI_CASCADE {{32}} [get_iobanks 33]")
@@ -3,38 +3,62 @@
 #
 # This file is part of LiteX-Boards.
 
+import os
+import sys
+import math
+import json
+import hashlib
+import logging
+import contextlib
+
 from migen import *
 
 from litex.gen import *
 
 from litex_boards_vacajk.platforms import bochen_kintex7_base
+from litex_boards_vacajk.cores.clock_planner import PlannedS7MMCM, plan_clocks, plan_report, vco_configs
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoS7HDMIPHY
-from litex.soc.cores.led import LedChaser
-
-from litedram.modules import MT41K256M16
-from litedram.phy import s7ddrphy
 
-from liteeth.phy.s7rgmii import LiteEthPHYRGMII
+# Note: Optional subsystems (LED chaser, LiteDRAM, LiteSPI, LiteEth, Video PHY) are only imported when
+# enabled, to keep module import (--help, CSR/argument queries) cheap.
 
 ident_default = "LiteX SoC on Bochen Kintex7 Base"
 
 # CRG ----------------------------------------------------------------------------------------------
 
+def crg_clocks(sys_clk_freq, with_sdram=False, with_ethernet=False, with_hdmi=False, hdmi_clk_freq=25e6):
+    """Clocks of the CRG ({name: (freq, margin, fractional)}) and groups of clocks that must share a
+    MMCM (phase relationship: DDR3 and HDMI serializers)."""
+    clocks = {"sys": (sys_clk_freq, 1e-2, False)}
+    groups = []
+    # IDelayCtrl (replicated by Vivado to every clock region using IDELAYs: DDR3, RGMII RX of both PHYs).
+    if with_sdram or with_ethernet:
+        clocks["idelay"] = (200e6, 1e-2, True)
+    if with_sdram:
+        clocks["sys4x"]  = (4*sys_clk_freq, 1e-2, False)
+        groups.append(("sys", "sys4x"))
+    if with_hdmi:
+        # hdmi_clk_freq is achievable (see video_clk_freq), so both clocks share the exact 1:5 ratio
+        # required by the serializers.
+        clocks["hdmi"]   = (hdmi_clk_freq,   1e-6, False)
+        clocks["hdmi5x"] = (5*hdmi_clk_freq, 1e-6, False)
+        groups.append(("hdmi", "hdmi5x"))
+    return clocks, groups
+
 class _CRG(LiteXModule):
     def __init__(self, platform, sys_clk_freq,
         with_sdram      = False,
         with_ethernet   = False,
         with_hdmi       = False,
+        hdmi_clk_freq   = 25e6,
         ):
 
-        clk_with_idelay = with_sdram or with_ethernet
-
         self.rst       = Signal()
         self.cd_sys    = ClockDomain()
+        self.clkouts   = {} # Clock domain name: MMCM output (named Vivado generated clock).
 
         # # #
 
@@ -42,31 +66,310 @@ class _CRG(LiteXModule):
         clk50 = platform.request("clk50")
         rst_n = platform.request("cpu_reset_n")
 
-        # PLL.
-        self.pll = pll = S7MMCM(speedgrade=-2)
+        # Clock Plan (clocks packed into as few MMCMs as possible).
+        clocks, groups = crg_clocks(sys_clk_freq, with_sdram, with_ethernet, with_hdmi, hdmi_clk_freq)
+        for name in clocks:
+            if name != "sys":
+                setattr(self, f"cd_{name}", ClockDomain(name))
+        self.plan = plan = plan_clocks(50e6, clocks, groups, speedgrade=-2)
+        plan_report(plan)
+
+        # PLLs (the first one, generating sys_clk, is reset with the SoC).
+        for n, mmcm_plan in enumerate(plan):
+            mmcm = PlannedS7MMCM(speedgrade=-2)
+            mmcm.register_clkin(clk50, 50e6)
+            for name in mmcm_plan["clocks"]:
+                freq, margin, fractional = clocks[name]
+                self.create_clkout(mmcm, getattr(self, f"cd_{name}"), freq, margin=margin, fractional=fractional)
+            setattr(self, "pll" if n == 0 else f"pll{n}", mmcm)
+        pll = self.pll
         self.comb += pll.reset.eq(~rst_n | self.rst)
-        pll.register_clkin(clk50, 50e6)
-        pll.create_clkout(self.cd_sys,    sys_clk_freq)
 
         # IDelayCtrl.
-        if clk_with_idelay:
-            self.cd_idelay = ClockDomain()
-            pll.create_clkout(self.cd_idelay, 200e6)
+        if "idelay" in clocks:
             self.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
 
-        if with_sdram:
-            self.cd_sys4x  = ClockDomain()
-            pll.create_clkout(self.cd_sys4x,  4*sys_clk_freq)
+        platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
 
-        if with_hdmi:
-            self.cd_hdmi   = ClockDomain()
-            self.cd_hdmi5x = ClockDomain()
-            self.video_pll = video_pll = S7MMCM(speedgrade=-2)
-            video_pll.register_clkin(clk50, 50e6)
-            video_pll.create_clkout(self.cd_hdmi,   25e6,  margin=0)
-            video_pll.create_clkout(self.cd_hdmi5x, 125e6, margin=0)
+    def create_clkout(self, pll, cd, freq, **kwargs):
+        pll.create_clkout(cd, freq, **kwargs)
+        self.clkouts[cd.name] = pll.clkouts[pll.nclkouts - 1][0]
+
+# SPI Flash ----------------------------------------------------------------------------------------
+
+# Read mode: (LiteSPI read opcode, MX25L25645G dummy cycles with power-on configuration (CR.DC=0)).
+spiflash_read_modes = {
+    "1-1-1" : ("READ_1_1_1", 0),
+    "1-1-4" : ("READ_1_1_4", 8),
+    "1-4-4" : ("READ_1_4_4", 6),
+}
+
+def spiflash_module(read_mode="1-1-1", dummy_cycles=None):
+    """MX25L25645G module using `read_mode` for memory-mapped reads."""
+    from litespi.modules import MX25L25645G
+    from litespi.opcodes import SpiNorFlashOpCodes as Codes
+    opcode, cycles = spiflash_read_modes[read_mode]
+    opcode = getattr(Codes, opcode)
+    if dummy_cycles is not None:
+        if read_mode == "1-1-1":
+            raise ValueError("1-1-1 reads (READ opcode) have no dummy cycles.")
+        cycles = dummy_cycles
+    quad_opcodes = [Codes.READ_1_1_4, Codes.READ_1_4_4] if read_mode != "1-1-1" else []
+
+    class BochenMX25L25645G(MX25L25645G):
+        # Quad reads are supported by the chip but not listed by LiteSPI. Only advertised when used
+        # since it makes the BIOS set the (non-volatile) QE bit on each boot.
+        supported_opcodes = MX25L25645G.supported_opcodes + quad_opcodes
+        dummy_cycles      = {opcode: cycles}
+
+    return BochenMX25L25645G(opcode)
+
+# SD Card ------------------------------------------------------------------------------------------
+
+sdcard_clk_freq_max = 50e6 # High Speed mode (the BIOS switches the card to it, else 25MHz).
+
+def sdcard_clk_divider(sys_clk_freq, clk_freq):
+    """SDCard PHY clocker divider applied by the BIOS for `clk_freq` (power of 2, from 2 to 256)."""
+    return min(max(2**math.ceil(math.log2(sys_clk_freq/clk_freq)), 2), 256)
+
+def add_sdcard(soc, mode="native", clk_freq=None, dma="bus", with_bench=False, pads=None):
+    """Add the SDCard in SPI (`spisdcard`, SPIMaster driven by the CPU) or native mode (`sdcard`,
+    4-bit LiteSDCard core with Block2Mem/Mem2Block DMAs).
+
+    `clk_freq` is the operating clock set by the BIOS after initialization (default: 20MHz in SPI
+    mode, 25MHz in native mode, up to 50MHz in High Speed mode). In native mode, `dma="dram"`
+    connects the DMAs to dedicated LiteDRAM ports at the DRAM data width for main_ram buffers (no
+    contention with the CPU, no L2 cache pollution; buffers aligned on the DRAM data width), other
+    buffers (SRAM) staying on the main bus. These ports bypass the L2 cache, which can't be
+    invalidated: the BIOS (flushing the L2 cache over DMA data after reads) requires it disabled
+    (l2_size=0) and firmwares must flush it before Mem2Block transfers. `with_bench` adds the
+    transfer timer (`soc.sdcard_bench`) of tools/sdcard_bench.py.
+    """
+    from litex_boards_vacajk.cores.sdcard_bench import SDCardTimer
+    if mode == "spi":
+        if pads is None:
+            soc.add_spi_sdcard()
+        else:
+            from litex.soc.cores.spi import SPIMaster
+            soc.spisdcard = SPIMaster(pads, data_width=8, sys_clk_freq=soc.sys_clk_freq, spi_clk_freq=400e3)
+            soc.spisdcard.add_clk_divider()
+        if clk_freq is not None:
+            soc.add_constant("SPISDCARD_CLK_FREQ", int(clk_freq))
+        if with_bench:
+            soc.sdcard_bench = SDCardTimer()
+            soc.sdcard_bench.add_spi(soc.spisdcard)
+        return
+
+    from litex.soc.interconnect import wishbone
+    from litesdcard.phy import SDPHY
+    from litesdcard.core import SDCore
+    from litesdcard.frontend.dma import SDBlock2MemDMA, SDMem2BlockDMA
+    from litex.soc.interconnect.csr_eventmanager import EventManager, EventSourcePulse, EventSourceLevel
+
+    if dma == "dram" and hasattr(soc, "l2_cache") and soc.integrated_rom_size:
+        raise ValueError("SDCard DMA to DRAM requires the L2 cache disabled with the BIOS (L2 flush after DMA reads).")
+    if clk_freq is not None:
+        if clk_freq > sdcard_clk_freq_max:
+            raise ValueError(f"SDCard clk frequency {clk_freq/1e6:.1f}MHz above {sdcard_clk_freq_max/1e6:.0f}MHz (High Speed).")
+        divider = sdcard_clk_divider(soc.sys_clk_freq, clk_freq)
+        logging.getLogger("SDCard").info(f"SDCard clk: {soc.sys_clk_freq/divider/1e6:.3f}MHz (sys_clk/{divider}).")
+        soc.add_constant("SDCARD_CLK_FREQ", int(clk_freq))
+
+    # PHY/Core.
+    soc.sdcard_phy  = SDPHY(pads or soc.platform.request("sdcard"), soc.platform.device, soc.clk_freq,
+        cmd_timeout  = 10e-1,
+        data_timeout = 10e-1,
+    )
+    soc.sdcard_core = SDCore(soc.sdcard_phy)
+
+    # DMAs (on the main bus, or on a LiteDRAM port for main_ram buffers).
+    def dma_bus(name):
+        if dma == "dram":
+            from litedram.frontend.wishbone import LiteDRAMWishbone2Native
+            port     = soc.sdram.crossbar.get_port()
+            main_ram = soc.bus.regions["main_ram"]
+            shift    = log2_int(port.data_width//8)
+            bus, dram_bus, main_bus = [wishbone.Interface(data_width=port.data_width, address_width=32, addressing="word") for _ in range(3)]
+            def in_main_ram(adr):
+                return (adr >= (main_ram.origin >> shift)) & (adr < ((main_ram.origin + main_ram.size) >> shift))
+            setattr(soc, f"{name}_decoder", wishbone.Decoder(bus, [
+                (in_main_ram, dram_bus),
+                (lambda adr: ~in_main_ram(adr), main_bus),
+            ]))
+            wb2native      = LiteDRAMWishbone2Native(dram_bus, port, base_address=main_ram.origin)
+            wb2native.port = port # Names the crossbar port (perf counters).
+            setattr(soc, f"{name}_dram", wb2native)
+            getattr(soc, "dma_bus", soc.bus).add_master(name=name, master=main_bus)
+        else:
+            bus = wishbone.Interface(data_width=soc.bus.data_width, adr_width=soc.bus.get_address_width(standard="wishbone"), addressing="word")
+            getattr(soc, "dma_bus", soc.bus).add_master(name=name, master=bus)
+        return bus
+    soc.sdcard_block2mem = SDBlock2MemDMA(bus=dma_bus("sdcard_block2mem"), endianness=soc.cpu.endianness)
+    soc.sdcard_mem2block = SDMem2BlockDMA(bus=dma_bus("sdcard_mem2block"), endianness=soc.cpu.endianness)
+    soc.comb += [
+        soc.sdcard_core.source.connect(soc.sdcard_block2mem.sink),
+        soc.sdcard_mem2block.source.connect(soc.sdcard_core.sink),
+    ]
+
+    # IRQs.
+    soc.sdcard_irq = sdcard_irq = EventManager()
+    sdcard_irq.card_detect   = EventSourcePulse(description="SDCard has been ejected/inserted.")
+    sdcard_irq.block2mem_dma = EventSourcePulse(description="Block2Mem DMA terminated.")
+    sdcard_irq.mem2block_dma = EventSourcePulse(description="Mem2Block DMA terminated.")
+    sdcard_irq.cmd_done      = EventSourceLevel(description="Command completed.")
+    sdcard_irq.finalize()
+    soc.comb += [
+        sdcard_irq.card_detect.trigger.eq(soc.sdcard_phy.card_detect_irq),
+        sdcard_irq.block2mem_dma.trigger.eq(soc.sdcard_block2mem.irq),
+        sdcard_irq.mem2block_dma.trigger.eq(soc.sdcard_mem2block.irq),
+        sdcard_irq.cmd_done.trigger.eq(soc.sdcard_core.cmd_event.fields.done),
+    ]
+    if soc.irq.enabled:
+        soc.irq.add("sdcard_irq", use_loc_if_exists=True)
+
+    if with_bench:
+        soc.sdcard_bench = SDCardTimer()
+        soc.sdcard_bench.add_native(soc.sdcard_core)
+
+# Video --------------------------------------------------------------------------------------------
+
+hdmi5x_clk_freq_max = 710e6 # Kintex7 -2 BUFG (OSERDESE2 CLK).
+dram_efficiency     = 0.7   # Usable fraction of DDR3 peak bandwidth (refresh, turnarounds, bank conflicts).
+
+def video_clk_freq(pix_clk, clkin_freq=50e6, speedgrade=-2):
+    """Closest pixel clock to `pix_clk` with an exact 5x clock from the same MMCM VCO."""
+    if 5*pix_clk > hdmi5x_clk_freq_max:
+        raise ValueError(f"{pix_clk/1e6:3.2f}MHz pixel clock exceeds HDMI serializer limit ({hdmi5x_clk_freq_max/5e6:3.2f}MHz).")
+    best = None
+    for vco_freq, _, _ in vco_configs(clkin_freq, speedgrade):
+        clkout_divide = min(max(round(vco_freq/(5*pix_clk)), 1), 128//5) # hdmi5x divider (hdmi: 5x).
+        freq = vco_freq/(5*clkout_divide)
+        if best is None or abs(freq - pix_clk) < abs(best - pix_clk):
+            best = freq
+    return best
+
+def video_bandwidth(sys_clk_freq, l2_size, framebuffer_timings=None, capture_timings=None, dram_data_width=256):
+    """DDR3 bandwidth budget (bytes/s) of the video framebuffer/capture beside CPU traffic.
+
+    Video streams are counted at their active line rate (4 bytes/pixel). CPU traffic is a streaming
+    (memcpy-like) access every 2 sys_clk cycles: 4 bytes with the L2 cache, a full DRAM word without.
+    """
+    from litex.soc.cores.video import video_timings
+    budget = {}
+    budget["peak"]   = sys_clk_freq*dram_data_width/8
+    budget["usable"] = budget["peak"]*dram_efficiency
+    budget["cpu"]    = sys_clk_freq/2*(4 if l2_size else dram_data_width/8)
+    budget["framebuffer"] = 0 if framebuffer_timings is None else 4*video_timings[framebuffer_timings]["pix_clk"]
+    budget["capture"]     = 0 if capture_timings     is None else 4*video_timings[capture_timings]["pix_clk"]
+    budget["headroom"] = budget["usable"] - budget["cpu"] - budget["framebuffer"] - budget["capture"]
+    return budget
+
+# UDP Streamer -------------------------------------------------------------------------------------
+
+def add_udp_streamer(soc, udp, udp_port=5000, remote_ip=None):
+    """Add a DDR3 to UDP streamer (`soc.udp_streamer`) on the `udp` LiteEth UDP core."""
+    from liteeth.common import convert_ip
+    from litex_boards_vacajk.cores.udp_streamer import DRAMUDPStreamer
+    # Streamer runs from sys_clk, CDC to the UDP/IP stack is done by its UDP port.
+    soc.cd_udp_streamer = ClockDomain()
+    soc.comb += soc.cd_udp_streamer.clk.eq(ClockSignal("sys"))
+    soc.comb += soc.cd_udp_streamer.rst.eq(ResetSignal("sys"))
+    soc.udp_streamer = DRAMUDPStreamer(
+        dram_port  = soc.sdram.crossbar.get_port(),
+        udp_port   = udp.crossbar.get_port(udp_port, dw=32, cd="udp_streamer"),
+        ip_address = 0 if remote_ip is None else convert_ip(remote_ip),
+        src_port   = udp_port,
+        dst_port   = udp_port,
+    )
 
-        platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
+# SDRAM Benchmark ----------------------------------------------------------------------------------
+
+def add_sdram_bench(soc, clk_freq=None):
+    """Add the DRAM benchmarks: native port (`soc.sdram_bench`) and CPU path through the L2 cache
+    (`soc.sdram_bus_bench`). LiteDRAM's BIST (add_sdram(with_bist=True)) completes them with data
+    checking. `clk_freq` is the frequency DRAM timings are computed for (default: sys_clk_freq)."""
+    from litex_boards_vacajk.cores.dram_bench import DRAMBench
+    from litex_boards_vacajk.cores.read_bench import WishboneReadBench
+    port = soc.sdram.crossbar.get_port()
+    soc.sdram_bench     = DRAMBench(port)
+    soc.sdram_bus_bench = WishboneReadBench()
+    soc.bus.add_master(name="sdram_bus_bench", master=soc.sdram_bus_bench.bus)
+    soc.add_constant("SDRAM_BENCH_DATA_WIDTH", port.data_width)
+    soc.add_constant("SDRAM_BENCH_CLK_FREQ",   int(soc.sys_clk_freq if clk_freq is None else clk_freq))
+
+# Performance Counters -----------------------------------------------------------------------------
+
+def _dram_port_name(soc, port, depth=4):
+    """Name of the first SoC module holding `port` (searching its submodules), or None."""
+    def walk(module, depth, seen):
+        if any(v is port for v in vars(module).values()):
+            return True
+        for _, submodule in getattr(module, "_submodules", []):
+            if depth and id(submodule) not in seen:
+                seen.add(id(submodule))
+                if walk(submodule, depth - 1, seen):
+                    return True
+        return False
+    for name, module in soc._submodules:
+        if name not in [None, "sdram"] and walk(module, depth, set()):
+            return name
+    return None
+
+def add_perf_counters(soc):
+    """Add always-on performance counters (`soc.perf`) on the main bus masters/slaves (including
+    SPI Flash XIP and Ethernet MAC buffers), the L2 cache refills, the LiteDRAM crossbar ports
+    (including video framebuffer DMA) and the Ethernet MACs. To be called once all the peripherals
+    have been added."""
+    from litex_boards_vacajk.cores.perf_counters import PerfCounters
+    soc.perf = perf = PerfCounters()
+    # Main Bus.
+    for name, interface in soc.bus.masters.items():
+        perf.add_wishbone_probe(f"master_{name}", interface)
+    for name, interface in soc.bus.slaves.items():
+        perf.add_wishbone_probe(f"slave_{name}", interface)
+    # L2 Cache (Refills/Write-backs).
+    if hasattr(soc, "l2_cache"):
+        perf.add_wishbone_probe("l2_refill", soc.l2_cache.slave)
+    # LiteDRAM Crossbar Ports.
+    if hasattr(soc, "sdram"):
+        for n, port in enumerate(soc.sdram.crossbar.masters):
+            name = _dram_port_name(soc, port) or f"port{n}"
+            perf.add_stream_probe(f"dram_{name}", port.cmd, nbytes=port.data_width//8)
+    # Ethernet MACs (sys-side of the MAC cores, Etherbone is covered by its bus master).
+    for name in ["ethmac", "ethmac1"]:
+        if hasattr(soc, name):
+            perf.add_stream_probe(f"{name}_tx", getattr(soc, name).core.sink)
+            perf.add_stream_probe(f"{name}_rx", getattr(soc, name).core.source)
+
+# Timing Reports -----------------------------------------------------------------------------------
+
+def clock_names(soc):
+    """LiteX names of the Vivado clocks of the last build: CRG clock domains (MMCM generated clocks,
+    named after the MMCM outputs) and Ethernet PHYs RX clock inputs."""
+    vns   = soc.platform.toolchain._vns
+    names = {vns.get_name(clkout): name for name, clkout in soc.crg.clkouts.items()}
+    for n in range(2):
+        rx = soc.platform.lookup_request("eth_clocks:rx", n, loose=True)
+        if rx is not None:
+            names[vns.get_name(rx)] = "eth_clocks:rx" if n == 0 else f"eth_clocks{n}:rx"
+    return names
+
+def check_timing(soc, builder, history, limits=None):
+    """Append the timing/utilization of the last build to `history` and warn on `limits`."""
+    from litex_boards_vacajk.tools import vivado_reports
+    reports = vivado_reports.read_timing_reports(builder.gateware_dir, soc.get_build_name())
+    if reports["timing"] is None:
+        print("No timing report, skipping timing history.")
+        return
+    vivado_reports.print_timing_reports(reports)
+    if limits is not None:
+        with open(limits, "r") as f:
+            limits = json.load(f)
+    previous = vivado_reports.read_history(history)
+    entry    = vivado_reports.history_entry(reports, argv=sys.argv[1:], sys_clk_freq=soc.sys_clk_freq)
+    for warning in vivado_reports.check_limits(entry, previous[-1] if previous else None, limits or {}):
+        logging.getLogger("Timing").warning(warning)
+    vivado_reports.append_history(history, entry)
 
 # BaseSoC ------------------------------------------------------------------------------------------
 
@@ -76,31 +379,73 @@ class BaseSoC(SoCCore):
         with_led_chaser     = True,
 
         with_sdram          = False,
-        with_spi_flash      = False,
+        with_sdram_bench    = False,
         with_spi_sdcard     = False,
         with_sdcard         = False,
+        sdcard_clk_freq     = None,
+        sdcard_dma          = "bus",
+        with_sdcard_bench   = False,
+
+        with_spi_flash          = False,
+        spi_flash_read_mode     = "1-1-1",
+        spi_flash_dummy_cycles  = None,
+        spi_flash_clk_freq      = None,
+        with_spi_flash_bench    = False,
 
         with_ethernet       = False,
         with_etherbone      = False,
         eth_phy             = 0,
+        eth_dual            = False,
         eth_ip              = "192.168.1.50",
+        eth1_ip             = "192.168.1.51",
         eth_remote_ip       = None,
         eth_software_debug  = False,
         eth_dynamic_ip      = False,
+        with_udp_streamer   = False,
+        udp_streamer_port   = 5000,
+        with_perf_counters  = False,
 
         with_video_terminal     = False,
         with_video_framebuffer  = False,
         with_video_colorbars    = False,
+        video_timings           = "640x480@60Hz",
+        with_video_capture      = False,
+        video_capture_timings   = "1280x720@60Hz",
 
         ident           = ident_default,
         **kwargs):
         platform = bochen_kintex7_base.Platform()
+        with_video = with_video_terminal or with_video_framebuffer or with_video_colorbars
+
+        # Video Timings / DRAM Bandwidth -----------------------------------------------------------
+        if with_video:
+            from litex.soc.cores.video import video_timings as _video_timings
+            if video_timings not in _video_timings:
+                raise ValueError(f"Video Timings {video_timings} not supported, availables: {', '.join(_video_timings)}.")
+            pix_clk       = _video_timings[video_timings]["pix_clk"]
+            hdmi_clk_freq = video_clk_freq(pix_clk)
+            pix_clk_error = hdmi_clk_freq/pix_clk - 1
+            logging.getLogger("BaseSoC").info(f"Video {video_timings}: {hdmi_clk_freq/1e6:3.3f}MHz pixel clock ({pix_clk_error*100:+.2f}%).")
+            if abs(pix_clk_error) > 0.5e-2:
+                logging.getLogger("BaseSoC").warning("Pixel clock outside of CEA-861 tolerance (0.5%), some displays could reject it.")
+        if with_sdram and (with_video_framebuffer or with_video_capture):
+            budget = video_bandwidth(sys_clk_freq,
+                l2_size             = kwargs.get("l2_size", 8192),
+                framebuffer_timings = video_timings if with_video_framebuffer else None,
+                capture_timings     = video_capture_timings if with_video_capture else None,
+            )
+            logging.getLogger("BaseSoC").info("DDR3 bandwidth: {:.0f}MB/s usable, framebuffer {:.0f}MB/s, capture {:.0f}MB/s, CPU {:.0f}MB/s, headroom {:.0f}MB/s ({:.0f}%).".format(
+                budget["usable"]/1e6, budget["framebuffer"]/1e6, budget["capture"]/1e6, budget["cpu"]/1e6,
+                budget["headroom"]/1e6, budget["headroom"]/budget["usable"]*100))
+            if budget["headroom"] < 0:
+                raise ValueError("Video DDR3 bandwidth exceeds the available bandwidth, reduce video timings or increase sys_clk_freq.")
 
         # CRG --------------------------------------------------------------------------------------
         self.crg = _CRG(platform, sys_clk_freq,
                         with_sdram      = with_sdram,
                         with_ethernet   = with_ethernet or with_etherbone,
-                        with_hdmi       = with_video_terminal or with_video_framebuffer or with_video_colorbars
+                        with_hdmi       = with_video,
+                        hdmi_clk_freq   = hdmi_clk_freq if with_video else 25e6,
                         )
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -108,12 +453,15 @@ class BaseSoC(SoCCore):
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
+            from litex.soc.cores.led import LedChaser
             self.leds = LedChaser(
                 pads         = platform.request_all("user_led"),
                 sys_clk_freq = sys_clk_freq)
 
         # DDR3 SDRAM -------------------------------------------------------------------------------
         if with_sdram and not self.integrated_main_ram_size:
+            from litedram.modules import MT41K256M16
+            from litedram.phy import s7ddrphy
             self.ddrphy = s7ddrphy.K7DDRPHY(platform.request("ddram"),
                 memtype      = "DDR3",
                 nphases      = 4,
@@ -122,70 +470,196 @@ class BaseSoC(SoCCore):
                 phy           = self.ddrphy,
                 module        = MT41K256M16(sys_clk_freq, "1:4"),
                 l2_cache_size = kwargs.get("l2_size", 8192),
+                with_bist     = with_sdram_bench,
             )
+            if with_sdram_bench:
+                add_sdram_bench(self)
 
         # SPI Flash --------------------------------------------------------------------------------
         if with_spi_flash:
-            from litespi.modules import MX25L25645G
-            from litespi.opcodes import SpiNorFlashOpCodes as Codes
-            self.add_spi_flash(mode="4x", module=MX25L25645G(Codes.READ_1_1_1), with_master=True)
+            self.add_spi_flash(mode="4x",
+                module      = spiflash_module(spi_flash_read_mode, spi_flash_dummy_cycles),
+                clk_freq    = 20e6 if spi_flash_clk_freq is None else spi_flash_clk_freq,
+                with_master = True,
+            )
+            if spi_flash_clk_freq is not None:
+                self.add_constant("SPIFLASH_SKIP_FREQ_INIT") # Keep requested clk instead of BIOS calibration.
+            from litex_boards_vacajk.tools.flash_update import spiflash_regions
+            self.add_constant("FLASH_BOOT_ADDRESS", self.bus.regions["spiflash"].origin + spiflash_regions["firmware"][0])
+            if with_spi_flash_bench:
+                from litex_boards_vacajk.cores.read_bench import WishboneReadBench
+                self.spiflash_bench = WishboneReadBench()
+                self.bus.add_master(name="spiflash_bench", master=self.spiflash_bench.bus)
 
         # SD Card --------------------------------------------------------------------------------
-        if with_spi_sdcard:
-            self.add_spi_sdcard()
-        if with_sdcard:
-            self.add_sdcard()
+        if with_spi_sdcard or with_sdcard:
+            if sdcard_dma == "dram" and not with_sdram:
+                raise ValueError("SDCard DMA to DRAM requires SDRAM.")
+            add_sdcard(self,
+                mode       = "spi" if with_spi_sdcard else "native",
+                clk_freq   = sdcard_clk_freq,
+                dma        = sdcard_dma,
+                with_bench = with_sdcard_bench,
+            )
 
         # HDMI Options -----------------------------------------------------------------------------
-        if with_video_colorbars or with_video_framebuffer or with_video_terminal:
+        if with_video:
+            from litex.soc.cores.video import VideoS7HDMIPHY
             self.videophy = VideoS7HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_colorbars:
-                self.add_video_colorbars(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
+                self.add_video_colorbars(phy=self.videophy, timings=video_timings, clock_domain="hdmi")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
+                self.add_video_terminal(phy=self.videophy, timings=video_timings, clock_domain="hdmi")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
+                self.add_video_framebuffer(phy=self.videophy, timings=video_timings, clock_domain="hdmi")
+
+        # HDMI Input (Video Capture) ---------------------------------------------------------------
+        if with_video_capture:
+            if not with_sdram:
+                raise ValueError("Video Capture requires SDRAM.")
+            from litex.soc.cores.video import video_timings
+            from litex_boards_vacajk.cores.video_capture import S7HDMIInPHY, EDID, edid_data, VideoCapture
+            vt = video_timings[video_capture_timings]
+            hdmi_in_pads = platform.request("hdmi_in")
+            # Note: The receiver MMCM is configured for the advertised (EDID) timings pixel clock.
+            self.video_capture_phy  = S7HDMIInPHY(hdmi_in_pads, pix_freq=vt["pix_clk"], clock_domain="hdmi_in")
+            self.video_capture_edid = EDID(edid_data(vt), pads=hdmi_in_pads)
+            self.video_capture      = VideoCapture(
+                phy          = self.video_capture_phy,
+                dram_port    = self.sdram.crossbar.get_port(mode="write"),
+                hres         = vt["h_active"],
+                vres         = vt["v_active"],
+                clock_domain = "hdmi_in",
+            )
+            platform.add_period_constraint(hdmi_in_pads.clk_p, 1e9/vt["pix_clk"])
+            platform.add_false_path_constraints(self.crg.cd_sys.clk, self.video_capture_phy.cd_hdmi_in.clk)
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
-        if with_ethernet or with_etherbone:
+        if with_ethernet or with_etherbone or with_udp_streamer:
+            if eth_dual and not (with_ethernet or with_etherbone):
+                raise ValueError("Dual Ethernet requires Ethernet or Etherbone (UDP Streamer only uses one PHY).")
+            from liteeth.phy.s7rgmii import LiteEthPHYRGMII
             self.ethphy = LiteEthPHYRGMII(
                 clock_pads  = self.platform.request("eth_clocks", eth_phy),
                 pads        = self.platform.request("eth", eth_phy),
                 tx_delay    = 1e-9,
                 rx_delay    = 1e-9,
             )
-            if with_etherbone:
+            if eth_dual:
+                # Second PHY with its own eth1_rx/eth1_tx clock domains.
+                self.ethphy1 = ClockDomainsRenamer({"eth_rx": "eth1_rx", "eth_tx": "eth1_tx"})(LiteEthPHYRGMII(
+                    clock_pads  = self.platform.request("eth_clocks", 1 - eth_phy),
+                    pads        = self.platform.request("eth", 1 - eth_phy),
+                    tx_delay    = 1e-9,
+                    rx_delay    = 1e-9,
+                ))
+            if eth_dual and with_etherbone and with_ethernet:
+                # Etherbone and CPU Ethernet on separate links.
+                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+                self.add_ethernet(phy=self.ethphy1, phy_cd="eth1", dynamic_ip=eth_dynamic_ip, local_ip=None if eth_dynamic_ip else eth1_ip, remote_ip=eth_remote_ip, software_debug=eth_software_debug)
+            elif with_etherbone:
                 self.add_etherbone(phy=self.ethphy, ip_address=eth_ip, with_ethmac=with_ethernet)
+                if eth_dual:
+                    self.add_etherbone(name="etherbone1", phy=self.ethphy1, phy_cd="eth1", ip_address=eth1_ip, mac_address=0x10e2d5000002)
             elif with_ethernet:
-                self.add_ethernet(phy=self.ethphy, dynamic_ip=eth_dynamic_ip, local_ip=eth_ip, remote_ip=eth_remote_ip, software_debug=eth_software_debug)
+                self.add_ethernet(phy=self.ethphy, dynamic_ip=eth_dynamic_ip, local_ip=None if eth_dynamic_ip else eth_ip, remote_ip=eth_remote_ip, software_debug=eth_software_debug)
+                if eth_dual:
+                    # Second MAC is left to the firmware (the BIOS only uses ethmac).
+                    from litex.soc.integration.soc import add_ip_address_constants
+                    self.add_ethernet(name="ethmac1", phy=self.ethphy1, phy_cd="eth1")
+                    add_ip_address_constants(self, "ETHMAC1_LOCALIP", eth1_ip)
+
+        # UDP Streamer -----------------------------------------------------------------------------
+        if with_udp_streamer:
+            if not hasattr(self, "sdram"):
+                raise ValueError("UDP Streamer requires SDRAM.")
+            if with_etherbone:
+                # Share Etherbone's UDP/IP stack.
+                udp = self.ethcore_etherbone.udp
+            elif with_ethernet:
+                raise ValueError("UDP Streamer requires Etherbone (shared UDP/IP stack) or a PHY without CPU Ethernet.")
+            else:
+                from liteeth.core import LiteEthUDPIPCore
+                self.ethcore_udp_streamer = ClockDomainsRenamer({"sys": "eth_rx"})(LiteEthUDPIPCore(
+                    phy         = self.ethphy,
+                    mac_address = 0x10e2d5000000,
+                    ip_address  = eth_ip,
+                    clk_freq    = self.clk_freq,
+                    dw          = 8,
+                ))
+                udp = self.ethcore_udp_streamer.udp
+                eth_rx_clk = self.ethphy.crg.cd_eth_rx.clk
+                eth_tx_clk = self.ethphy.crg.cd_eth_tx.clk
+                self.platform.add_period_constraint(eth_rx_clk, 1e9/self.ethphy.rx_clk_freq)
+                self.platform.add_period_constraint(eth_tx_clk, 1e9/self.ethphy.tx_clk_freq)
+                self.platform.add_false_path_constraints(self.crg.cd_sys.clk, eth_rx_clk, eth_tx_clk)
+            add_udp_streamer(self, udp, udp_port=udp_streamer_port, remote_ip=eth_remote_ip)
+
+        # Performance Counters ---------------------------------------------------------------------
+        if with_perf_counters:
+            add_perf_counters(self)
 
 # Build --------------------------------------------------------------------------------------------
 
 def main():
+    from litex_boards_vacajk.tools.build_profile import BuildProfile, instrument_elaboration, instrument_litex
+    profile = BuildProfile()
+
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=bochen_kintex7_base.Platform, description=ident_default)
     parser.add_target_argument("--flash",               action="store_true",                                help="Flash bitstream.")
+    parser.add_target_argument("--flash-update",        default=None,               nargs="*", choices=["bitstream", "firmware"], help="Differential SPI Flash update of these regions (default: bitstream and --flash-firmware) through OpenOCD.")
+    parser.add_target_argument("--flash-firmware",      default=None,                                       help="Firmware binary of the --flash-update firmware region.")
+    parser.add_target_argument("--flash-manifest",      default=None,                                       help="Manifest of the last programmed images of the board (one per board, required by --flash-update).")
+    parser.add_target_argument("--flash-readback",      action="store_true",                                help="Diff --flash-update against the flash contents instead of the manifest.")
+    parser.add_target_argument("--build-cache",         default=None,                                       help="Build cache directory (reuse bitstreams of identical gateware).")
+    parser.add_target_argument("--build-cache-max-size", default=20,                type=float,             help="Build cache maximum size (in GB).")
+    parser.add_target_argument("--build-cache-max-age", default=30,                 type=float,             help="Build cache maximum entry age (in days).")
+
+    parser.add_target_argument("--incremental",         action="store_true",                                help="Incremental implementation from the previous routed checkpoint.")
+
+    parser.add_target_argument("--profile",             default=None,                                       help="Write build phases profile to JSON file.")
+    parser.add_target_argument("--profile-trace",       default=None,                                       help="Write build phases profile to Chrome trace file.")
+    parser.add_target_argument("--profile-history",     default=None,                                       help="Append build phases profile to JSON Lines history file.")
+    parser.add_target_argument("--timing-history",      default=None,                                       help="Append timing/utilization to JSON Lines history file (warn on limits).")
+    parser.add_target_argument("--timing-limits",       default=None,                                       help="JSON file with WNS/utilization limits of --timing-history.")
 
     parser.add_target_argument("--sys-clk-freq",        default=100e6,              type=float,             help="System clock frequency.")
     parser.add_target_argument("--with-sdram",          action="store_true",                                help="Enable optional SDRAM module.")
+    parser.add_target_argument("--with-sdram-bench",    action="store_true",                                help="Enable SDRAM BIST and bandwidth/latency benchmark.")
     parser.add_target_argument("--with-spi-flash",      action="store_true",                                help="Enable SPI Flash (MMAPed).")
+    parser.add_target_argument("--spi-flash-read-mode", default="1-1-1",            choices=spiflash_read_modes, help="SPI Flash read mode (cmd-addr-data lanes).")
+    parser.add_target_argument("--spi-flash-dummy-cycles", default=None,            type=int,               help="SPI Flash read dummy cycles, must match flash CR.DC (default: power-on value of the read mode).")
+    parser.add_target_argument("--spi-flash-clk-freq",  default=None,               type=float,             help="SPI Flash clk frequency (default: BIOS calibration from 20MHz).")
+    parser.add_target_argument("--with-spi-flash-bench", action="store_true",                               help="Enable SPI Flash XIP/bulk read benchmark.")
 
     parser.add_target_argument("--with-ethernet",       action="store_true",                                help="Enable Ethernet support.")
     parser.add_target_argument("--with-etherbone",      action="store_true",                                help="Enable Etherbone support.")
-    parser.add_target_argument("--eth-phy",             default=0,                                          help="Ethernet/Etherbone PHY index.")
+    parser.add_target_argument("--eth-phy",             default=0,                  type=int,               help="Ethernet/Etherbone PHY index.")
+    parser.add_target_argument("--eth-dual",            action="store_true",                                help="Use both Ethernet PHYs (second one: Ethernet with Etherbone, else same role).")
     parser.add_target_argument("--eth-ip",              default="192.168.1.50",                             help="Ethernet/Etherbone IP address.")
+    parser.add_target_argument("--eth1-ip",             default="192.168.1.51",                             help="Ethernet/Etherbone IP address of the second PHY (with --eth-dual).")
     parser.add_target_argument("--eth-remote-ip",       default="192.168.1.106",                            help="Remote IP address of TFTP server.")
     parser.add_target_argument("--eth-dynamic-ip",      action="store_true",                                help="Enable dynamic Ethernet IP addresses setting.")
     parser.add_target_argument("--eth-software-debug",  action="store_true",                                help="Enable UDP debug.")
+    parser.add_target_argument("--with-udp-streamer",   action="store_true",                                help="Enable hardware DDR3 to UDP streamer (to --eth-remote-ip).")
+    parser.add_target_argument("--udp-streamer-port",   default=5000,               type=int,               help="UDP Streamer source/destination UDP port.")
+    parser.add_target_argument("--with-perf-counters",  action="store_true",                                help="Enable bus/DRAM/Ethernet performance counters.")
 
     sdopts = parser.target_group.add_mutually_exclusive_group()
     sdopts.add_argument("--with-spi-sdcard",            action="store_true",                                help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",                action="store_true",                                help="Enable SDCard support.")
+    parser.add_target_argument("--sdcard-clk-freq",     default=None,               type=float,             help="SDCard clk frequency (default: 20MHz SPI-mode, 25MHz native, up to 50MHz).")
+    parser.add_target_argument("--sdcard-dma",          default="bus",              choices=["bus", "dram"], help="SDCard DMAs on the main bus or on dedicated DDR3 ports (main_ram buffers, --l2-size 0 with the BIOS).")
+    parser.add_target_argument("--with-sdcard-bench",   action="store_true",                                help="Enable SDCard block transfer timer (for sdcard_bench.py).")
 
     viopts = parser.target_group.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",        action="store_true",                                help="Enable Video Terminal (VGA).")
     viopts.add_argument("--with-video-framebuffer",     action="store_true",                                help="Enable Video Framebuffer (VGA).")
     viopts.add_argument("--with-video-colorbars",       action="store_true",                                help="Enable Video Colorbars (VGA).")
+    parser.add_target_argument("--video-timings",       default="640x480@60Hz",                             help="HDMI output video timings (e.g. 800x600@60Hz, 1280x720@60Hz).")
+    parser.add_target_argument("--with-video-capture",  action="store_true",                                help="Enable HDMI input capture to DDR3 frame buffers.")
+    parser.add_target_argument("--video-capture-timings", default="1280x720@60Hz",                          help="HDMI input timings (advertised through EDID).")
 
     parser.set_defaults(
         soc_csv                 = "csr.csv",
@@ -202,46 +676,118 @@ def main():
     )
 
     args = parser.parse_args()
+    profile.add_phase("arguments", 0, profile.now())
 
     assert not (args.with_etherbone and args.eth_dynamic_ip)
 
-    soc = BaseSoC(
-        sys_clk_freq            = args.sys_clk_freq,
-        with_sdram              = args.with_sdram,
-        with_spi_flash          = args.with_spi_flash,
-        with_spi_sdcard         = args.with_spi_sdcard,
-        with_sdcard             = args.with_sdcard,
-
-        with_ethernet           = args.with_ethernet,
-        with_etherbone          = args.with_etherbone,
-        eth_phy                 = args.eth_phy,
-        eth_ip                  = args.eth_ip,
-        eth_remote_ip           = args.eth_remote_ip,
-        eth_dynamic_ip          = args.eth_dynamic_ip,
-        eth_software_debug      = args.eth_software_debug,
-
-        with_video_terminal     = args.with_video_terminal,
-        with_video_framebuffer  = args.with_video_framebuffer,
-        with_video_colorbars    = args.with_video_colorbars,
-
-        **parser.soc_argdict
-    )
+    if args.flash_update is not None:
+        regions = args.flash_update or ["bitstream"] + (["firmware"] if args.flash_firmware is not None else [])
+        if "firmware" in regions and args.flash_firmware is None:
+            parser.error("--flash-update firmware requires --flash-firmware.")
+        if args.flash_manifest is None:
+            parser.error("--flash-update requires --flash-manifest (one per board).")
+
+    # Build phases are only instrumented when profiling.
+    profiling  = any([args.profile, args.profile_trace, args.profile_history])
+    instrument = (lambda f, *a: f(profile, *a)) if profiling else (lambda f, *a: contextlib.nullcontext())
+
+    soc_argdict = parser.soc_argdict
+    if args.build_cache is not None:
+        soc_argdict["ident_version"] = False # Build time in identifier would defeat the build cache.
+
+    with profile.phase("elaboration", "elaboration"), instrument(instrument_elaboration, sys.modules[__name__], _CRG):
+        soc = BaseSoC(
+            sys_clk_freq            = args.sys_clk_freq,
+            with_sdram              = args.with_sdram,
+            with_sdram_bench        = args.with_sdram_bench,
+            with_spi_flash          = args.with_spi_flash,
+            spi_flash_read_mode     = args.spi_flash_read_mode,
+            spi_flash_dummy_cycles  = args.spi_flash_dummy_cycles,
+            spi_flash_clk_freq      = args.spi_flash_clk_freq,
+            with_spi_flash_bench    = args.with_spi_flash_bench,
+            with_spi_sdcard         = args.with_spi_sdcard,
+            with_sdcard             = args.with_sdcard,
+            sdcard_clk_freq         = args.sdcard_clk_freq,
+            sdcard_dma              = args.sdcard_dma,
+            with_sdcard_bench       = args.with_sdcard_bench,
+
+            with_ethernet           = args.with_ethernet,
+            with_etherbone          = args.with_etherbone,
+            eth_phy                 = args.eth_phy,
+            eth_dual                = args.eth_dual,
+            eth_ip                  = args.eth_ip,
+            eth1_ip                 = args.eth1_ip,
+            eth_remote_ip           = args.eth_remote_ip,
+            eth_dynamic_ip          = args.eth_dynamic_ip,
+            eth_software_debug      = args.eth_software_debug,
+            with_udp_streamer       = args.with_udp_streamer,
+            udp_streamer_port       = args.udp_streamer_port,
+            with_perf_counters      = args.with_perf_counters,
+
+            with_video_terminal     = args.with_video_terminal,
+            with_video_framebuffer  = args.with_video_framebuffer,
+            with_video_colorbars    = args.with_video_colorbars,
+            video_timings           = args.video_timings,
+            with_video_capture      = args.with_video_capture,
+            video_capture_timings   = args.video_capture_timings,
+
+            **soc_argdict
+        )
+
+    if args.incremental:
+        # One reference checkpoint per configuration (build/programming controls excluded).
+        config = {k: v for k, v in vars(args).items() if k not in [
+            "build", "load", "flash", "flash_update", "flash_firmware", "flash_manifest", "flash_readback",
+            "incremental", "build_cache", "build_cache_max_size", "build_cache_max_age",
+            "profile", "profile_trace", "profile_history", "timing_history", "timing_limits"]}
+        config_hash = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        soc.platform.add_incremental_implementation(reference=f"incremental/{config_hash[:16]}.dcp")
 
     builder = Builder(soc, **parser.builder_argdict)
 
     if args.build:
-        builder.build(**parser.toolchain_argdict)
+        with profile.phase("build"), instrument(instrument_litex, soc, builder):
+            if args.build_cache is not None and builder.compile_gateware:
+                from litex_boards_vacajk.tools.build_cache import BuildCache
+                cache = BuildCache(args.build_cache,
+                    max_size = int(args.build_cache_max_size*1e9),
+                    max_age  = args.build_cache_max_age*24*3600,
+                )
+                cache.build(builder, **parser.toolchain_argdict)
+            else:
+                builder.build(**parser.toolchain_argdict)
+        profile.add_vivado_log(os.path.join(builder.gateware_dir, "vivado.log"))
+        with open(os.path.join(builder.gateware_dir, f"{soc.get_build_name()}_clocks.json"), "w") as f:
+            json.dump(clock_names(soc), f, indent=4)
+        if args.timing_history is not None:
+            check_timing(soc, builder, args.timing_history, args.timing_limits)
 
     if args.load:
-        prog = soc.platform.create_programmer()
-        prog.load_bitstream(builder.get_bitstream_filename(mode="sram"))
+        with profile.phase("load", "programming"):
+            prog = soc.platform.create_programmer()
+            prog.load_bitstream(builder.get_bitstream_filename(mode="sram"))
 
     if args.flash:
-        prog = soc.platform.create_programmer_vivado()
-        prog.flash(0, builder.get_bitstream_filename(mode="flash"))
-        # prog = soc.platform.create_programmer()
-        # print(os.path.join(builder.gateware_dir))
-        # prog.flash(0, os.path.join(builder.gateware_dir))
+        with profile.phase("flash", "programming"):
+            prog = soc.platform.create_programmer_vivado()
+            prog.flash(0, builder.get_bitstream_filename(mode="flash"))
+
+    if args.flash_update is not None:
+        from litex_boards_vacajk.tools import flash_update
+        with profile.phase("flash_update", "programming"):
+            images = {}
+            if "bitstream" in regions:
+                with open(builder.get_bitstream_filename(mode="flash"), "rb") as f:
+                    images["bitstream"] = f.read()
+            if "firmware" in regions:
+                with open(args.flash_firmware, "rb") as f:
+                    images["firmware"] = flash_update.firmware_image(f.read())
+            flash = flash_update.OpenOCDFlash(soc.platform.create_programmer())
+            flash_update.update(flash, images, args.flash_manifest, readback=args.flash_readback)
+
+    if profiling:
+        profile.summary()
+        profile.write(args.profile, args.profile_trace, args.profile_history, argv=sys.argv[1:])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Verilator simulation of the Bochen Kintex7 Base SoC, using simulation models of the board's
+# peripherals:
+#
+# ./bochen_kintex7_base_sim.py --with-spi-flash --spi-flash-read-mode 1-4-4 --spi-flash-init firmware.bin
+# ./bochen_kintex7_base_sim.py --with-spi-flash --with-spi-flash-bench --no-compile-gateware
+# ./bochen_kintex7_base_sim.py --with-sdram --with-etherbone --with-udp-streamer (Ethernet over tap0)
+# ./bochen_kintex7_base_sim.py --with-sdram --with-video-capture (Synthetic TMDS input)
+# ./bochen_kintex7_base_sim.py --with-sdram --with-sdram-bench --sdram-clk-freq 125e6 --l2-size 16384 --with-etherbone
+# ./bochen_kintex7_base_sim.py --with-sdram --l2-size 0 --with-sdcard --sdcard-dma dram --with-sdcard-bench --with-etherbone (SDCard emulator)
+# ./bochen_kintex7_base_sim.py --with-sdram --sdram-init firmware.bin --with-ethernet (Boot from preloaded DRAM, TFTP over tap0)
+# ./bochen_kintex7_base_sim.py --with-sdram --sdram-skip-test --with-video-framebuffer (SDL2 window)
+
+from migen import *
+
+from litex.gen import *
+
+from litex.build.generic_platform import *
+from litex.build.sim import SimPlatform
+
+from litex.soc.integration.soc_core import *
+from litex.soc.integration.builder import *
+
+from litex_boards_vacajk.targets.bochen_kintex7_base import spiflash_module, spiflash_read_modes, add_udp_streamer, add_sdram_bench, add_perf_counters, add_sdcard
+
+ident_default = "LiteX SoC on Bochen Kintex7 Base (Simulation)"
+
+# IOs ----------------------------------------------------------------------------------------------
+
+_io = [
+    # Clk / Rst.
+    ("sys_clk", 0, Pins(1)),
+    ("sys_rst", 0, Pins(1)),
+
+    # Video Capture Pixel Clk.
+    ("hdmi_in_clk", 0, Pins(1)),
+
+    # Serial.
+    ("serial", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+
+    # Ethernet (Stream Endpoint).
+    ("eth", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+
+    # Video (SDL2 window).
+    ("vga", 0,
+        Subsignal("hsync", Pins(1)),
+        Subsignal("vsync", Pins(1)),
+        Subsignal("de",    Pins(1)),
+        Subsignal("r",     Pins(8)),
+        Subsignal("g",     Pins(8)),
+        Subsignal("b",     Pins(8)),
+    ),
+]
+
+# Platform -----------------------------------------------------------------------------------------
+
+class Platform(SimPlatform):
+    def __init__(self):
+        SimPlatform.__init__(self, "SIM", _io)
+
+# SimSoC -------------------------------------------------------------------------------------------
+
+class SimSoC(SoCCore):
+    def __init__(self,
+        sys_clk_freq            = 1e6,
+
+        with_sdram              = False,
+        sdram_clk_freq          = 100e6,
+        sdram_init              = None,
+        sdram_skip_test         = False,
+        with_sdram_bench        = False,
+
+        with_spi_flash          = False,
+        spi_flash_read_mode     = "1-1-1",
+        spi_flash_dummy_cycles  = None,
+        spi_flash_init          = None,
+        with_spi_flash_bench    = False,
+
+        with_sdcard             = False,
+        with_spi_sdcard         = False,
+        sdcard_dma              = "bus",
+        with_sdcard_bench       = False,
+
+        with_ethernet           = False,
+        with_etherbone          = False,
+        eth_ip                  = "192.168.1.50",
+        eth_remote_ip           = "192.168.1.100",
+        eth_software_debug      = False,
+        eth_dynamic_ip          = False,
+        with_udp_streamer       = False,
+        udp_streamer_port       = 5000,
+
+        with_video_terminal     = False,
+        with_video_framebuffer  = False,
+        with_video_colorbars    = False,
+        video_timings           = "640x480@60Hz",
+        with_video_capture      = False,
+        video_capture_timings   = "160x100@60Hz",
+
+        with_perf_counters      = False,
+
+        ident                   = ident_default,
+        **kwargs):
+        platform = Platform()
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = CRG(platform.request("sys_clk"))
+
+        # SoCCore ----------------------------------------------------------------------------------
+        SoCCore.__init__(self, platform, sys_clk_freq, ident=ident, **kwargs)
+
+        # DDR3 SDRAM -------------------------------------------------------------------------------
+        if with_sdram and not self.integrated_main_ram_size:
+            from litedram.modules import MT41K256M16
+            from litedram.phy.model import SDRAMPHYModel
+            from litex.soc.integration.common import get_mem_data, get_boot_address
+            # Model timings are computed for sdram_clk_freq (emulated sys_clk_freq), independently of
+            # the simulated sys_clk_freq.
+            sdram_module   = MT41K256M16(sdram_clk_freq, "1:4")
+            self.sdrphy = SDRAMPHYModel(
+                module     = sdram_module,
+                data_width = 32,
+                clk_freq   = sdram_clk_freq,
+                init       = [] if sdram_init is None else get_mem_data(sdram_init,
+                    data_width = self.bus.data_width,
+                    endianness = self.cpu.endianness,
+                    offset     = self.mem_map["main_ram"],
+                ))
+            self.add_sdram("sdram",
+                phy           = self.sdrphy,
+                module        = sdram_module,
+                l2_cache_size = kwargs.get("l2_size", 8192),
+                with_bist     = with_sdram_bench,
+            )
+            if with_sdram_bench:
+                add_sdram_bench(self, clk_freq=sdram_clk_freq)
+            # The model needs no calibration: the BIOS only runs the (short) init sequence, then the
+            # memtest, skipped with preloaded contents (would be corrupted) or reduced in size.
+            if sdram_init is not None or sdram_skip_test:
+                self.add_constant("SDRAM_TEST_DISABLE")
+            else:
+                self.add_constant("MEMTEST_DATA_SIZE", 8*1024)
+                self.add_constant("MEMTEST_ADDR_SIZE", 8*1024)
+            # Boot directly from preloaded contents.
+            if sdram_init is not None:
+                boot_address = get_boot_address(sdram_init)
+                self.add_constant("ROM_BOOT_ADDRESS", boot_address or self.mem_map["main_ram"])
+
+        # SPI Flash --------------------------------------------------------------------------------
+        if with_spi_flash:
+            from litespi.phy.model import LiteSPIPHYModel
+            module = spiflash_module(spi_flash_read_mode, spi_flash_dummy_cycles)
+            # Note: The model transfers one bit/lane per sys_clk cycle (no clk divisor).
+            self.spiflash_phy = LiteSPIPHYModel(module, init=spi_flash_init)
+            self.add_spi_flash(phy=self.spiflash_phy, mode="4x", module=module, with_master=True)
+            if with_spi_flash_bench:
+                from litex_boards_vacajk.cores.read_bench import WishboneReadBench
+                self.spiflash_bench = WishboneReadBench()
+                self.bus.add_master(name="spiflash_bench", master=self.spiflash_bench.bus)
+
+        # SD Card (emulator) -----------------------------------------------------------------------
+        if with_sdcard or with_spi_sdcard:
+            if sdcard_dma == "dram" and not with_sdram:
+                raise ValueError("SDCard DMA to DRAM simulation requires SDRAM.")
+            from litesdcard.emulator import SDEmulator
+            self.sdcard_emulator = SDEmulator(platform)
+            pads = self.sdcard_emulator.pads
+            if with_spi_sdcard:
+                # SPI mode: CLK/MOSI on CLK/CMD, CS_N on DAT3, MISO from DAT0.
+                emulator_pads = pads
+                pads = Record([("clk", 1), ("cs_n", 1), ("mosi", 1), ("miso", 1)])
+                self.comb += [
+                    emulator_pads.clk.eq(pads.clk),
+                    emulator_pads.cmd_i.eq(pads.mosi),
+                    emulator_pads.dat_i.eq(Cat(Constant(0b111, 3), pads.cs_n)),
+                    pads.miso.eq(emulator_pads.dat_o[0] | emulator_pads.dat_t[0]),
+                ]
+            add_sdcard(self,
+                mode       = "spi" if with_spi_sdcard else "native",
+                dma        = sdcard_dma,
+                with_bench = with_sdcard_bench,
+                pads       = pads,
+            )
+
+        # Ethernet / Etherbone ---------------------------------------------------------------------
+        if with_ethernet or with_etherbone:
+            from liteeth.phy.model import LiteEthPHYModel
+            self.ethphy = LiteEthPHYModel(platform.request("eth", 0))
+            if with_etherbone:
+                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip, with_ethmac=with_ethernet, ethmac_remote_ip=eth_remote_ip)
+            else:
+                self.add_ethernet(phy=self.ethphy, dynamic_ip=eth_dynamic_ip, local_ip=None if eth_dynamic_ip else eth_ip, remote_ip=eth_remote_ip, software_debug=eth_software_debug)
+
+        # UDP Streamer -----------------------------------------------------------------------------
+        if with_udp_streamer:
+            if not (with_sdram and with_etherbone):
+                raise ValueError("UDP Streamer simulation requires SDRAM and Etherbone.")
+            add_udp_streamer(self, self.ethcore_etherbone.udp, udp_port=udp_streamer_port, remote_ip=eth_remote_ip)
+
+        # Video (SDL2 window) ----------------------------------------------------------------------
+        if with_video_terminal or with_video_framebuffer or with_video_colorbars:
+            from litex.soc.cores.video import VideoGenericPHY
+            self.videophy = VideoGenericPHY(platform.request("vga"))
+            if with_video_terminal:
+                self.add_video_terminal(phy=self.videophy, timings=video_timings)
+            if with_video_framebuffer:
+                if not with_sdram:
+                    raise ValueError("Video Framebuffer simulation requires SDRAM.")
+                self.add_video_framebuffer(phy=self.videophy, timings=video_timings, format="rgb888")
+            if with_video_colorbars:
+                self.add_video_colorbars(phy=self.videophy, timings=video_timings)
+
+        # Video Capture (from synthetic TMDS words) ------------------------------------------------
+        if with_video_capture:
+            if not with_sdram:
+                raise ValueError("Video Capture simulation requires SDRAM.")
+            from litex.soc.cores.video import video_timings
+            from litex_boards_vacajk.cores.video_capture import TMDSPatternGenerator, VideoCapture
+            vt = video_timings[video_capture_timings]
+            self.cd_hdmi_in = ClockDomain()
+            self.comb += self.cd_hdmi_in.clk.eq(platform.request("hdmi_in_clk"))
+            self.video_capture_phy = TMDSPatternGenerator(video_capture_timings, clock_domain="hdmi_in")
+            self.video_capture     = VideoCapture(
+                phy          = self.video_capture_phy,
+                dram_port    = self.sdram.crossbar.get_port(mode="write"),
+                hres         = vt["h_active"],
+                vres         = vt["v_active"],
+                clock_domain = "hdmi_in",
+            )
+
+        # Performance Counters ---------------------------------------------------------------------
+        if with_perf_counters:
+            add_perf_counters(self)
+
+        # Simulation -------------------------------------------------------------------------------
+        self.comb += platform.trace.eq(1)
+
+# Build --------------------------------------------------------------------------------------------
+
+def main():
+    from litex.build.parser import LiteXArgumentParser
+    from litex.build.sim.config import SimConfig
+    from litex.soc.integration.common import get_mem_data
+    parser = LiteXArgumentParser(platform=Platform, description=ident_default)
+    parser.add_target_argument("--sys-clk-freq",        default=1e6,                type=float,             help="System clock frequency.")
+    parser.add_target_argument("--non-interactive",     action="store_true",                                help="Run simulation without user input.")
+
+    parser.add_target_argument("--with-sdram",          action="store_true",                                help="Enable SDRAM (DDR3) model.")
+    parser.add_target_argument("--sdram-clk-freq",      default=100e6,              type=float,             help="SDRAM model timings frequency (emulated sys_clk_freq).")
+    parser.add_target_argument("--sdram-init",          default=None,                                       help="SDRAM init file (.bin or .json), booted directly.")
+    parser.add_target_argument("--sdram-skip-test",     action="store_true",                                help="Skip BIOS SDRAM memtest/memspeed.")
+    parser.add_target_argument("--with-sdram-bench",    action="store_true",                                help="Enable SDRAM BIST and bandwidth/latency benchmark.")
+
+    parser.add_target_argument("--with-spi-flash",      action="store_true",                                help="Enable SPI Flash (MMAPed) model.")
+    parser.add_target_argument("--spi-flash-read-mode", default="1-1-1",            choices=spiflash_read_modes, help="SPI Flash read mode (cmd-addr-data lanes).")
+    parser.add_target_argument("--spi-flash-dummy-cycles", default=None,            type=int,               help="SPI Flash read dummy cycles (default: power-on value of the read mode).")
+    parser.add_target_argument("--spi-flash-init",      default=None,                                       help="SPI Flash init file (.bin or .json).")
+    parser.add_target_argument("--with-spi-flash-bench", action="store_true",                               help="Enable SPI Flash XIP/bulk read benchmark.")
+
+    parser.add_target_argument("--with-sdcard",         action="store_true",                                help="Enable SDCard (native mode) emulator.")
+    parser.add_target_argument("--with-spi-sdcard",     action="store_true",                                help="Enable SDCard (SPI mode) emulator.")
+    parser.add_target_argument("--sdcard-dma",          default="bus",              choices=["bus", "dram"], help="SDCard DMAs on the main bus or on a LiteDRAM port.")
+    parser.add_target_argument("--with-sdcard-bench",   action="store_true",                                help="Enable SDCard transfer timer (tools/sdcard_bench.py).")
+
+    parser.add_target_argument("--with-ethernet",       action="store_true",                                help="Enable Ethernet support (CPU MAC, over --eth-interface).")
+    parser.add_target_argument("--with-etherbone",      action="store_true",                                help="Enable Etherbone support (over --eth-interface).")
+    parser.add_target_argument("--eth-interface",       default="tap0",                                     help="Host TAP interface.")
+    parser.add_target_argument("--eth-ip",              default="192.168.1.50",                             help="Etherbone IP address.")
+    parser.add_target_argument("--eth-remote-ip",       default="192.168.1.100",                            help="Remote (host TAP) IP address.")
+    parser.add_target_argument("--eth-dynamic-ip",      action="store_true",                                help="Enable dynamic Ethernet IP addresses setting.")
+    parser.add_target_argument("--eth-software-debug",  action="store_true",                                help="Enable Ethernet software debug.")
+    parser.add_target_argument("--with-udp-streamer",   action="store_true",                                help="Enable hardware DDR3 to UDP streamer (to --eth-remote-ip).")
+    parser.add_target_argument("--udp-streamer-port",   default=5000,               type=int,               help="UDP Streamer source/destination UDP port.")
+
+    parser.add_target_argument("--with-video-terminal", action="store_true",                                help="Enable Video Terminal (SDL2 window).")
+    parser.add_target_argument("--with-video-framebuffer", action="store_true",                             help="Enable Video Framebuffer (SDL2 window).")
+    parser.add_target_argument("--with-video-colorbars", action="store_true",                               help="Enable Video Colorbars (SDL2 window).")
+    parser.add_target_argument("--video-timings",       default="640x480@60Hz",                             help="Video timings.")
+    parser.add_target_argument("--video-vsync",         action="store_true",                                help="Only render on frame vsync.")
+    parser.add_target_argument("--with-video-capture",  action="store_true",                                help="Enable HDMI input capture (from synthetic TMDS color bars).")
+    parser.add_target_argument("--video-capture-timings", default="160x100@60Hz",                           help="Synthetic HDMI input timings.")
+
+    parser.add_target_argument("--with-perf-counters",  action="store_true",                                help="Enable bus/DRAM/Ethernet performance counters.")
+    args = parser.parse_args()
+
+    sim_config  = SimConfig()
+    sim_config.add_clocker("sys_clk", freq_hz=int(args.sys_clk_freq))
+
+    soc_argdict = parser.soc_argdict
+    if soc_argdict["uart_name"] == "serial":
+        soc_argdict["uart_name"] = "sim"
+        sim_config.add_module("serial2console", "serial")
+    if args.with_video_capture:
+        from litex.soc.cores.video import video_timings
+        sim_config.add_clocker("hdmi_in_clk", freq_hz=int(video_timings[args.video_capture_timings]["pix_clk"]))
+    if args.with_ethernet or args.with_etherbone:
+        sim_config.add_module("ethernet", "eth", args={"interface": args.eth_interface, "ip": args.eth_remote_ip})
+    if args.with_video_terminal or args.with_video_framebuffer or args.with_video_colorbars:
+        sim_config.add_module("video", "vga", args={"render_on_vsync": args.video_vsync})
+
+    soc = SimSoC(
+        sys_clk_freq            = args.sys_clk_freq,
+
+        with_sdram              = args.with_sdram,
+        sdram_clk_freq          = args.sdram_clk_freq,
+        sdram_init              = args.sdram_init,
+        sdram_skip_test         = args.sdram_skip_test,
+        with_sdram_bench        = args.with_sdram_bench,
+
+        with_spi_flash          = args.with_spi_flash,
+        spi_flash_read_mode     = args.spi_flash_read_mode,
+        spi_flash_dummy_cycles  = args.spi_flash_dummy_cycles,
+        spi_flash_init          = None if args.spi_flash_init is None else get_mem_data(args.spi_flash_init, endianness="big"),
+        with_spi_flash_bench    = args.with_spi_flash_bench,
+
+        with_sdcard             = args.with_sdcard,
+        with_spi_sdcard         = args.with_spi_sdcard,
+        sdcard_dma              = args.sdcard_dma,
+        with_sdcard_bench       = args.with_sdcard_bench,
+
+        with_ethernet           = args.with_ethernet,
+        with_etherbone          = args.with_etherbone,
+        eth_ip                  = args.eth_ip,
+        eth_remote_ip           = args.eth_remote_ip,
+        eth_software_debug      = args.eth_software_debug,
+        eth_dynamic_ip          = args.eth_dynamic_ip,
+        with_udp_streamer       = args.with_udp_streamer,
+        udp_streamer_port       = args.udp_streamer_port,
+
+        with_video_terminal     = args.with_video_terminal,
+        with_video_framebuffer  = args.with_video_framebuffer,
+        with_video_colorbars    = args.with_video_colorbars,
+        video_timings           = args.video_timings,
+        with_video_capture      = args.with_video_capture,
+        video_capture_timings   = args.video_capture_timings,
+
+        with_perf_counters      = args.with_perf_counters,
+
+        **soc_argdict
+    )
+
+    builder = Builder(soc, **parser.builder_argdict)
+    builder.build(
+        sim_config  = sim_config,
+        interactive = not args.non_interactive,
+        **parser.toolchain_argdict
+    )
+
+if __name__ == "__main__":
+    main()
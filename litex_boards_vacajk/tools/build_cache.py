@@ -0,0 +1,222 @@
+#
+# This file is part of LiteX-Boards.
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+
+# Helpers ------------------------------------------------------------------------------------------
+
+# Generated files embed build timestamps that must not take part in the cache key.
+_volatile_line = re.compile(r"^\s*(//|#)\s*(Date\s*:|Auto-Generated by LiteX on )")
+
+# Source paths are absolute in the generated Tcl; only their contents matter (hashed separately).
+_tcl_source_path = re.compile(r"\{[^{}]*[\\/]([^\\/{}]+)\}")
+
+def _hash_file(h, filename, normalize=None):
+    with open(filename, "rb") as f:
+        data = f.read()
+    if normalize is not None:
+        data = normalize(data.decode("utf-8", errors="replace")).encode("utf-8")
+    h.update(os.path.basename(filename).encode("utf-8") + b"\0")
+    h.update(hashlib.sha256(data).digest())
+
+def _strip_volatile(text):
+    return "".join(l for l in text.splitlines(keepends=True) if not _volatile_line.match(l))
+
+def _strip_verilog_comments(text):
+    # Full-line comments carry the build date and an (unordered) hierarchy dump, none of which
+    # reaches the netlist.
+    return "".join(l for l in text.splitlines(keepends=True) if not l.lstrip().startswith("//"))
+
+def _strip_tcl_paths(text):
+    return _tcl_source_path.sub(r"{\1}", _strip_volatile(text))
+
+def _dir_size(path):
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            size += os.path.getsize(os.path.join(root, f))
+    return size
+
+# Build Cache --------------------------------------------------------------------------------------
+
+class BuildCache:
+    """Content-addressed cache of Vivado results.
+
+    Entries are keyed on the generated gateware sources (Verilog, XDC, Tcl, memory init files),
+    the external HDL sources of the platform and the toolchain settings. Each entry is a directory
+    named after the key holding the bitstreams/reports and an `entry.json` with its bookkeeping.
+    """
+    version   = 1
+    meta_file = "entry.json"
+
+    # Generated inputs hashed from the gateware directory.
+    input_exts = [".v", ".sv", ".vhd", ".xdc", ".tcl", ".init", ".sh", ".bat"]
+
+    # Toolchain outputs stored/restored from the gateware directory.
+    output_exts = [".bit", ".bin", ".rpt"]
+
+    def __init__(self, path, max_size=None, max_age=None):
+        self.path     = os.path.abspath(path)
+        self.max_size = max_size # In bytes.
+        self.max_age  = max_age  # In seconds.
+        os.makedirs(self.path, exist_ok=True)
+
+    # Key ------------------------------------------------------------------------------------------
+
+    def key(self, gateware_dir, sources=[], settings={}):
+        h = hashlib.sha256()
+        h.update(f"version={self.version}\0".encode("utf-8"))
+
+        # Generated files.
+        for f in sorted(os.listdir(gateware_dir)):
+            filename = os.path.join(gateware_dir, f)
+            ext      = os.path.splitext(f)[1]
+            if not os.path.isfile(filename) or ext not in self.input_exts:
+                continue
+            normalize = {
+                ".v"   : _strip_verilog_comments,
+                ".sv"  : _strip_verilog_comments,
+                ".tcl" : _strip_tcl_paths,
+            }.get(ext, _strip_volatile)
+            _hash_file(h, filename, normalize=normalize)
+
+        # External sources (CPU, cores) referenced by the platform.
+        for filename in sorted(set(sources)):
+            if not os.path.isabs(filename):
+                filename = os.path.join(gateware_dir, filename)
+            if os.path.dirname(os.path.abspath(filename)) == os.path.abspath(gateware_dir):
+                continue # Already hashed.
+            _hash_file(h, filename)
+
+        # Toolchain settings.
+        h.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    # Entries --------------------------------------------------------------------------------------
+
+    def _entry_dir(self, key):
+        return os.path.join(self.path, key)
+
+    def _read_meta(self, entry_dir):
+        try:
+            with open(os.path.join(entry_dir, self.meta_file), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, entry_dir, meta):
+        with open(os.path.join(entry_dir, self.meta_file), "w") as f:
+            json.dump(meta, f, indent=4)
+
+    def entries(self):
+        r = {}
+        for key in os.listdir(self.path):
+            entry_dir = self._entry_dir(key)
+            if key.startswith(".") or not os.path.isdir(entry_dir):
+                continue
+            meta = self._read_meta(entry_dir)
+            if meta is not None:
+                r[key] = meta
+        return r
+
+    def restore(self, key, gateware_dir):
+        entry_dir = self._entry_dir(key)
+        meta      = self._read_meta(entry_dir)
+        if meta is None:
+            return False
+        # Incomplete entry (files removed by hand or by an interrupted eviction): rebuild it.
+        if not all(os.path.isfile(os.path.join(entry_dir, f)) for f in meta["files"]):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return False
+        for f in meta["files"]:
+            shutil.copy2(os.path.join(entry_dir, f), os.path.join(gateware_dir, f))
+        meta["last_used"] = time.time()
+        meta["hits"]      = meta.get("hits", 0) + 1
+        self._write_meta(entry_dir, meta)
+        return True
+
+    def store(self, key, gateware_dir):
+        files = [f for f in sorted(os.listdir(gateware_dir))
+            if os.path.splitext(f)[1] in self.output_exts and
+            os.path.isfile(os.path.join(gateware_dir, f))]
+        # Copy to a temporary directory first so concurrent builds never see partial entries.
+        tmp_dir = os.path.join(self.path, f".tmp-{key}-{os.getpid()}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for f in files:
+            shutil.copy2(os.path.join(gateware_dir, f), os.path.join(tmp_dir, f))
+        now = time.time()
+        self._write_meta(tmp_dir, {
+            "files"     : files,
+            "size"      : _dir_size(tmp_dir),
+            "created"   : now,
+            "last_used" : now,
+            "hits"      : 0,
+        })
+        entry_dir = self._entry_dir(key)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.rename(tmp_dir, entry_dir)
+
+    def evict(self):
+        now     = time.time()
+        entries = sorted(self.entries().items(), key=lambda e: e[1]["last_used"])
+        evicted = []
+        # Evict by age.
+        if self.max_age is not None:
+            for key, meta in entries:
+                if now - meta["last_used"] > self.max_age:
+                    evicted.append(key)
+        # Evict by size (least recently used first).
+        if self.max_size is not None:
+            size = sum(meta["size"] for key, meta in entries if key not in evicted)
+            for key, meta in entries:
+                if size <= self.max_size:
+                    break
+                if key not in evicted:
+                    evicted.append(key)
+                    size -= meta["size"]
+        for key in evicted:
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+        return evicted
+
+    # Build ----------------------------------------------------------------------------------------
+
+    def build(self, builder, **kwargs):
+        """Run `builder.build()` and only invoke the toolchain on a cache miss. Returns True on hit."""
+        soc      = builder.soc
+        platform = soc.platform
+
+        # Generate sources/scripts (and software) without running the toolchain.
+        kwargs.pop("run", None)
+        builder.build(run=False, **kwargs)
+
+        build_name = soc.get_build_name()
+        settings   = {
+            "device"    : platform.device,
+            "toolchain" : type(platform.toolchain).__name__,
+            "kwargs"    : kwargs,
+        }
+        sources = [s[0] for s in platform.sources]
+        key     = self.key(builder.gateware_dir, sources=sources, settings=settings)
+
+        hit = self.restore(key, builder.gateware_dir)
+        if hit:
+            print(f"Build cache hit ({key[:16]}), reusing {build_name} bitstreams.")
+        else:
+            print(f"Build cache miss ({key[:16]}), running toolchain.")
+            script = f"build_{build_name}." + ("bat" if sys.platform in ["win32", "cygwin"] else "sh")
+            cwd = os.getcwd()
+            os.chdir(builder.gateware_dir)
+            try:
+                platform.toolchain.run_script(script)
+            finally:
+                os.chdir(cwd)
+            self.store(key, builder.gateware_dir)
+        self.evict()
+        return hit
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Build-phase profiling (--profile/--profile-trace/--profile-history of the targets): wall time and
+# memory of argument parsing, SoC elaboration (CRG and each add_* call), Verilog/XDC generation,
+# software build, Vivado (synthesis/placement/routing/bitstream, from its log) and programming.
+# Results are written as JSON or Chrome trace (chrome://tracing, ui.perfetto.dev) and optionally
+# appended to a JSON Lines history file, summarized by this script:
+#
+# ./build_profile.py history.jsonl
+# ./build_profile.py history.jsonl --last 10 --phase elaboration/BaseSoC/add_sdram
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import contextlib
+import functools
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _rss():
+    """Current resident set size (bytes, None when not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1])*os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+def _peak_rss(who=resource.RUSAGE_SELF):
+    """Peak resident set size (bytes) of the process (or of its largest child)."""
+    return resource.getrusage(who).ru_maxrss*(1 if sys.platform == "darwin" else 1024)
+
+# Build Profile ------------------------------------------------------------------------------------
+
+class BuildProfile:
+    """Nested build phases: {name, path, category, start, duration (s), rss, peak_rss (bytes)}."""
+    def __init__(self):
+        self.start      = time.perf_counter()
+        self.start_time = time.time()
+        self.phases     = []
+        self.stack      = []
+
+    def now(self):
+        return time.perf_counter() - self.start
+
+    @contextlib.contextmanager
+    def phase(self, name, category="build", **args):
+        phase = {
+            "name"     : name,
+            "path"     : "/".join([p["name"] for p in self.stack] + [name]),
+            "category" : category,
+            "start"    : self.now(),
+            "args"     : args,
+        }
+        self.phases.append(phase)
+        self.stack.append(phase)
+        try:
+            yield phase
+        finally:
+            self.stack.pop()
+            phase["duration"]          = self.now() - phase["start"]
+            phase["rss"]               = _rss()
+            phase["peak_rss"]          = _peak_rss()
+            phase["children_peak_rss"] = _peak_rss(resource.RUSAGE_CHILDREN)
+
+    def add_phase(self, name, start, duration, category="build", parent=None, **args):
+        """Add an externally timed phase (`start` relative to the profile start)."""
+        self.phases.append({
+            "name"     : name,
+            "path"     : name if parent is None else parent["path"] + "/" + name,
+            "category" : category,
+            "start"    : start,
+            "duration" : duration,
+            "args"     : args,
+        })
+
+    def find(self, name):
+        """Last phase named `name` (or None)."""
+        return next((p for p in reversed(self.phases) if p["name"] == name), None)
+
+    def _wrap(self, function, name, category):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.phase(name, category):
+                return function(*args, **kwargs)
+        return wrapper
+
+    @contextlib.contextmanager
+    def instrument(self, obj, names, category="build", rename={}):
+        """Time calls of methods/functions `names` of `obj` (class or module) as phases."""
+        saved = {}
+        for name in names:
+            if not hasattr(obj, name):
+                continue
+            saved[name] = obj.__dict__.get(name)
+            setattr(obj, name, self._wrap(getattr(obj, name), rename.get(name, name), category))
+        try:
+            yield
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    delattr(obj, name) # Inherited.
+                else:
+                    setattr(obj, name, value)
+
+    def add_vivado_log(self, filename, parent="vivado"):
+        """Add the Vivado commands of `filename` as sequential sub-phases of phase `parent` (skipped
+        when the log was not written during it, e.g. on a build cache hit)."""
+        from litex_boards_vacajk.tools.vivado_reports import parse_vivado_log
+        parent = self.find(parent)
+        if parent is None or not os.path.exists(filename):
+            return
+        if os.path.getmtime(filename) < self.start_time + parent["start"] - 1: # Coarse mtime.
+            return
+        with open(filename, "r", errors="replace") as f:
+            commands = parse_vivado_log(f.read())
+        start = parent["start"]
+        for command in commands:
+            self.add_phase(command["command"], start, command["elapsed"],
+                category    = command["stage"] or "vivado",
+                parent      = parent,
+                cpu         = command["cpu"],
+                peak_memory = command["peak_memory"]*1e6,
+            )
+            start += command["elapsed"]
+
+    # Outputs.
+    def to_json(self, **meta):
+        return {
+            "date"     : time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.start_time)),
+            "meta"     : meta,
+            "total"    : self.now(),
+            "peak_rss" : _peak_rss(),
+            "phases"   : self.phases,
+        }
+
+    def to_chrome_trace(self):
+        events = []
+        for phase in self.phases:
+            args = dict(phase["args"])
+            for k in ["rss", "peak_rss", "children_peak_rss"]:
+                if phase.get(k) is not None:
+                    args[k + "_mb"] = round(phase[k]/1e6, 1)
+            events.append({
+                "name" : phase["name"],
+                "cat"  : phase["category"],
+                "ph"   : "X",
+                "ts"   : phase["start"]*1e6,
+                "dur"  : phase["duration"]*1e6,
+                "pid"  : 0,
+                "tid"  : 0,
+                "args" : args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def history_entry(self, **meta):
+        """Compact history entry: total duration per phase path."""
+        durations = {}
+        for phase in self.phases:
+            durations[phase["path"]] = durations.get(phase["path"], 0) + phase["duration"]
+        r = self.to_json(**meta)
+        r["phases"] = {path: round(duration, 4) for path, duration in durations.items()}
+        return r
+
+    def write(self, json_filename=None, trace_filename=None, history_filename=None, **meta):
+        if json_filename is not None:
+            with open(json_filename, "w") as f:
+                json.dump(self.to_json(**meta), f, indent=4, default=str)
+        if trace_filename is not None:
+            with open(trace_filename, "w") as f:
+                json.dump(self.to_chrome_trace(), f, default=str)
+        if history_filename is not None:
+            with open(history_filename, "a") as f:
+                f.write(json.dumps(self.history_entry(**meta), default=str) + "\n")
+
+    def summary(self, depth=2):
+        for phase in self.phases:
+            level = phase["path"].count("/")
+            if level < depth:
+                print("{:<48} {:9.3f}s{}".format("  "*level + phase["name"], phase["duration"],
+                    "" if phase.get("peak_rss") is None else " {:8.1f}MB peak".format(phase["peak_rss"]/1e6)))
+
+# LiteX Instrumentation ----------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def instrument_litex(profile, soc, builder):
+    """Time the LiteX build steps of `builder` (SoC finalization, Verilog/XDC generation, software
+    build, Vivado run)."""
+    from litex.soc.integration.soc import SoC
+    from litex.soc.integration.builder import Builder
+    toolchain = type(soc.platform.toolchain)
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(profile.instrument(SoC, ["finalize"], "elaboration"))
+        stack.enter_context(profile.instrument(type(soc.platform), ["get_verilog"], "generation", rename={"get_verilog": "verilog"}))
+        stack.enter_context(profile.instrument(toolchain, [
+            "build_timing_constraints", "build_io_constraints", "build_placement_constraints", "build_project", "build_script"],
+            "generation"))
+        stack.enter_context(profile.instrument(toolchain, ["run_script"], "vivado", rename={"run_script": "vivado"}))
+        stack.enter_context(profile.instrument(Builder, ["_generate_includes", "_generate_csr_map"], "generation"))
+        stack.enter_context(profile.instrument(Builder, [
+            "_prepare_rom_software", "_generate_rom_software", "_initialize_rom_software"], "software"))
+        yield
+
+# Bookkeeping add_* methods, too small/frequent to be profiled.
+_elaboration_excludes = [
+    "add_config", "add_constant", "add_csr", "add_csr_region", "add_interrupt", "add_memory_region",
+    "add_module", "add_wb_master", "add_wb_slave",
+]
+
+@contextlib.contextmanager
+def instrument_elaboration(profile, *objs):
+    """Time each subsystem add_* call of the LiteX SoC and of `objs` (target modules/classes, whose
+    construction is also timed, e.g. the CRG)."""
+    from litex.soc.integration.soc_core import SoCCore
+    with contextlib.ExitStack() as stack:
+        for obj in [SoCCore, *objs]:
+            names = [name for name in dir(obj) if name.startswith("add_") and name not in _elaboration_excludes and
+                callable(getattr(obj, name))]
+            stack.enter_context(profile.instrument(obj, names, "elaboration"))
+            if isinstance(obj, type):
+                stack.enter_context(profile.instrument(obj, ["__init__"], "elaboration", rename={"__init__": obj.__name__}))
+        yield
+
+# History ------------------------------------------------------------------------------------------
+
+def read_history(filename):
+    with open(filename) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def history_table(history, phases=None, last=10, depth=2):
+    """Per-phase durations of the last runs, slowest phases (in the last run) first."""
+    history = history[-last:]
+    if phases is None:
+        phases = sorted({p for entry in history for p in entry["phases"] if p.count("/") < depth},
+            key=lambda p: -history[-1]["phases"].get(p, 0))
+    print("{:<48} ".format("phase") + " ".join("{:>11}".format(entry["date"][5:16].replace("T", " ")) for entry in history))
+    for phase in phases:
+        print("{:<48} ".format(phase[-48:]) + " ".join(
+            "{:>11}".format("-" if phase not in entry["phases"] else "{:.2f}".format(entry["phases"][phase])) for entry in history))
+    print("{:<48} ".format("total") + " ".join("{:>11.2f}".format(entry["total"]) for entry in history))
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base build profile history.")
+    parser.add_argument("history",                                    help="History file (JSON Lines).")
+    parser.add_argument("--last",  default=10,   type=int,            help="Number of runs to show.")
+    parser.add_argument("--depth", default=3,    type=int,            help="Phase nesting depth to show.")
+    parser.add_argument("--phase", default=None, nargs="+",           help="Phases (paths) to show.")
+    args = parser.parse_args()
+
+    history_table(read_history(args.history), phases=args.phase, last=args.last, depth=args.depth)
+
+if __name__ == "__main__":
+    main()
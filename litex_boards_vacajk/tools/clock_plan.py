@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Clock plan of the bochen_kintex7_base CRG for a configuration (MMCMs, achievable frequencies and
+# jitter estimates) and sys_clk_freq values reachable exactly (with sys4x/idelay in the same MMCM):
+#
+# ./clock_plan.py --sys-clk-freq 125e6 --with-sdram --with-ethernet --video-timings 1280x720@60Hz
+# ./clock_plan.py --with-sdram --sys-clk-range 100e6 200e6
+
+import logging
+import argparse
+
+from litex_boards_vacajk.cores.clock_planner import plan_clocks, plan_report, achievable_frequencies, solve_mmcm
+from litex_boards_vacajk.targets.bochen_kintex7_base import crg_clocks, video_clk_freq
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base clock planner.")
+    parser.add_argument("--sys-clk-freq",   default=100e6, type=float,               help="System clock frequency.")
+    parser.add_argument("--with-sdram",     action="store_true",                     help="With SDRAM clocks (sys4x, idelay).")
+    parser.add_argument("--with-ethernet",  action="store_true",                     help="With Ethernet clocks (idelay).")
+    parser.add_argument("--video-timings",  default=None,                            help="With HDMI clocks for these video timings.")
+    parser.add_argument("--sys-clk-range",  default=None, type=float, nargs=2,       help="List reachable sys_clk_freq values in this range.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.sys_clk_range is not None:
+        ratios = [1, 4] if args.with_sdram else [1]
+        for freq in achievable_frequencies(50e6, *args.sys_clk_range, ratios=ratios):
+            clocks, _ = crg_clocks(freq, args.with_sdram, args.with_ethernet)
+            if solve_mmcm(50e6, tuple(clocks.values())) is not None:
+                print(f"{freq/1e6:.3f}MHz")
+        return
+
+    hdmi_clk_freq = 25e6
+    if args.video_timings is not None:
+        from litex.soc.cores.video import video_timings
+        hdmi_clk_freq = video_clk_freq(video_timings[args.video_timings]["pix_clk"])
+    clocks, groups = crg_clocks(args.sys_clk_freq, args.with_sdram, args.with_ethernet,
+        with_hdmi     = args.video_timings is not None,
+        hdmi_clk_freq = hdmi_clk_freq,
+    )
+    plan_report(plan_clocks(50e6, clocks, groups))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Pipelined, batched Etherbone client (--with-etherbone), driven by the SoC's csr.csv:
+#
+# - csr.csv is parsed once into a register index (addresses/lengths precomputed).
+# - Reads/Writes are batched into Etherbone records (up to 255 reads at arbitrary addresses, or 255
+#   writes at consecutive addresses per record) instead of one UDP round trip per register.
+# - Up to `window` requests are kept in flight, replies being matched to their request through the
+#   record's return address (tag).
+# - Memory regions are burst read straight into preallocated buffers.
+#
+# LiteEth's Etherbone core handles a single record per packet: `records_per_packet` defaults to 1,
+# the local stand-in server (EtherboneServer) accepting any number of records per packet.
+#
+# ./etherbone_client.py --ip 192.168.1.50 --csr-csv csr.csv --bench
+# ./etherbone_client.py --server --bench (Local stand-in server)
+
+import time
+import socket
+import struct
+import argparse
+import threading
+
+# Etherbone Packets --------------------------------------------------------------------------------
+
+etherbone_magic     = 0x4e6f
+etherbone_version   = 1
+etherbone_max_count = 255
+
+class EtherboneRecord:
+    """Etherbone record: `writes` to consecutive addresses from `base_addr`, then `reads` of
+    arbitrary addresses, their data being returned to `base_ret_addr`."""
+    def __init__(self, base_addr=0, writes=None, base_ret_addr=0, reads=None, byte_enable=0xf, wff=0, rff=0):
+        self.base_addr     = base_addr
+        self.writes        = [] if writes is None else writes
+        self.base_ret_addr = base_ret_addr
+        self.reads         = [] if reads is None else reads
+        self.byte_enable   = byte_enable
+        self.wff           = wff
+        self.rff           = rff
+
+    def encode(self):
+        assert len(self.writes) <= etherbone_max_count and len(self.reads) <= etherbone_max_count
+        ba = bytearray(struct.pack(">BBBB", (self.rff << 2) | (self.wff << 6), self.byte_enable, len(self.writes), len(self.reads)))
+        if self.writes:
+            ba += struct.pack(f">I{len(self.writes)}I", self.base_addr, *self.writes)
+        if self.reads:
+            ba += struct.pack(f">I{len(self.reads)}I", self.base_ret_addr, *self.reads)
+        return ba
+
+    @classmethod
+    def decode(cls, data, offset=0):
+        """Decode the record at `offset` and return (record, next offset)."""
+        flags, byte_enable, wcount, rcount = struct.unpack_from(">BBBB", data, offset)
+        record = cls(byte_enable=byte_enable, wff=(flags >> 6) & 1, rff=(flags >> 2) & 1)
+        offset += 4
+        if wcount:
+            record.base_addr, *record.writes = struct.unpack_from(f">I{wcount}I", data, offset)
+            offset += 4*(wcount + 1)
+        if rcount:
+            record.base_ret_addr, *record.reads = struct.unpack_from(f">I{rcount}I", data, offset)
+            offset += 4*(rcount + 1)
+        return record, offset
+
+def encode_packet(records, pf=0, pr=0):
+    header = struct.pack(">HBB4x", etherbone_magic, (etherbone_version << 4) | (pr << 1) | pf, 0x44) # 32-bit addr/port.
+    return header + b"".join(record.encode() for record in records)
+
+def decode_packet(data):
+    """Decode a packet and return its records (raising ValueError on invalid packets)."""
+    if len(data) < 8 or struct.unpack_from(">H", data)[0] != etherbone_magic:
+        raise ValueError("Not an Etherbone packet.")
+    records = []
+    offset  = 8
+    while offset + 4 <= len(data):
+        record, offset = EtherboneRecord.decode(data, offset)
+        records.append(record)
+    return records
+
+# CSR Index ----------------------------------------------------------------------------------------
+
+class CSRIndex:
+    """csr.csv parsed once: registers as {name: (address, length)} (length in CSR words), CSR bases,
+    constants and memory regions as {name: (base, size)}."""
+    def __init__(self, csr_csv):
+        self.bases     = {}
+        self.registers = {}
+        self.constants = {}
+        self.memories  = {}
+        with open(csr_csv) as f:
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                group, name, value, length, mode = (line.strip().split(",") + [""]*5)[:5]
+                if group == "csr_base":
+                    self.bases[name] = int(value, 0)
+                elif group == "csr_register":
+                    self.registers[name] = (int(value, 0), int(length))
+                elif group == "constant":
+                    try:
+                        self.constants[name] = int(value)
+                    except ValueError:
+                        self.constants[name] = value
+                elif group == "memory_region":
+                    self.memories[name] = (int(value, 0), int(length))
+        self.csr_data_width = self.constants.get("config_csr_data_width", 32)
+
+    def addresses(self, name):
+        """Word addresses of register `name` (most significant word first)."""
+        address, length = self.registers[name]
+        return [address + 4*i for i in range(length)]
+
+    def combine(self, name, words):
+        value = 0
+        for word in words:
+            value = (value << self.csr_data_width) | (word & (2**self.csr_data_width - 1))
+        return value
+
+    def split(self, name, value):
+        _, length = self.registers[name]
+        mask = 2**self.csr_data_width - 1
+        return [(value >> ((length - 1 - i)*self.csr_data_width)) & mask for i in range(length)]
+
+# Batch --------------------------------------------------------------------------------------------
+
+class Batch:
+    """Ordered reads/writes, executed as a minimal number of records (program order preserved):
+    consecutive writes are merged in a record, reads are appended to the record of the preceding
+    writes, or start their own record when the client retries reads (re-sending a record would
+    repeat its writes). `read` returns the index of its result in `execute()`'s returned list."""
+    def __init__(self, client):
+        self.client  = client
+        self.records = []
+        self.nreads  = 0
+        self.targets = [] # Per record: result index of each read.
+
+    def _record(self, write_addr=None):
+        record = self.records[-1] if self.records else None
+        if write_addr is not None:
+            if (record is None or record.reads or len(record.writes) == etherbone_max_count or
+                record.base_addr + 4*len(record.writes) != write_addr):
+                record = None
+        elif record is not None and (len(record.reads) == self.client.max_reads or
+            (record.writes and self.client.retries)):
+            record = None
+        if record is None:
+            record = EtherboneRecord(base_addr=0 if write_addr is None else write_addr)
+            self.records.append(record)
+            self.targets.append([])
+        return record
+
+    def write(self, addr, value):
+        if isinstance(addr, str):
+            for a, v in zip(self.client.index.addresses(addr), self.client.index.split(addr, value)):
+                self.write(a, v)
+            return
+        self._record(write_addr=addr).writes.append(value & 0xffffffff)
+
+    def read(self, addr):
+        if isinstance(addr, str):
+            return [self.read(a) for a in self.client.index.addresses(addr)]
+        self._record().reads.append(addr)
+        self.targets[-1].append(self.nreads)
+        self.nreads += 1
+        return self.nreads - 1
+
+    def execute(self):
+        results = [None]*self.nreads
+        def deliver(targets):
+            def callback(datas):
+                for target, data in zip(targets, datas):
+                    results[target] = data
+            return callback
+        self.client.transact([(record, deliver(targets)) for record, targets in zip(self.records, self.targets)])
+        return results
+
+# Client -------------------------------------------------------------------------------------------
+
+class EtherboneClient:
+    def __init__(self, host="192.168.1.50", port=1234, csr_csv=None, window=8, records_per_packet=1,
+        max_reads=etherbone_max_count, timeout=0.5, retries=2):
+        self.index              = None if csr_csv is None else CSRIndex(csr_csv)
+        self.window             = window
+        self.max_reads          = max_reads
+        self.records_per_packet = records_per_packet
+        self.timeout            = timeout
+        self.retries            = retries
+        self.tag                = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4*1024*1024)
+        self.sock.connect((host, port))
+        self.stats = {"packets": 0, "retries": 0}
+
+    def close(self):
+        self.sock.close()
+
+    def _next_tag(self):
+        # Tags are word-aligned: LiteEth returns them as the base address of the reply writes.
+        self.tag = (self.tag + 4) & 0xffffffff
+        return self.tag
+
+    def transact(self, requests):
+        """Execute `requests` ([(record, callback(datas) or None)]), in order, keeping up to `window`
+        packets with reads in flight. Packets without reads are sent without waiting for a reply.
+        Read packets are re-sent (up to `retries` times) on timeout: only use retries on side-effect
+        free reads. Packets with writes are never re-sent (timeout raised instead)."""
+        # Group records into packets (with retries, write records and read records are not mixed).
+        packets = []
+        for request in requests:
+            record, _ = request
+            if (not packets or len(packets[-1]) == self.records_per_packet or
+                (self.retries and bool(packets[-1][-1][0].writes) != bool(record.writes))):
+                packets.append([])
+            packets[-1].append(request)
+        inflight = {} # tag: [packet index, callback, sent time, attempts].
+        waiting  = {} # packet index: pending tags.
+        pending  = list(range(len(packets)))
+        pending.reverse()
+        def send(n, attempt=0):
+            records = []
+            for record, callback in packets[n]:
+                if record.reads:
+                    if attempt == 0:
+                        record.base_ret_addr = self._next_tag()
+                    inflight[record.base_ret_addr] = [n, callback, time.perf_counter(), attempt]
+                    waiting.setdefault(n, set()).add(record.base_ret_addr)
+                records.append(record)
+            self.sock.send(encode_packet(records))
+            self.stats["packets"] += 1
+        while pending or inflight:
+            # Fill the window.
+            while pending and len(waiting) < self.window:
+                send(pending.pop())
+            if not inflight:
+                continue
+            # Wait for replies.
+            self.sock.settimeout(max(self.timeout - (time.perf_counter() - min(v[2] for v in inflight.values())), 1e-3))
+            try:
+                data = self.sock.recv(65536)
+            except socket.timeout:
+                now = time.perf_counter()
+                for n in sorted({v[0] for v in inflight.values() if now - v[2] >= self.timeout}):
+                    attempts = [v[3] for v in inflight.values() if v[0] == n]
+                    if max(attempts) >= self.retries:
+                        raise TimeoutError("Etherbone read timeout.")
+                    if any(record.writes for record, _ in packets[n]):
+                        raise TimeoutError("Etherbone read timeout (packet with writes, not re-sent).")
+                    self.stats["retries"] += 1
+                    for tag in waiting.pop(n):
+                        inflight.pop(tag)
+                    send(n, attempt=max(attempts) + 1)
+                continue
+            try:
+                records = decode_packet(data)
+            except ValueError:
+                continue
+            for record in records:
+                request = inflight.pop(record.base_addr, None)
+                if request is None:
+                    continue # Late reply of a re-sent packet.
+                n, callback, _, _ = request
+                if callback is not None:
+                    callback(record.writes)
+                waiting[n].discard(record.base_addr)
+                if not waiting[n]:
+                    waiting.pop(n)
+
+    # Words.
+    def read(self, addr, length=None):
+        """Read one word (`length` None) or `length` consecutive words."""
+        if isinstance(addr, str):
+            return self.read_reg(addr)
+        datas = self.read_many([addr + 4*i for i in range(1 if length is None else length)])
+        return datas[0] if length is None else datas
+
+    def write(self, addr, value):
+        if isinstance(addr, str):
+            return self.write_reg(addr, value)
+        self.write_many([(addr + 4*i, v) for i, v in enumerate(value if isinstance(value, list) else [value])])
+
+    def read_many(self, addrs):
+        batch = self.batch()
+        for addr in addrs:
+            batch.read(addr)
+        return batch.execute()
+
+    def write_many(self, writes):
+        batch = self.batch()
+        for addr, value in writes:
+            batch.write(addr, value)
+        batch.execute()
+
+    def batch(self):
+        return Batch(self)
+
+    # Registers.
+    def read_reg(self, name):
+        return self.read_regs([name])[name]
+
+    def read_regs(self, names):
+        """Read registers (names from csr.csv) in a single batch and return {name: value}."""
+        batch   = self.batch()
+        indexes = {name: batch.read(name) for name in names}
+        results = batch.execute()
+        return {name: self.index.combine(name, [results[i] for i in indexes[name]]) for name in names}
+
+    def write_reg(self, name, value):
+        self.write_regs({name: value})
+
+    def write_regs(self, values):
+        batch = self.batch()
+        for name, value in values.items():
+            batch.write(name, value)
+        batch.execute()
+
+    # Memories.
+    def read_mem(self, addr, buf, length=None):
+        """Burst read `length` bytes (default: len(buf), multiple of 4) at `addr` (or memory region
+        name) into the preallocated `buf` (bytearray/memoryview), words stored little-endian."""
+        if isinstance(addr, str):
+            addr = self.index.memories[addr][0]
+        length = len(buf) if length is None else length
+        assert length % 4 == 0
+        view = memoryview(buf)
+        def deliver(offset):
+            def callback(datas):
+                struct.pack_into(f"<{len(datas)}I", view, offset, *datas)
+            return callback
+        requests = []
+        for offset in range(0, length, 4*self.max_reads):
+            count  = min(self.max_reads, (length - offset)//4)
+            record = EtherboneRecord(reads=[addr + offset + 4*i for i in range(count)])
+            requests.append((record, deliver(offset)))
+        self.transact(requests)
+        return buf
+
+# Stand-in Server ----------------------------------------------------------------------------------
+
+class EtherboneServer:
+    """Local UDP Etherbone stand-in: a sparse 32-bit word memory (`mem`: {byte address: word}),
+    replying to each record with reads as LiteEth does (one reply packet per record). `latency`
+    (s) delays replies (without blocking the following requests) to emulate a remote board, `drop`
+    drops every Nth reply (retries tests)."""
+    def __init__(self, host="127.0.0.1", port=0, mem=None, latency=0, drop=0):
+        self.mem     = {} if mem is None else mem
+        self.latency = latency
+        self.drop    = drop
+        self.stats   = {"packets": 0, "records": 0, "reads": 0, "writes": 0}
+        self.sock    = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.address = self.sock.getsockname()
+        self.running = False
+        self.replies = 0
+        self.queue   = [] # Delayed replies: (time, packet, remote).
+
+    def start(self):
+        self.running = True
+        self.thread  = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        self.sock.close()
+
+    def _serve(self):
+        while self.running:
+            # Send due replies.
+            now = time.perf_counter()
+            while self.queue and self.queue[0][0] <= now:
+                _, packet, remote = self.queue.pop(0)
+                self.sock.sendto(packet, remote)
+            self.sock.settimeout(max(self.queue[0][0] - now, 1e-4) if self.queue else 0.1)
+            try:
+                data, remote = self.sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            try:
+                records = decode_packet(data)
+            except ValueError:
+                continue
+            self.stats["packets"] += 1
+            for record in records:
+                self.stats["records"] += 1
+                for i, value in enumerate(record.writes):
+                    self.mem[record.base_addr + (0 if record.wff else 4*i)] = value
+                self.stats["writes"] += len(record.writes)
+                if record.reads:
+                    self.stats["reads"] += len(record.reads)
+                    reply = EtherboneRecord(
+                        base_addr = record.base_ret_addr,
+                        writes    = [self.mem.get(addr, 0) for addr in record.reads])
+                    self.replies += 1
+                    if self.drop and (self.replies % self.drop) == 0:
+                        continue
+                    self.queue.append((time.perf_counter() + self.latency, encode_packet([reply]), remote))
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def bench(host, port, addrs, mem_addr, mem_size, windows=(1, 8), duration=1.0):
+    """Register reads/s (one read per packet vs batched) and burst read MB/s, per window."""
+    results = []
+    def measure(name, client, fn, nbytes):
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            fn()
+            count += 1
+        elapsed = time.perf_counter() - start
+        r = {"name": name, "window": client.window, "rate": count*nbytes/elapsed}
+        results.append(r)
+        return r
+    for window in windows:
+        # One read per packet.
+        client = EtherboneClient(host, port, window=window, max_reads=1)
+        r = measure("single", client, lambda: client.read_many(addrs), len(addrs))
+        print(f"{'single':<8} window: {window:>2} {r['rate']:10.0f} reads/s")
+        client.close()
+        # Batched: up to 255 reads per record/packet.
+        client = EtherboneClient(host, port, window=window)
+        r = measure("batched", client, lambda: client.read_many(addrs), len(addrs))
+        print(f"{'batched':<8} window: {window:>2} {r['rate']:10.0f} reads/s")
+        # Memory burst.
+        buf = bytearray(mem_size)
+        r = measure("burst", client, lambda: client.read_mem(mem_addr, buf), mem_size)
+        print(f"{'burst':<8} window: {window:>2} {r['rate']/1e6:10.2f} MB/s")
+        client.close()
+    return results
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base pipelined/batched Etherbone client.")
+    parser.add_argument("--ip",       default="192.168.1.50",            help="Board IP address.")
+    parser.add_argument("--port",     default=1234,      type=int,       help="Etherbone UDP port.")
+    parser.add_argument("--csr-csv",  default=None,                      help="SoC CSV file.")
+    parser.add_argument("--server",   action="store_true",               help="Run against a local stand-in server.")
+    parser.add_argument("--latency",  default=100e-6,    type=float,     help="Stand-in server reply latency (s).")
+    parser.add_argument("--read",     default=[],        nargs="+",      help="Registers to read (names from csr.csv).")
+    parser.add_argument("--bench",    action="store_true",               help="Run throughput benchmark.")
+    parser.add_argument("--nregs",    default=200,       type=int,       help="Benchmark: number of registers (without csr.csv).")
+    parser.add_argument("--mem-addr", default=None,      type=lambda x: int(x, 0), help="Benchmark: burst read address (default: sram/rom region of csr.csv, else 0x10000000).")
+    parser.add_argument("--mem-size", default=64*1024,   type=int,       help="Benchmark: burst read size (bytes).")
+    parser.add_argument("--window",   default=[1, 8],    type=int,       nargs="+", help="Benchmark: windows (requests in flight).")
+    args = parser.parse_args()
+
+    index    = None if args.csr_csv is None else CSRIndex(args.csr_csv)
+    mem_addr = args.mem_addr
+    if mem_addr is None:
+        if index is None:
+            mem_addr = 0x10000000
+        elif args.bench:
+            region = index.memories.get("sram", index.memories.get("rom"))
+            if region is None:
+                parser.error("No sram/rom region in csr.csv, specify the burst read address with --mem-addr.")
+            mem_addr = region[0]
+
+    server = None
+    if args.server:
+        server = EtherboneServer(latency=args.latency).start()
+        args.ip, args.port = server.address
+    try:
+        if args.read:
+            client = EtherboneClient(args.ip, args.port, csr_csv=args.csr_csv)
+            for name, value in client.read_regs(args.read).items():
+                print(f"{name}: 0x{value:x}")
+            client.close()
+        if args.bench:
+            if index is not None:
+                addrs = [addr for name in index.registers for addr in index.addresses(name)]
+            else:
+                addrs = [0xf0000000 + 4*i for i in range(args.nregs)]
+            bench(args.ip, args.port, addrs, mem_addr, args.mem_size, windows=args.window)
+    finally:
+        if server is not None:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
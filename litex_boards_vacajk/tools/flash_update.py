@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Differential SPI Flash update (--flash-update of the target): only the 4KB sectors (or whole 64KB
+# blocks) of the bitstream/firmware regions that changed since the last programming (recorded in a
+# manifest, one per board) are erased and written through OpenOCD jtagspi, then read back and
+# verified by CRC32. Regions can be updated on their own, e.g. only the firmware of a fleet:
+#
+# ./flash_update.py --firmware firmware.bin --manifest board0.json
+# ./flash_update.py --bitstream build/bochen_kintex7_base/gateware/bochen_kintex7_base.bin --dry-run
+
+import os
+import json
+import zlib
+import struct
+import hashlib
+import logging
+import argparse
+import tempfile
+
+# Geometry -----------------------------------------------------------------------------------------
+
+# MX25L25645G: 32MB, 4KB sectors (SE), 64KB blocks (BE), 256B pages. 4-byte address opcodes.
+spiflash_geometry = {
+    "part"        : "mx25l25645g",
+    "size"        : 32*1024*1024,
+    "sector_size" : 4*1024,
+    "block_size"  : 64*1024,
+    "page_size"   : 256,
+    "opcodes"     : {"read": 0x13, "program": 0x12, "chip_erase": 0xc7, "sector_erase": 0x21, "block_erase": 0xdc},
+}
+
+# Regions: (offset, size). Firmware is booted by the BIOS from FLASH_BOOT_ADDRESS (length/CRC32
+# header, see firmware_image).
+spiflash_regions = {
+    "bitstream" : (0x00000000, 0x00c00000), # xc7k325t bitstream: ~11.1MB.
+    "firmware"  : (0x00c00000, 0x00400000),
+}
+
+def firmware_image(data):
+    """Firmware `data` with the BIOS flash boot header (little-endian length and CRC32)."""
+    return struct.pack("<II", len(data), zlib.crc32(data)) + data
+
+# Plan ---------------------------------------------------------------------------------------------
+
+def sector_checksums(data, sector_size=spiflash_geometry["sector_size"]):
+    """CRC32 of each sector of `data` (last sector padded with erased 0xff bytes)."""
+    r = []
+    for address in range(0, len(data), sector_size):
+        sector = data[address:address + sector_size]
+        r.append(zlib.crc32(sector.ljust(sector_size, b"\xff")))
+    return r
+
+def manifest_region(data, offset, geometry=spiflash_geometry):
+    return {
+        "offset"      : offset,
+        "length"      : len(data),
+        "sha256"      : hashlib.sha256(data).hexdigest(),
+        "sector_size" : geometry["sector_size"],
+        "sectors"     : sector_checksums(data, geometry["sector_size"]),
+    }
+
+def _runs(indexes):
+    """Consecutive runs of sorted `indexes`: [(first, count)]."""
+    runs = []
+    for i in indexes:
+        if runs and runs[-1][0] + runs[-1][1] == i:
+            runs[-1][1] += 1
+        else:
+            runs.append([i, 1])
+    return [tuple(run) for run in runs]
+
+def plan_region(name, data, offset, size, previous=None, geometry=spiflash_geometry):
+    """Erase/write operations updating region `name` (at `offset`, `size` bytes) from `previous`
+    (manifest region, None when unknown: full region update) to `data`.
+
+    Changed sectors are erased with 64KB block erases when all sectors of an aligned block changed,
+    else with 4KB sector erases. Erased sectors only containing 0xff are not written. Returns {name,
+    erases: [(address, size, erase_size)], writes: [(address, data)], changed, sectors, manifest}.
+    """
+    sector_size = geometry["sector_size"]
+    block_size  = geometry["block_size"]
+    if offset % block_size:
+        raise ValueError(f"{name} region offset 0x{offset:08x} not aligned on a {block_size//1024}KB block.")
+    if len(data) > size:
+        raise ValueError(f"{name} image ({len(data)} bytes) larger than its region ({size} bytes).")
+    manifest = manifest_region(data, offset, geometry)
+    sectors  = manifest["sectors"]
+    old      = None
+    if previous is not None and (previous["offset"], previous["sector_size"]) == (offset, sector_size):
+        old = previous["sectors"]
+    changed = [i for i, crc in enumerate(sectors) if old is None or i >= len(old) or old[i] != crc]
+
+    # Erases (merged per erase size).
+    per_block = block_size//sector_size
+    erases    = []
+    blocks    = {}
+    for i in changed:
+        blocks.setdefault(i//per_block, []).append(i)
+    for block, block_sectors in sorted(blocks.items()):
+        if len(block_sectors) == per_block:
+            erases.append((offset + block*block_size, block_size, block_size))
+        else:
+            for i in block_sectors:
+                erases.append((offset + i*sector_size, sector_size, sector_size))
+    merged = []
+    for address, length, erase_size in erases:
+        if merged and merged[-1][2] == erase_size and merged[-1][0] + merged[-1][1] == address:
+            merged[-1][1] += length
+        else:
+            merged.append([address, length, erase_size])
+
+    # Writes (consecutive non-blank changed sectors).
+    blank  = zlib.crc32(b"\xff"*sector_size)
+    writes = []
+    for first, count in _runs([i for i in changed if sectors[i] != blank]):
+        chunk = data[first*sector_size:(first + count)*sector_size]
+        writes.append((offset + first*sector_size, chunk))
+
+    return {
+        "name"     : name,
+        "erases"   : [tuple(erase) for erase in merged],
+        "writes"   : writes,
+        "changed"  : len(changed),
+        "sectors"  : len(sectors),
+        "manifest" : manifest,
+    }
+
+def plan_summary(plan, logger=logging.getLogger("SPIFlash")):
+    erased  = sum(length for _, length, _ in plan["erases"])
+    written = sum(len(data) for _, data in plan["writes"])
+    logger.info(f"{plan['name']}: {plan['changed']}/{plan['sectors']} sectors changed, "
+        f"{erased//1024}KB erased, {written//1024}KB written.")
+
+# Manifest -----------------------------------------------------------------------------------------
+
+def read_manifest(filename, geometry=spiflash_geometry):
+    """Manifest of the last programmed images ({region: manifest_region}), empty when missing or
+    for another flash."""
+    if filename is None or not os.path.exists(filename):
+        return {}
+    with open(filename, "r") as f:
+        manifest = json.load(f)
+    if (manifest.get("part"), manifest.get("size")) != (geometry["part"], geometry["size"]):
+        return {}
+    return manifest["regions"]
+
+def write_manifest(filename, regions, geometry=spiflash_geometry):
+    with open(filename, "w") as f:
+        json.dump({"part": geometry["part"], "size": geometry["size"], "regions": regions}, f, indent=4)
+
+# Flash Backends -----------------------------------------------------------------------------------
+
+class FileFlash:
+    """File-backed flash image (erase sets 0xff, program clears bits like NOR flash)."""
+    def __init__(self, filename, geometry=spiflash_geometry):
+        self.filename = filename
+        self.geometry = geometry
+        self.erased   = 0
+        self.written  = 0
+        if not os.path.exists(filename):
+            with open(filename, "wb") as f:
+                f.write(b"\xff"*geometry["size"])
+
+    def execute(self, erases=[], writes=[], reads=[]):
+        """Erase `erases` [(address, size, erase_size)], program `writes` [(address, data)] and
+        return `reads` [(address, size)] contents."""
+        with open(self.filename, "r+b") as f:
+            for address, size, erase_size in erases:
+                if address % erase_size or size % erase_size:
+                    raise ValueError(f"Unaligned erase 0x{address:08x}/0x{size:x}.")
+                f.seek(address)
+                f.write(b"\xff"*size)
+                self.erased += size
+            for address, data in writes:
+                f.seek(address)
+                old = f.read(len(data))
+                f.seek(address)
+                f.write(bytes(a & b for a, b in zip(old, data)))
+                self.written += len(data)
+            r = []
+            for address, size in reads:
+                f.seek(address)
+                r.append(f.read(size))
+            return r
+
+class OpenOCDFlash:
+    """SPI Flash accessed through the OpenOCD jtagspi proxy of `programmer` (platform
+    create_programmer()), all operations of an update done in a single OpenOCD session."""
+    def __init__(self, programmer, geometry=spiflash_geometry, reboot=True):
+        self.programmer = programmer
+        self.geometry   = geometry
+        self.reboot     = reboot
+
+    def _set(self, erase_size):
+        # Override the probed geometry to select the erase granularity (OpenOCD >= 0.12).
+        g  = self.geometry
+        op = g["opcodes"]
+        erase = op["sector_erase"] if erase_size == g["sector_size"] else op["block_erase"]
+        return "jtagspi set 0 {} 0x{:x} 0x{:x} 0x{:02x} 0 0x{:02x} 0x{:02x} 0x{:x} 0x{:02x}".format(
+            g["part"], g["size"], g["page_size"], op["read"], op["program"], op["chip_erase"], erase_size, erase)
+
+    def script(self, flash_proxy, erases, writes, reads, directory):
+        """OpenOCD commands (and files to write/read in `directory`)."""
+        commands = ["init", f"jtagspi_init 0 {{{flash_proxy}}}"]
+        erase_size = None
+        for address, size, _erase_size in erases:
+            if _erase_size != erase_size:
+                erase_size = _erase_size
+                commands.append(self._set(erase_size))
+            commands.append(f"flash erase_address 0x{address:08x} 0x{size:x}")
+        for n, (address, data) in enumerate(writes):
+            filename = os.path.join(directory, f"write{n}.bin")
+            with open(filename, "wb") as f:
+                f.write(data)
+            commands.append(f"flash write_bank 0 {{{filename}}} 0x{address:08x}")
+        for n, (address, size) in enumerate(reads):
+            filename = os.path.join(directory, f"read{n}.bin")
+            commands.append(f"flash read_bank 0 {{{filename}}} 0x{address:08x} 0x{size:x}")
+        if self.reboot and (erases or writes):
+            commands.append("fpga_program")
+        commands.append("exit")
+        return commands
+
+    def execute(self, erases=[], writes=[], reads=[]):
+        config      = self.programmer.find_config()
+        flash_proxy = self.programmer.find_flash_proxy()
+        with tempfile.TemporaryDirectory() as directory:
+            commands = self.script(flash_proxy, erases, writes, reads, directory)
+            self.programmer.call(["openocd", "-f", config, "-c", "; ".join(commands)])
+            r = []
+            for n in range(len(reads)):
+                with open(os.path.join(directory, f"read{n}.bin"), "rb") as f:
+                    r.append(f.read())
+            return r
+
+# Update -------------------------------------------------------------------------------------------
+
+def update(flash, images, manifest=None, readback=False, dry_run=False, regions=spiflash_regions,
+    logger=logging.getLogger("SPIFlash")):
+    """Update `images` ({region: data}) of `flash` from `manifest` (filename, None: full update).
+
+    With `readback`, the diff is done against the flash contents instead of the manifest (boards
+    programmed by other means). Erased ranges and whole images are read back and checked against
+    their CRC32 (also catching sectors left stale by a manifest of another board), the manifest is
+    only updated when all of them match. Returns the plans.
+    """
+    geometry = flash.geometry
+    previous = read_manifest(manifest, geometry)
+    if readback:
+        names    = list(images.keys())
+        contents = flash.execute(reads=[(regions[name][0], len(images[name])) for name in names])
+        previous = {name: manifest_region(data, regions[name][0], geometry) for name, data in zip(names, contents)}
+    plans = []
+    for name, data in images.items():
+        offset, size = regions[name]
+        plan = plan_region(name, data, offset, size, previous.get(name), geometry)
+        plan_summary(plan, logger)
+        plans.append(plan)
+    if dry_run:
+        return plans
+
+    erases = [erase for plan in plans for erase in plan["erases"]]
+    writes = [write for plan in plans for write in plan["writes"]]
+    if not (erases or writes):
+        logger.info("SPI Flash up to date, verifying.")
+    # Expected contents of the erased ranges (written data, 0xff elsewhere) and of the images.
+    reads    = []
+    expected = []
+    for plan in plans:
+        offset = regions[plan["name"]][0]
+        data   = images[plan["name"]]
+        for address, size, _ in plan["erases"]:
+            start = address - offset
+            reads.append((address, size))
+            expected.append(data[start:start + size].ljust(size, b"\xff"))
+        reads.append((offset, len(data)))
+        expected.append(data)
+    contents = flash.execute(erases, writes, reads=reads)
+    for (address, size), content, data in zip(reads, contents, expected):
+        if zlib.crc32(content) != zlib.crc32(data):
+            raise OSError(f"SPI Flash verify failed at 0x{address:08x}-0x{address + size - 1:08x} "
+                f"(CRC32 0x{zlib.crc32(content):08x}, expected 0x{zlib.crc32(data):08x}), "
+                "manifest of another board? Retry with readback.")
+
+    if manifest is not None:
+        regions_manifest = read_manifest(manifest, geometry)
+        regions_manifest.update({plan["name"]: plan["manifest"] for plan in plans})
+        write_manifest(manifest, regions_manifest, geometry)
+    return plans
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base differential SPI Flash update.")
+    parser.add_argument("--bitstream",  default=None,                       help="Bitstream image (write_cfgmem .bin).")
+    parser.add_argument("--firmware",   default=None,                       help="Firmware binary (BIOS flash boot header added).")
+    parser.add_argument("--manifest",   required=True,                      help="Manifest of the last programmed images (one per board).")
+    parser.add_argument("--readback",   action="store_true",                help="Diff against the flash contents instead of the manifest.")
+    parser.add_argument("--file",       default=None,                       help="Update a flash image file instead of the board.")
+    parser.add_argument("--dry-run",    action="store_true",                help="Only show the sectors to update.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    images = {}
+    if args.bitstream is not None:
+        with open(args.bitstream, "rb") as f:
+            images["bitstream"] = f.read()
+    if args.firmware is not None:
+        with open(args.firmware, "rb") as f:
+            images["firmware"] = firmware_image(f.read())
+    if not images:
+        parser.error("No image to update (--bitstream/--firmware).")
+
+    if args.file is not None:
+        flash = FileFlash(args.file)
+    else:
+        from litex_boards_vacajk.platforms import bochen_kintex7_base
+        flash = OpenOCDFlash(bochen_kintex7_base.Platform().create_programmer())
+    update(flash, images, args.manifest, readback=args.readback, dry_run=args.dry_run)
+
+if __name__ == "__main__":
+    main()
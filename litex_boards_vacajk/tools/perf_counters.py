@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Host decoder for the performance counters (--with-perf-counters), read over a LiteX bridge
+# (litex_server over UART/Etherbone). For each probe (main bus masters/slaves, L2 refills, LiteDRAM
+# crossbar ports, Ethernet MACs) and sampling period, prints the utilization (busy cycles), the
+# stall ratio (busy cycles not accepted), the throughput and the average cycles per transaction,
+# then optionally the utilization histograms accumulated by the hardware since the last clear.
+#
+# ./perf_counters.py --csr-csv csr.csv
+# ./perf_counters.py --csr-csv csr.csv --period-shift 24 --count 10 --hist --json perf.json
+
+import re
+import time
+import json
+import argparse
+
+# Decode -------------------------------------------------------------------------------------------
+
+counters = ["busy", "transactions", "stalls", "bytes"]
+
+def probes(bus):
+    """Probe names, from the `perf_<probe>_transactions` CSRs."""
+    return [m.group(1) for m in (re.match(r"perf_(.+)_transactions$", name) for name in bus.regs.d) if m]
+
+def read_snapshot(bus, names, retries=8):
+    """Read the counters of the last period of all probes, consistently: the reads are retried when
+    a new snapshot is taken during them."""
+    for _ in range(retries):
+        snapshot = bus.regs.perf_snapshot.read()
+        r = {name: {c: getattr(bus.regs, f"perf_{name}_{c}").read() for c in counters} for name in names}
+        if bus.regs.perf_snapshot.read() == snapshot:
+            return snapshot, r
+    raise RuntimeError("Performance counters snapshot changed during reads, increase sampling period.")
+
+def read_histograms(bus, names, nbins=8):
+    r = {name: [] for name in names}
+    for i in range(nbins):
+        bus.regs.perf_hist_index.write(i)
+        for name in names:
+            r[name].append(getattr(bus.regs, f"perf_{name}_hist_count").read())
+    return r
+
+def decode(counts, period, clk_freq):
+    """Decode the raw counters of a `period` cycles snapshot."""
+    busy, transactions, stalls, nbytes = [counts[c] for c in counters]
+    return {
+        "utilization"            : busy/period,
+        "stall_ratio"            : stalls/busy if busy else 0,
+        "bandwidth"              : nbytes*clk_freq/period,       # In bytes/s.
+        "transactions"           : transactions*clk_freq/period, # In transactions/s.
+        "cycles_per_transaction" : busy/transactions if transactions else 0,
+    }
+
+def report(snapshot, period, clk_freq):
+    print("{:<28} {:>6} {:>6} {:>10} {:>12} {:>8}".format("probe", "busy%", "stall%", "MB/s", "MTransfers/s", "cyc/xfer"))
+    results = {}
+    for name, counts in snapshot.items():
+        r = results[name] = decode(counts, period, clk_freq)
+        print("{:<28} {:6.1f} {:6.1f} {:10.2f} {:12.3f} {:8.1f}".format(name,
+            r["utilization"]*100, r["stall_ratio"]*100, r["bandwidth"]/1e6, r["transactions"]/1e6, r["cycles_per_transaction"]))
+    return results
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    from litex import RemoteClient
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base performance counters decoder.")
+    parser.add_argument("--csr-csv",      default="csr.csv",                 help="SoC CSV file.")
+    parser.add_argument("--host",         default="localhost",               help="litex_server host.")
+    parser.add_argument("--port",         default=1234,       type=int,      help="litex_server port.")
+    parser.add_argument("--period-shift", default=None,       type=int,      help="Set sampling period (log2, cycles, min: log2 of the histogram bins).")
+    parser.add_argument("--count",        default=1,          type=int,      help="Number of snapshots to decode.")
+    parser.add_argument("--hist",         action="store_true",               help="Print utilization histograms.")
+    parser.add_argument("--clear",        action="store_true",               help="Clear utilization histograms first.")
+    parser.add_argument("--json",         default=None,                      help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+    try:
+        clk_freq = bus.constants.config_clock_frequency
+        names    = probes(bus)
+        if args.period_shift is not None:
+            bus.regs.perf_period_shift.write(args.period_shift)
+        if args.clear:
+            bus.regs.perf_hist_clear.write(1)
+        period  = 2**bus.regs.perf_period_shift.read()
+        results = {"period": period, "snapshots": []}
+        last    = bus.regs.perf_snapshot.read()
+        for _ in range(args.count):
+            # Wait for a new (complete) sampling period.
+            while bus.regs.perf_snapshot.read() == last:
+                time.sleep(min(period/clk_freq/4, 0.1))
+            last, snapshot = read_snapshot(bus, names)
+            print(f"\nSnapshot {last} ({period/clk_freq*1e3:.2f}ms):")
+            results["snapshots"].append(report(snapshot, period, clk_freq))
+        if args.hist:
+            hists = results["histograms"] = read_histograms(bus, names)
+            print("\nUtilization histograms (periods per 12.5% busy bin):")
+            for name, hist in hists.items():
+                print("{:<28} {}".format(name, " ".join(f"{count:>6}" for count in hist)))
+    finally:
+        bus.close()
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# SDCard block I/O benchmark through the `sdcard_bench` transfer timer (--with-sdcard-bench), driven
+# over a LiteX bridge (litex_server over UART/Etherbone), on the board or on the simulation (with
+# the LiteSDCard emulator):
+#
+# - sequential : Multiple block transfers (CMD18/CMD25) of consecutive blocks (image/rootfs loads).
+# - random     : Single block transfers (CMD17/CMD24) at random blocks (filesystem accesses).
+#
+# Native mode (--with-sdcard) uses the SDCore and its DMAs (reads, and writes with --write), SPI
+# mode (--with-spi-sdcard) is driven byte by byte (reads). Throughputs are computed from the cycles
+# spent in transfers, excluding the bridge/software time between them (also reported as "host").
+# The link rate only counts the cycles the card link is busy: in SPI mode, transfers also include
+# the per-byte CSR accesses of the driver, which dominate. Driven from the host, these go through
+# the bridge: --timer instead reports the transfers done meanwhile by the target (BIOS/firmware).
+#
+# ./sdcard_bench.py --csr-csv csr.csv
+# ./sdcard_bench.py --csr-csv csr.csv --clk-freq 400e3 25e6 50e6 --json sdcard_bench.json
+# ./sdcard_bench.py --csr-csv csr.csv --write --write-block 0x100000 (Overwrites card blocks!)
+# ./sdcard_bench.py --csr-csv csr.csv --timer 10 (Transfers done by the target during 10s)
+
+import time
+import json
+import math
+import random
+import argparse
+
+# Native Mode --------------------------------------------------------------------------------------
+
+RESPONSE_NONE       = 0
+RESPONSE_SHORT      = 1
+RESPONSE_LONG       = 2
+RESPONSE_SHORT_BUSY = 3
+
+DATA_NONE  = 0
+DATA_READ  = 1
+DATA_WRITE = 2
+
+class NativeSDCard:
+    """SDCard driven through the LiteSDCard core CSRs (port of the BIOS liblitesdcard)."""
+    def __init__(self, bus, timeout=1.0):
+        self.bus     = bus
+        self.regs    = bus.regs
+        self.timeout = timeout
+        self.rca     = 0
+
+    def _wait(self, reg):
+        start = time.time()
+        while True:
+            event = reg.read()
+            if event & 0x1:
+                break
+            if time.time() - start > self.timeout:
+                raise TimeoutError("SDCard core did not complete.")
+        if event & 0x4:
+            raise TimeoutError("SDCard timeout.")
+        if event & 0x8:
+            raise IOError("SDCard CRC error.")
+
+    def command(self, cmd, arg=0, response=RESPONSE_SHORT, data=DATA_NONE):
+        self.regs.sdcard_core_cmd_argument.write(arg)
+        self.regs.sdcard_core_cmd_command.write((cmd << 8) | (data << 5) | response)
+        self.regs.sdcard_core_cmd_send.write(1)
+        self._wait(self.regs.sdcard_core_cmd_event)
+        return self.regs.sdcard_core_cmd_response.read() & 0xffffffff
+
+    def wait_data(self):
+        self._wait(self.regs.sdcard_core_data_event)
+
+    def set_clk_freq(self, clk_freq):
+        """Set the card clock (power of 2 divider, as the BIOS), return the effective frequency."""
+        sys_clk_freq = self.bus.constants.config_clock_frequency
+        divider      = min(max(2**math.ceil(math.log2(sys_clk_freq/clk_freq)), 2), 256)
+        self.regs.sdcard_phy_clocker_divider.write(divider)
+        return sys_clk_freq/divider
+
+    def init(self, clk_freq=25e6):
+        self.set_clk_freq(400e3)
+        for _ in range(100):
+            self.regs.sdcard_phy_init_initialize.write(1)
+            try:
+                self.command(0, response=RESPONSE_NONE) # GO_IDLE_STATE.
+                break
+            except TimeoutError:
+                pass
+        self.command(8, 0x1aa)                          # SEND_IF_COND.
+        for _ in range(1000):
+            self.command(55)                            # APP_CMD.
+            if self.command(41, 0x70ff8000, RESPONSE_SHORT_BUSY) & 0x80000000: # SD_SEND_OP_COND (HCS).
+                break
+        else:
+            raise TimeoutError("SDCard did not complete initialization.")
+        self.command(2, response=RESPONSE_LONG)         # ALL_SEND_CID.
+        self.rca = self.command(3) >> 16                # SEND_RELATIVE_ADDR.
+        self.command(7, self.rca << 16, RESPONSE_SHORT_BUSY) # SELECT_CARD.
+        self.command(55, self.rca << 16)
+        self.command(6, 2)                              # SET_BUS_WIDTH (4-bit).
+        # SWITCH_FUNC to High Speed (SDR25) when above 25MHz.
+        if clk_freq > 25e6:
+            self.regs.sdcard_core_block_length.write(64)
+            self.regs.sdcard_core_block_count.write(1)
+            self.command(6, 0x80fffff1, data=DATA_READ)
+            self.wait_data()
+        self.command(16, 512)                           # SET_BLOCKLEN.
+        return self.set_clk_freq(clk_freq)
+
+    def transfer(self, block, count, address, write=False):
+        """Read (or write) `count` blocks from `block` to (or from) memory at `address`."""
+        dma = "sdcard_mem2block_dma" if write else "sdcard_block2mem_dma"
+        getattr(self.regs, f"{dma}_enable").write(0)
+        getattr(self.regs, f"{dma}_base").write(address)
+        getattr(self.regs, f"{dma}_length").write(512*count)
+        getattr(self.regs, f"{dma}_enable").write(1)
+        self.regs.sdcard_core_block_length.write(512)
+        self.regs.sdcard_core_block_count.write(count)
+        if write:
+            self.command(25 if count > 1 else 24, block, data=DATA_WRITE)
+        else:
+            self.command(18 if count > 1 else 17, block, data=DATA_READ)
+        self.wait_data()
+        if count > 1:
+            self.command(12, response=RESPONSE_SHORT_BUSY) # STOP_TRANSMISSION.
+        start = time.time()
+        while not getattr(self.regs, f"{dma}_done").read() & 0x1:
+            if time.time() - start > self.timeout:
+                raise TimeoutError("SDCard DMA did not complete.")
+
+# SPI Mode -----------------------------------------------------------------------------------------
+
+class SPISDCard:
+    """SDCard driven in SPI mode through the SPIMaster CSRs (port of the BIOS spisdcard)."""
+    def __init__(self, bus, timeout=1.0):
+        self.bus     = bus
+        self.regs    = bus.regs
+        self.timeout = timeout
+
+    def xfer(self, byte=0xff):
+        self.regs.spisdcard_mosi.write(byte)
+        self.regs.spisdcard_control.write((8 << 8) | 1)
+        while not self.regs.spisdcard_status.read() & 0x1:
+            pass
+        return self.regs.spisdcard_miso.read()
+
+    def select(self, select=True):
+        self.regs.spisdcard_cs.write(int(select))
+        self.xfer()
+        if select:
+            start = time.time()
+            while self.xfer() != 0xff:
+                if time.time() - start > self.timeout:
+                    raise TimeoutError("SDCard not ready.")
+
+    def command(self, cmd, arg=0):
+        if cmd not in [0, 12]:
+            self.select(False)
+            self.select(True)
+        crc = {0: 0x95, 8: 0x87}.get(cmd, 0x01)
+        for byte in [0x40 | cmd, *arg.to_bytes(4, "big"), crc]:
+            self.xfer(byte)
+        if cmd == 12:
+            self.xfer() # Stuff byte.
+        for _ in range(10):
+            r = self.xfer()
+            if not r & 0x80:
+                break
+        return r
+
+    def set_clk_freq(self, clk_freq):
+        sys_clk_freq = self.bus.constants.config_clock_frequency
+        divider      = min(max(int(sys_clk_freq//clk_freq) + 1, 2), 256)
+        self.regs.spisdcard_clk_divider.write(divider)
+        return sys_clk_freq/divider
+
+    def init(self, clk_freq=20e6):
+        self.set_clk_freq(400e3)
+        for _ in range(100):
+            self.regs.spisdcard_cs.write(0)
+            for _ in range(10):
+                self.xfer() # 80 dummy clocks.
+            self.regs.spisdcard_cs.write(1)
+            if self.command(0) == 0x01: # GO_IDLE_STATE.
+                break
+        else:
+            raise TimeoutError("SDCard did not enter SPI mode.")
+        if self.command(8, 0x1aa) != 0x01: # SEND_IF_COND.
+            raise IOError("SDCard version not supported.")
+        for _ in range(4):
+            self.xfer()
+        for _ in range(1000):
+            if self.command(55) <= 1 and self.command(41, 1 << 30) == 0: # APP_CMD/SD_SEND_OP_COND (HCS).
+                break
+        else:
+            raise TimeoutError("SDCard did not complete initialization.")
+        return self.set_clk_freq(clk_freq)
+
+    def transfer(self, block, count, address=None, write=False):
+        """Read `count` blocks from `block` (data returned, `address` unused)."""
+        if write:
+            raise ValueError("Block writes are not supported in SPI mode.")
+        data = bytearray()
+        if self.command(18 if count > 1 else 17, block) != 0:
+            raise IOError(f"SDCard read error at block {block}.")
+        for _ in range(count):
+            start = time.time()
+            while self.xfer() != 0xfe: # Start of block token.
+                if time.time() - start > self.timeout:
+                    raise TimeoutError(f"SDCard read timeout at block {block}.")
+            data += bytes(self.xfer() for _ in range(512))
+            self.xfer(), self.xfer() # CRC.
+        if count > 1:
+            self.command(12) # STOP_TRANSMISSION.
+        self.select(False)
+        return bytes(data)
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def patterns(size, span, transfer_size=64*1024, nrandom=64, seed=0, block=0):
+    """Benchmark patterns as {name: [(block, count)]} (sizes in bytes, `span` for random blocks)."""
+    rng   = random.Random(seed)
+    count = max(transfer_size//512, 1)
+    return {
+        "sequential" : [(block + n, min(count, size//512 - n)) for n in range(0, size//512, count)],
+        "random"     : [(block + rng.randrange(span//512), 1) for _ in range(nrandom)],
+    }
+
+def run(card, bus, transfers, address=None, write=False):
+    """Run `transfers` and return {cycles, link_cycles, transfers, bytes, payload, elapsed} (timer
+    and host)."""
+    bus.regs.sdcard_bench_clear.write(1)
+    start = time.time()
+    for block, count in transfers:
+        card.transfer(block, count, address, write=write)
+    return dict(read_timer(bus),
+        elapsed  = time.time() - start,
+        payload  = 512*sum(count for _, count in transfers),
+        commands = len(transfers),
+    )
+
+def read_timer(bus):
+    return {name: getattr(bus.regs, f"sdcard_bench_{name}").read() for name in ["cycles", "link_cycles", "transfers", "bytes"]}
+
+def summarize(r, sys_clk_freq):
+    """Throughputs (bytes/s) and mean time per transfer (s) of a run()."""
+    return {
+        "throughput"      : r["payload"]*sys_clk_freq/max(r["cycles"], 1),
+        "link_throughput" : r["payload"]*sys_clk_freq/max(r.get("link_cycles", r["cycles"]), 1),
+        "transfer_time"   : r["cycles"]/sys_clk_freq/max(r["commands"], 1),
+        "host_throughput" : r["payload"]/max(r["elapsed"], 1e-9),
+    }
+
+def monitor(bus, duration):
+    """Clear the timer, let the target transfer for `duration` s and return the timer counters and
+    throughputs (of the bytes moved on the card link, protocol included in SPI mode)."""
+    sys_clk_freq = bus.constants.config_clock_frequency
+    bus.regs.sdcard_bench_clear.write(1)
+    time.sleep(duration)
+    r = read_timer(bus)
+    r.update(
+        throughput      = r["bytes"]*sys_clk_freq/max(r["cycles"], 1),
+        link_throughput = r["bytes"]*sys_clk_freq/max(r["link_cycles"], 1),
+    )
+    print("target {:>10} transfers {:8.3f}MB/s (link: {:8.3f}MB/s)".format(
+        r["transfers"], r["throughput"]/1e6, r["link_throughput"]/1e6))
+    return r
+
+def bench(bus, mode=None, clk_freqs=[None], size=1024*1024, span=1024*1024*1024, transfer_size=64*1024,
+    nrandom=64, write=False, write_block=None, address=None):
+    sys_clk_freq = bus.constants.config_clock_frequency
+    if mode is None:
+        mode = "native" if hasattr(bus.regs, "sdcard_core_cmd_send") else "spi"
+    card = (NativeSDCard if mode == "native" else SPISDCard)(bus)
+    if mode == "native" and address is None:
+        main_ram = bus.mems.main_ram
+        address  = main_ram.base + main_ram.size//2
+    results = []
+    for clk_freq in clk_freqs:
+        clk_freq = card.init(clk_freq or (25e6 if mode == "native" else 20e6))
+        runs = {name: (transfers, False) for name, transfers in patterns(size, span, transfer_size, nrandom).items()}
+        if write:
+            for name, transfers in patterns(size, span, transfer_size, nrandom, block=write_block).items():
+                runs[f"{name}_write"] = ([(b, n) for b, n in transfers if b + n <= write_block + span//512], True)
+        for name, (transfers, is_write) in runs.items():
+            r = run(card, bus, transfers, address, write=is_write)
+            r.update(summarize(r, sys_clk_freq))
+            r.update(mode=mode, pattern=name, clk_freq=clk_freq)
+            results.append(r)
+            print("{:<6} {:<16} {:7.2f}MHz {:8.3f}MB/s {:9.1f}us/transfer (link: {:8.3f}MB/s, host: {:7.3f}MB/s)".format(
+                mode, name, clk_freq/1e6, r["throughput"]/1e6, r["transfer_time"]*1e6, r["link_throughput"]/1e6, r["host_throughput"]/1e6))
+    return results
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    from litex import RemoteClient
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base SDCard block I/O benchmark.")
+    parser.add_argument("--csr-csv",       default="csr.csv",                    help="SoC CSV file.")
+    parser.add_argument("--host",          default="localhost",                  help="litex_server host.")
+    parser.add_argument("--port",          default=1234,       type=int,         help="litex_server port.")
+    parser.add_argument("--clk-freq",      default=None,       type=float, nargs="+", help="Card clk frequencies to sweep (default: 20MHz SPI, 25MHz native).")
+    parser.add_argument("--size",          default=None,       type=int,         help="Sequential bytes (default: 1MB native, 8KB SPI).")
+    parser.add_argument("--span",          default=1 << 30,    type=int,         help="Random blocks span (bytes).")
+    parser.add_argument("--transfer-size", default=64*1024,    type=int,         help="Sequential transfer size (bytes).")
+    parser.add_argument("--random",        default=None,       type=int,         help="Random transfers (default: 64 native, 8 SPI).")
+    parser.add_argument("--write",         action="store_true",                  help="Also benchmark writes (native, overwrites card blocks!).")
+    parser.add_argument("--write-block",   default=0x100000,   type=lambda x: int(x, 0), help="First block of the write area.")
+    parser.add_argument("--address",       default=None,       type=lambda x: int(x, 0), help="DMA buffer address (default: middle of main_ram).")
+    parser.add_argument("--timer",         default=None,       type=float,       help="Only report the transfers done by the target during this time (s).")
+    parser.add_argument("--json",          default=None,                         help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+    try:
+        spi = not hasattr(bus.regs, "sdcard_core_cmd_send")
+        if args.timer is not None:
+            results = [monitor(bus, args.timer)]
+        else:
+            results = bench(bus,
+                clk_freqs     = args.clk_freq or [None],
+                size          = args.size or (8*1024 if spi else 1024*1024),
+                span          = args.span,
+                transfer_size = args.transfer_size,
+                nrandom       = args.random or (8 if spi else 64),
+                write         = args.write,
+                write_block   = args.write_block,
+                address       = args.address,
+            )
+    finally:
+        bus.close()
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# SDRAM bandwidth/latency benchmark through the `sdram_bench`, `sdram_bus_bench` and LiteDRAM BIST
+# cores (--with-sdram-bench), driven over a LiteX bridge (litex_server over UART/Etherbone). Works
+# the same on hardware and on the simulation (bochen_kintex7_base_sim.py --with-sdram-bench), to
+# compare configurations (sys_clk_freq/--sdram-clk-freq, L2 size) before building:
+#
+# - native : DRAM native port, sequential/random bursts, read/write/mixed, read latency histogram.
+# - cpu    : CPU path (Wishbone through the L2 cache), sequential/random cache-line reads.
+# - bist   : LiteDRAM BIST, sequential/random write then read-back check.
+#
+# ./sdram_bench.py --csr-csv csr.csv
+# ./sdram_bench.py --csr-csv csr.csv --bursts 1 8 64 --mixes read 50 --json sdram_bench.json
+
+import time
+import json
+import argparse
+
+# Histogram ----------------------------------------------------------------------------------------
+
+def percentiles(hist, shift, ps=(50, 90, 99), latency_min=None, latency_max=None):
+    """Latency percentiles (cycles) from a `2**shift` cycles wide bins histogram (last bin:
+    overflow). A percentile is estimated as the upper bound of its bin, within [min, max]."""
+    total   = sum(hist)
+    results = {}
+    for p in ps:
+        if total == 0:
+            results[p] = None
+            continue
+        target     = p*total/100
+        cumulative = 0
+        for i, count in enumerate(hist):
+            cumulative += count
+            if cumulative >= target and count:
+                break
+        if i == len(hist) - 1 and latency_max is not None:
+            value = latency_max
+        else:
+            value = ((i + 1) << shift) - 1
+        if latency_max is not None:
+            value = min(value, latency_max)
+        if latency_min is not None:
+            value = max(value, latency_min)
+        results[p] = value
+    return results
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def wait_done(done, name, timeout):
+    start = time.time()
+    while not done.read():
+        if time.time() - start > timeout:
+            raise TimeoutError(f"{name} did not complete.")
+        time.sleep(1e-3)
+
+def run_native(bus, base, length, burst=1, random=False, mask=0, write_ratio=0, hist_shift=2, nbins=32, timeout=10.0):
+    """Run one native port pass and return {cycles, reads, writes, latency_*, hist}."""
+    regs = bus.regs
+    regs.sdram_bench_base.write(base)
+    regs.sdram_bench_length.write(length)
+    regs.sdram_bench_burst.write(burst)
+    regs.sdram_bench_mask.write(mask)
+    regs.sdram_bench_random.write(int(random))
+    regs.sdram_bench_write_ratio.write(write_ratio)
+    regs.sdram_bench_hist_shift.write(hist_shift)
+    regs.sdram_bench_start.write(1)
+    wait_done(regs.sdram_bench_done, "SDRAM benchmark", timeout)
+    r = {name: getattr(regs, "sdram_bench_" + name).read() for name in [
+        "cycles", "reads", "writes", "latency_min", "latency_max", "latency_sum"]}
+    r["hist"] = []
+    for i in range(nbins):
+        regs.sdram_bench_hist_index.write(i)
+        r["hist"].append(regs.sdram_bench_hist_count.read())
+    return r
+
+def run_cpu(bus, base, length, burst=1, random=False, mask=0, timeout=10.0):
+    """Run one CPU path (through L2) pass and return {cycles, latency, checksum}."""
+    regs = bus.regs
+    regs.sdram_bus_bench_base.write(base)
+    regs.sdram_bus_bench_length.write(length)
+    regs.sdram_bus_bench_burst.write(burst)
+    regs.sdram_bus_bench_mask.write(mask)
+    regs.sdram_bus_bench_random.write(int(random))
+    regs.sdram_bus_bench_start.write(1)
+    wait_done(regs.sdram_bus_bench_done, "SDRAM CPU path benchmark", timeout)
+    return {name: getattr(regs, "sdram_bus_bench_" + name).read() for name in ["cycles", "latency", "checksum"]}
+
+def run_bist(bus, base, length, random=False, timeout=10.0):
+    """Write then check `length` bytes with LiteDRAM BIST and return {write_ticks, read_ticks, errors}."""
+    r = {}
+    for name in ["generator", "checker"]:
+        module = lambda reg: getattr(bus.regs, f"sdram_{name}_{reg}")
+        module("reset").write(1)
+        module("base").write(base)
+        module("end").write(base + length)
+        module("length").write(length)
+        module("random").write(0b11 if random else 0b00) # addr, data.
+        module("start").write(1)
+        wait_done(module("done"), f"SDRAM BIST {name}", timeout)
+        r["write_ticks" if name == "generator" else "read_ticks"] = module("ticks").read()
+    r["errors"] = bus.regs.sdram_checker_errors.read()
+    return r
+
+mixes = {"read": 0, "write": 256, "50": 128, "25": 64, "75": 192}
+
+def patterns(size, bursts=(1, 4, 16, 64), mixes_names=("read", "write", "50"), window=16*1024*1024, word_size=32):
+    """Native port patterns as {name: run_native() kwargs} (sizes in bytes)."""
+    r = {}
+    for access in ["seq", "random"]:
+        for burst in bursts:
+            for mix in mixes_names:
+                r[f"{access}-b{burst}-{mix}"] = dict(
+                    length      = size//word_size,
+                    burst       = burst,
+                    random      = access == "random",
+                    mask        = (window - 1) & ~(burst*word_size - 1),
+                    write_ratio = mixes[mix],
+                )
+    return r
+
+def bench(bus, size=1024*1024, bursts=(1, 4, 16, 64), mixes_names=("read", "write", "50"), window=16*1024*1024,
+    line_size=64, hist_shift=2, with_cpu=True, with_bist=True):
+    clk_freq  = bus.constants.sdram_bench_clk_freq
+    word_size = bus.constants.sdram_bench_data_width//8
+    base      = bus.mems.main_ram.base
+    results   = []
+
+    def report(r, bytes, cycles, extra=""):
+        r["bandwidth"] = bytes*clk_freq/cycles if cycles else 0 # In bytes/s.
+        results.append(r)
+        print("{:<8} {:<20} {:8.2f}MB/s {}".format(r["path"], r["pattern"], r["bandwidth"]/1e6, extra))
+
+    # Native port.
+    for name, kwargs in patterns(size, bursts, mixes_names, window, word_size).items():
+        r = run_native(bus, 0, hist_shift=hist_shift, **kwargs)
+        r.update(path="native", pattern=name)
+        extra = ""
+        if r["reads"]:
+            r["latency_mean"] = r["latency_sum"]/r["reads"]
+            r["latency"]      = percentiles(r["hist"], hist_shift,
+                latency_min = r["latency_min"],
+                latency_max = r["latency_max"])
+            extra = "latency (ns): min {:.0f} p50 {:.0f} p90 {:.0f} p99 {:.0f} max {:.0f}".format(
+                *[v*1e9/clk_freq for v in [r["latency_min"], *r["latency"].values(), r["latency_max"]]])
+        report(r, (r["reads"] + r["writes"])*word_size, r["cycles"], extra)
+
+    # CPU path (Wishbone through L2).
+    if with_cpu:
+        for name, kwargs in {
+            "seq"    : dict(length=size//4),
+            "random" : dict(length=size//4, burst=line_size//4, random=True, mask=(window - 1) & ~(line_size - 1)),
+            }.items():
+            r = run_cpu(bus, base, **kwargs)
+            r.update(path="cpu", pattern=name)
+            report(r, 4*kwargs["length"], r["cycles"], "worst latency (ns): {:.0f}".format(r["latency"]*1e9/clk_freq))
+
+    # LiteDRAM BIST.
+    if with_bist:
+        for name, random in [("seq", False), ("random", True)]:
+            r = run_bist(bus, 0, min(size, window), random=random)
+            r.update(path="bist", pattern=name)
+            report(r, 2*min(size, window), r["write_ticks"] + r["read_ticks"], "errors: {}".format(r["errors"]))
+    return results
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    from litex import RemoteClient
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base SDRAM bandwidth/latency benchmark.")
+    parser.add_argument("--csr-csv",    default="csr.csv",                         help="SoC CSV file.")
+    parser.add_argument("--host",       default="localhost",                       help="litex_server host.")
+    parser.add_argument("--port",       default=1234,             type=int,        help="litex_server port.")
+    parser.add_argument("--size",       default=1024*1024,        type=int,        help="Bytes accessed per pattern.")
+    parser.add_argument("--window",     default=16*1024*1024,     type=int,        help="Random access window (power of 2, bytes).")
+    parser.add_argument("--bursts",     default=[1, 4, 16, 64],   type=int,        nargs="+", help="Burst lengths (DRAM words).")
+    parser.add_argument("--mixes",      default=["read", "write", "50"], choices=mixes, nargs="+", help="Read/Write mixes (number: write percentage).")
+    parser.add_argument("--line-size",  default=64,               type=int,        help="L2 cache line size (bytes).")
+    parser.add_argument("--hist-shift", default=2,                type=int,        help="Latency histogram bin width (log2, cycles).")
+    parser.add_argument("--no-cpu",     action="store_true",                       help="Skip CPU path benchmark.")
+    parser.add_argument("--no-bist",    action="store_true",                       help="Skip LiteDRAM BIST.")
+    parser.add_argument("--json",       default=None,                              help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+    try:
+        results = bench(bus,
+            size        = args.size,
+            bursts      = args.bursts,
+            mixes_names = args.mixes,
+            window      = args.window,
+            line_size   = args.line_size,
+            hist_shift  = args.hist_shift,
+            with_cpu    = not args.no_cpu,
+            with_bist   = not args.no_bist,
+        )
+    finally:
+        bus.close()
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
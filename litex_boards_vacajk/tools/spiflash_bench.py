@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# SPI Flash read benchmark through the `spiflash_bench` core (--with-spi-flash-bench), driven over
+# a LiteX bridge (litex_server over UART/Etherbone):
+#
+# - bulk : Sequential reads (firmware copy, bitstream/data streaming).
+# - xip  : Random cache-line bursts over the XIP window (cold instruction fetches).
+#
+# ./spiflash_bench.py --csr-csv csr.csv
+# ./spiflash_bench.py --csr-csv csr.csv --divisor 3 2 1 0 --json spiflash_bench.json
+
+import time
+import json
+import argparse
+
+# Benchmark ----------------------------------------------------------------------------------------
+
+def run(bus, base, length, burst=1, random=False, mask=0, timeout=10.0):
+    """Run one benchmark pass and return {cycles, latency, checksum}."""
+    bus.regs.spiflash_bench_base.write(base)
+    bus.regs.spiflash_bench_length.write(length)
+    bus.regs.spiflash_bench_burst.write(burst)
+    bus.regs.spiflash_bench_mask.write(mask)
+    bus.regs.spiflash_bench_random.write(int(random))
+    bus.regs.spiflash_bench_start.write(1)
+    start = time.time()
+    while not bus.regs.spiflash_bench_done.read():
+        if time.time() - start > timeout:
+            raise TimeoutError("SPI Flash benchmark did not complete.")
+        time.sleep(1e-3)
+    return {
+        "cycles"   : bus.regs.spiflash_bench_cycles.read(),
+        "latency"  : bus.regs.spiflash_bench_latency.read(),
+        "checksum" : bus.regs.spiflash_bench_checksum.read(),
+    }
+
+def patterns(size, xip_size, line_size=32):
+    """Benchmark patterns as {name: run() kwargs} (sizes in bytes)."""
+    return {
+        "bulk" : dict(length=size//4),
+        "xip"  : dict(length=size//4, burst=line_size//4, random=True, mask=(xip_size - 1) & ~(line_size - 1)),
+    }
+
+def bench(bus, size=64*1024, xip_size=1024*1024, line_size=32, divisors=[None]):
+    sys_clk_freq = bus.constants.config_clock_frequency
+    base         = bus.mems.spiflash.base
+    results      = []
+    reference    = {}
+    if divisors != [None]:
+        initial_divisor = bus.regs.spiflash_phy_clk_divisor.read()
+    for divisor in divisors:
+        if divisor is not None:
+            bus.regs.spiflash_phy_clk_divisor.write(divisor)
+        for name, kwargs in patterns(size, xip_size, line_size).items():
+            r = run(bus, base, **kwargs)
+            r["pattern"]   = name
+            r["divisor"]   = divisor
+            r["bandwidth"] = 4*kwargs["length"]*sys_clk_freq/r["cycles"] # In bytes/s.
+            # Checksums of the first (slowest) divisor are used as reference.
+            r["valid"]     = reference.setdefault(name, r["checksum"]) == r["checksum"]
+            results.append(r)
+            print("{:<5} div: {:>4} {:8.2f}MB/s worst latency: {:6.2f}us {}".format(
+                name,
+                "-" if divisor is None else divisor,
+                r["bandwidth"]/1e6,
+                r["latency"]/sys_clk_freq*1e6,
+                "" if r["valid"] else "(checksum mismatch)"))
+    if divisors != [None]:
+        bus.regs.spiflash_phy_clk_divisor.write(initial_divisor)
+    return results
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    from litex import RemoteClient
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base SPI Flash XIP/bulk read benchmark.")
+    parser.add_argument("--csr-csv",   default="csr.csv",              help="SoC CSV file.")
+    parser.add_argument("--host",      default="localhost",            help="litex_server host.")
+    parser.add_argument("--port",      default=1234,      type=int,    help="litex_server port.")
+    parser.add_argument("--size",      default=64*1024,   type=int,    help="Bytes read per pattern.")
+    parser.add_argument("--xip-size",  default=1024*1024, type=int,    help="XIP window size (power of 2, bytes).")
+    parser.add_argument("--line-size", default=32,        type=int,    help="CPU cache line size (bytes).")
+    parser.add_argument("--divisor",   default=None,      type=int,    nargs="+", help="SPI clk divisors to sweep (slowest first, default: current).")
+    parser.add_argument("--json",      default=None,                   help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+    try:
+        results = bench(bus,
+            size      = args.size,
+            xip_size  = args.xip_size,
+            line_size = args.line_size,
+            divisors  = args.divisor or [None],
+        )
+    finally:
+        bus.close()
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
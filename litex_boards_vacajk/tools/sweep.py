@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Build a matrix of BaseSoC configurations in parallel and collect WNS/utilization/runtime:
+#
+# ./sweep.py --sys-clk-freq 100e6 125e6 150e6 --with-sdram 0 1 --jobs 8 --output-dir build/sweep
+# ./sweep.py --matrix matrix.json --jobs 8 -- --vivado-max-threads 2
+
+import os
+import csv
+import sys
+import json
+import time
+import shlex
+import argparse
+import itertools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from litex_boards_vacajk.tools.vivado_reports import read_build_reports
+
+# Matrix -------------------------------------------------------------------------------------------
+
+# Sweep axes and their default (single) value.
+axes = {
+    "sys_clk_freq"   : [100e6],
+    "with_sdram"     : [False],
+    "with_ethernet"  : [False],
+    "with_etherbone" : [False],
+    "eth_phy"        : [0],
+    "video"          : [None], # None, "terminal", "framebuffer" or "colorbars".
+    "l2_size"        : [8192],
+}
+
+video_modes = [None, "terminal", "framebuffer", "colorbars"]
+
+def normalize_point(point):
+    """Return the canonical form of a point or None when the configuration is not valid."""
+    point = dict(point)
+    if point["video"] not in video_modes:
+        raise ValueError(f"Invalid video mode {point['video']}, expected one of {video_modes}.")
+    # Framebuffer needs SDRAM.
+    if point["video"] == "framebuffer" and not point["with_sdram"]:
+        return None
+    # Options that have no effect are dropped so equivalent points are only built once.
+    if not point["with_sdram"]:
+        point["l2_size"] = None
+    if not (point["with_ethernet"] or point["with_etherbone"]):
+        point["eth_phy"] = None
+    return point
+
+def expand_matrix(matrix):
+    """Expand {axis: [values]} into the list of distinct valid points."""
+    for name in matrix:
+        if name not in axes:
+            raise ValueError(f"Unknown sweep axis {name}, expected one of {list(axes)}.")
+    matrix = {**axes, **matrix}
+    points = []
+    for values in itertools.product(*matrix.values()):
+        point = normalize_point(dict(zip(matrix.keys(), values)))
+        if point is not None and point not in points:
+            points.append(point)
+    return points
+
+def point_name(point):
+    name = [f"sys{point['sys_clk_freq']/1e6:g}MHz"]
+    if point["with_sdram"]:
+        name.append(f"sdram-l2_{point['l2_size']}")
+    if point["with_ethernet"]:
+        name.append(f"eth{point['eth_phy']}")
+    if point["with_etherbone"]:
+        name.append(f"etherbone{point['eth_phy']}")
+    if point["video"] is not None:
+        name.append(f"video_{point['video']}")
+    return "-".join(name)
+
+def point_args(point):
+    """Target command line arguments of a point."""
+    args = ["--sys-clk-freq", str(point["sys_clk_freq"])]
+    if point["with_sdram"]:
+        args += ["--with-sdram", "--l2-size", str(int(point["l2_size"]))]
+    if point["with_ethernet"]:
+        args += ["--with-ethernet"]
+    if point["with_etherbone"]:
+        args += ["--with-etherbone"]
+    if point["eth_phy"] is not None:
+        args += ["--eth-phy", str(point["eth_phy"])]
+    if point["video"] is not None:
+        args += [f"--with-video-{point['video']}"]
+    return args
+
+# Run ----------------------------------------------------------------------------------------------
+
+default_target_cmd = [sys.executable, "-m", "litex_boards_vacajk.targets.bochen_kintex7_base"]
+
+def run_point(point, output_dir, target_cmd=default_target_cmd, build_name="bochen_kintex7_base", extra_args=[]):
+    name      = point_name(point)
+    build_dir = os.path.abspath(os.path.join(output_dir, name))
+    os.makedirs(build_dir, exist_ok=True)
+    cmd = list(target_cmd) + ["--build", "--output-dir", build_dir] + point_args(point) + list(extra_args)
+
+    start = time.time()
+    with open(os.path.join(build_dir, "sweep.log"), "w") as log:
+        log.write(" ".join(shlex.quote(c) for c in cmd) + "\n")
+        log.flush()
+        returncode = subprocess.call(cmd, stdout=log, stderr=subprocess.STDOUT)
+    runtime = time.time() - start
+
+    reports = read_build_reports(os.path.join(build_dir, "gateware"), build_name)
+    result  = {
+        "name"       : name,
+        "point"      : point,
+        "returncode" : returncode,
+        "runtime"    : runtime,
+        "timing"     : reports["timing"],
+        "utilization": reports["utilization"],
+    }
+    return result
+
+def run_sweep(points, output_dir, jobs=None, **kwargs):
+    """Run all points with at most `jobs` concurrent builds; results are returned in points order."""
+    jobs = jobs or os.cpu_count()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_point, point, output_dir, **kwargs) for point in points]
+        results = []
+        for point, future in zip(points, futures):
+            result = future.result()
+            status = "ok" if result["returncode"] == 0 else f"failed ({result['returncode']})"
+            wns    = (result["timing"] or {}).get("wns")
+            print(f"{result['name']:<60} {status:<12} WNS: {wns} ns, {result['runtime']:.1f}s")
+            results.append(result)
+    return results
+
+# Results ------------------------------------------------------------------------------------------
+
+def flatten_result(result):
+    r = {"name": result["name"], "returncode": result["returncode"], "runtime": round(result["runtime"], 3)}
+    r.update(result["point"])
+    for group in ["timing", "utilization"]:
+        for k, v in (result[group] or {}).items():
+            r[k] = v
+    return r
+
+def fmax_table(results):
+    """Highest sys_clk_freq meeting timing (WNS >= 0) for each configuration."""
+    fmax = {}
+    for result in results:
+        config = {k: v for k, v in result["point"].items() if k != "sys_clk_freq"}
+        key    = json.dumps(config, sort_keys=True)
+        entry  = fmax.setdefault(key, {"config": config, "fmax": None})
+        timing = result["timing"] or {}
+        if result["returncode"] == 0 and timing.get("wns") is not None and timing["wns"] >= 0:
+            entry["fmax"] = max(entry["fmax"] or 0, result["point"]["sys_clk_freq"])
+    return list(fmax.values())
+
+def write_results(results, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "sweep.json"), "w") as f:
+        json.dump({"results": results, "fmax": fmax_table(results)}, f, indent=4)
+    rows    = [flatten_result(r) for r in results]
+    columns = []
+    for row in rows:
+        columns += [k for k in row.keys() if k not in columns]
+    with open(os.path.join(output_dir, "sweep.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def _bool(s):
+    return s.lower() in ["1", "true", "yes", "y", "on"]
+
+def _video(s):
+    return None if s.lower() in ["none", "off", ""] else s
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base configuration/fmax sweep.")
+    parser.add_argument("--matrix",         default=None,                     help="JSON file with {axis: [values]} (overridden by axis options).")
+    parser.add_argument("--sys-clk-freq",   nargs="+", type=float,            help="System clock frequencies.")
+    parser.add_argument("--with-sdram",     nargs="+", type=_bool,            help="SDRAM enable values (0/1).")
+    parser.add_argument("--with-ethernet",  nargs="+", type=_bool,            help="Ethernet enable values (0/1).")
+    parser.add_argument("--with-etherbone", nargs="+", type=_bool,            help="Etherbone enable values (0/1).")
+    parser.add_argument("--eth-phy",        nargs="+", type=int,              help="Ethernet PHY indexes.")
+    parser.add_argument("--video",          nargs="+", type=_video,           help="Video modes (none, terminal, framebuffer, colorbars).")
+    parser.add_argument("--l2-size",        nargs="+", type=int,              help="L2 cache sizes.")
+    parser.add_argument("--jobs",           default=None, type=int,           help="Maximum concurrent builds (default: CPU count).")
+    parser.add_argument("--output-dir",     default="build/sweep",            help="Sweep output directory.")
+    parser.add_argument("--build-name",     default="bochen_kintex7_base",    help="Build name (for reports lookup).")
+    parser.add_argument("--target-cmd",     default=None,                     help="Target command (default: bochen_kintex7_base target).")
+    parser.add_argument("--dry-run",        action="store_true",              help="Only list the points.")
+    parser.add_argument("extra_args",       nargs="*",                        help="Extra target arguments (after --).")
+    args = parser.parse_args()
+
+    matrix = {}
+    if args.matrix is not None:
+        with open(args.matrix, "r") as f:
+            matrix.update(json.load(f))
+    for name in axes.keys():
+        values = getattr(args, name)
+        if values is not None:
+            matrix[name] = values
+
+    points = expand_matrix(matrix)
+    if args.dry_run:
+        for point in points:
+            print(f"{point_name(point):<60} {' '.join(point_args(point))}")
+        return
+
+    target_cmd = default_target_cmd if args.target_cmd is None else shlex.split(args.target_cmd)
+    results = run_sweep(points, args.output_dir,
+        jobs       = args.jobs,
+        target_cmd = target_cmd,
+        build_name = args.build_name,
+        extra_args = args.extra_args,
+    )
+    write_results(results, args.output_dir)
+    for entry in fmax_table(results):
+        fmax = "-" if entry["fmax"] is None else f"{entry['fmax']/1e6:g}MHz"
+        print(f"fmax {fmax:>10}: {entry['config']}")
+
+if __name__ == "__main__":
+    main()
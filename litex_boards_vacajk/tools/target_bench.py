@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Measure import time of the bochen_kintex7_base target module and BaseSoC construction time for
+# each option set. Every sample runs in a fresh interpreter so lazily imported subsystems are
+# accounted to the option set that needs them.
+#
+# ./target_bench.py --repeat 5
+# ./target_bench.py --option-set minimal --option-set sdram --json bench.json
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Option Sets --------------------------------------------------------------------------------------
+
+option_sets = {
+    "import-only"     : None,
+    "minimal"         : dict(with_led_chaser=False),
+    "default"         : dict(),
+    "sdram"           : dict(with_sdram=True),
+    "spi-flash"       : dict(with_spi_flash=True),
+    "sdcard"          : dict(with_sdcard=True),
+    "ethernet"        : dict(with_ethernet=True),
+    "etherbone"       : dict(with_etherbone=True),
+    "video-terminal"  : dict(with_video_terminal=True),
+    "full"            : dict(with_sdram=True, with_spi_flash=True, with_sdcard=True,
+                             with_ethernet=True, with_video_framebuffer=True),
+}
+
+# Sample -------------------------------------------------------------------------------------------
+
+_sample_script = """
+import sys, json, time, warnings
+warnings.simplefilter("ignore")
+kwargs = json.loads(sys.argv[1])
+start  = time.perf_counter()
+from litex_boards_vacajk.targets import bochen_kintex7_base
+import_time = time.perf_counter() - start
+construct_time = None
+if kwargs is not None:
+    start = time.perf_counter()
+    bochen_kintex7_base.BaseSoC(**kwargs)
+    construct_time = time.perf_counter() - start
+print(json.dumps({"import": import_time, "construct": construct_time}))
+"""
+
+def sample(kwargs):
+    r = subprocess.run([sys.executable, "-c", _sample_script, json.dumps(kwargs)],
+        stdout = subprocess.PIPE,
+        stderr = subprocess.PIPE,
+        text   = True,
+    )
+    if r.returncode != 0:
+        raise RuntimeError(r.stderr.strip().splitlines()[-1] if r.stderr.strip() else "Sample failed.")
+    return json.loads(r.stdout.strip().splitlines()[-1])
+
+def bench(names, repeat):
+    results = {}
+    for name in names:
+        try:
+            samples = [sample(option_sets[name]) for _ in range(repeat)]
+        except RuntimeError as e:
+            results[name] = {"error": str(e)}
+            print(f"{name:<16} failed: {e}")
+            continue
+        r = {}
+        for phase in ["import", "construct"]:
+            values = [s[phase] for s in samples if s[phase] is not None]
+            if values:
+                r[phase] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+        results[name] = r
+        line = f"{name:<16} import: {r['import']['median']*1e3:8.1f}ms"
+        if "construct" in r:
+            line += f"  construct: {r['construct']['median']*1e3:8.1f}ms"
+        print(line)
+    return results
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base import/construction benchmark.")
+    parser.add_argument("--option-set", action="append", choices=list(option_sets.keys()), help="Option set(s) to benchmark (default: all).")
+    parser.add_argument("--repeat",     default=3, type=int,                              help="Samples per option set (median is reported).")
+    parser.add_argument("--json",       default=None,                                     help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    results = bench(args.option_set or list(option_sets.keys()), args.repeat)
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Host receiver for the hardware DDR3 to UDP streamer (--with-udp-streamer): optionally triggers a
+# run over a LiteX bridge (litex_server over UART/Etherbone), receives the UDP stream, reports the
+# throughput and optionally checks the received data against a reference file.
+#
+# ./udp_receiver.py --length 0x100000 --output dump.bin
+# ./udp_receiver.py --csr-csv csr.csv --base 0x100000 --length 0x100000 --expected dump_ref.bin
+
+import time
+import socket
+import argparse
+
+# Receiver -----------------------------------------------------------------------------------------
+
+def trigger(bus, base, length, packet_size=None):
+    """Start a streamer run on `length` bytes at DRAM offset `base` (main_ram relative)."""
+    bus.regs.udp_streamer_base.write(base)
+    bus.regs.udp_streamer_length.write(length)
+    if packet_size is not None:
+        bus.regs.udp_streamer_packet_size.write(packet_size)
+    bus.regs.udp_streamer_start.write(1)
+
+def receive(sock, length, timeout=5.0, start=None):
+    """Receive up to `length` bytes and return {data, packets, bandwidth}."""
+    sock.settimeout(timeout)
+    data    = bytearray()
+    packets = 0
+    first   = None
+    last    = None
+    while len(data) < length:
+        try:
+            payload = sock.recv(65536)
+        except socket.timeout:
+            break
+        last  = time.perf_counter()
+        first = first or last
+        data += payload
+        packets += 1
+    # Bandwidth is measured from the first received packet (or the trigger) to the last one.
+    first   = start or first
+    elapsed = (last - first) if (first is not None and last is not None) else 0
+    return {
+        "data"      : bytes(data),
+        "packets"   : packets,
+        "bandwidth" : len(data)/elapsed if elapsed > 0 else 0, # In bytes/s.
+    }
+
+def open_socket(ip="0.0.0.0", port=5000, rcvbuf=16*1024*1024):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    sock.bind((ip, port))
+    return sock
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base DDR3 to UDP streamer receiver.")
+    parser.add_argument("--ip",          default="0.0.0.0",               help="Local IP address to bind to.")
+    parser.add_argument("--port",        default=5000,      type=int,     help="Local UDP port.")
+    parser.add_argument("--length",      default=0x100000,  type=lambda x: int(x, 0), help="Bytes to receive.")
+    parser.add_argument("--timeout",     default=5.0,       type=float,   help="Receive timeout (s).")
+    parser.add_argument("--output",      default=None,                    help="Write received data to file.")
+    parser.add_argument("--expected",    default=None,                    help="Compare received data to file.")
+    parser.add_argument("--csr-csv",     default=None,                    help="SoC CSV file (trigger the streamer through litex_server).")
+    parser.add_argument("--server-host", default="localhost",             help="litex_server host.")
+    parser.add_argument("--server-port", default=1234,      type=int,     help="litex_server port.")
+    parser.add_argument("--base",        default=0,         type=lambda x: int(x, 0), help="DRAM offset to stream from (main_ram relative).")
+    parser.add_argument("--packet-size", default=None,      type=int,     help="UDP payload size (bytes).")
+    args = parser.parse_args()
+
+    sock  = open_socket(args.ip, args.port)
+    start = None
+    if args.csr_csv is not None:
+        from litex import RemoteClient
+        bus = RemoteClient(host=args.server_host, port=args.server_port, csr_csv=args.csr_csv)
+        bus.open()
+        start = time.perf_counter()
+        trigger(bus, args.base, args.length, args.packet_size)
+    r = receive(sock, args.length, timeout=args.timeout, start=start)
+    if args.csr_csv is not None:
+        print("Streamer: {} packets in {} cycles.".format(
+            bus.regs.udp_streamer_packets.read(),
+            bus.regs.udp_streamer_cycles.read()))
+        bus.close()
+    sock.close()
+
+    print("Received {}/{} bytes in {} packets, {:.2f}MB/s.".format(
+        len(r["data"]), args.length, r["packets"], r["bandwidth"]/1e6))
+    if args.output is not None:
+        with open(args.output, "wb") as f:
+            f.write(r["data"])
+    if args.expected is not None:
+        with open(args.expected, "rb") as f:
+            expected = f.read(args.length)
+        if r["data"] != expected:
+            mismatch = next((i for i, (a, b) in enumerate(zip(r["data"], expected)) if a != b), min(len(r["data"]), len(expected)))
+            raise SystemExit("Data mismatch at byte 0x{:x}.".format(mismatch))
+        print("Data OK.")
+
+if __name__ == "__main__":
+    main()
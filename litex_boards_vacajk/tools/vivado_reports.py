@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+
+# Vivado report parsers (timing summary, utilization, log) and timing/utilization history of builds:
+#
+# ./vivado_reports.py build/bochen_kintex7_base/gateware --history timing.jsonl --limits limits.json
+# ./vivado_reports.py --show timing.jsonl
+
+import os
+import re
+import json
+import time
+import argparse
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _to_number(s):
+    s = s.strip()
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+def _sections(text):
+    """Split a Vivado report into {title: body} using its "| Title" section headers."""
+    sections = {}
+    title    = None
+    lines    = []
+    for line in text.splitlines():
+        m = re.match(r"^\| ([^-\s].*?)\s*$", line)
+        if m and not line.rstrip().endswith("|"):
+            if title is not None:
+                sections[title] = "\n".join(lines)
+            title = m.group(1)
+            lines = []
+        elif title is not None:
+            lines.append(line)
+    if title is not None:
+        sections[title] = "\n".join(lines)
+    return sections
+
+# Timing Summary -----------------------------------------------------------------------------------
+
+_timing_columns = {
+    "WNS(ns)"                : "wns",
+    "TNS(ns)"                : "tns",
+    "TNS Failing Endpoints"  : "tns_failing_endpoints",
+    "TNS Total Endpoints"    : "tns_total_endpoints",
+    "WHS(ns)"                : "whs",
+    "THS(ns)"                : "ths",
+    "THS Failing Endpoints"  : "ths_failing_endpoints",
+    "THS Total Endpoints"    : "ths_total_endpoints",
+    "WPWS(ns)"               : "wpws",
+    "TPWS(ns)"               : "tpws",
+    "TPWS Failing Endpoints" : "tpws_failing_endpoints",
+    "TPWS Total Endpoints"   : "tpws_total_endpoints",
+}
+
+def _parse_timing_table(body, names=0):
+    """Parse a (WNS, TNS, ...) table whose rows start with `names` name columns (clock, path group);
+    returns a list of ([names], {metric: value})."""
+    lines = body.splitlines()
+    for i, line in enumerate(lines):
+        if "WNS(ns)" in line:
+            header = line
+            break
+    else:
+        return []
+    # Metric columns are right-aligned under their header: use header spans to split rows (cells
+    # are empty when not applicable, e.g. no setup paths on a clock).
+    spans = []
+    for name in _timing_columns.keys():
+        start = header.find(name, spans[-1][2] if spans else 0)
+        if start >= 0:
+            spans.append((name, start, start + len(name)))
+    rows = []
+    for line in lines[i + 2:]:
+        if not line.strip():
+            if rows:
+                break
+            continue
+        m = re.match(r"^\s*" + r"\s+".join([r"(\S+)"]*names), line)
+        values = {v: None for v in _timing_columns.values()}
+        prev   = m.end()
+        for name, start, end in spans:
+            values[_timing_columns[name]] = _to_number(line[prev:end]) if len(line) > prev else None
+            prev = end
+        rows.append((list(m.groups()), values))
+    return rows
+
+def parse_timing_summary(text):
+    """Parse a `report_timing_summary` report.
+
+    Returns a dict with the design-level metrics (wns, tns, whs, ths, ... in ns) and "met".
+    """
+    sections = _sections(text)
+    body     = sections.get("Design Timing Summary", text)
+    rows     = _parse_timing_table(body)
+    r = dict(rows[0][1]) if rows else {v: None for v in _timing_columns.values()}
+    r["met"] = "All user specified timing constraints are met." in text
+    return r
+
+def parse_clock_summary(text):
+    """Parse the "Clock Summary" of a `report_timing_summary` report into {clock: {"period" (ns),
+    "frequency" (MHz), "parent"}}, generated clocks being indented under their master clock."""
+    r       = {}
+    parents = []
+    body    = _sections(text).get("Clock Summary", "")
+    for line in body.splitlines():
+        m = re.match(r"^( *)(\S+)\s+\{[\d. ]+\}\s+([\d.]+)\s+([\d.]+)", line)
+        if m is None:
+            continue
+        level   = len(m.group(1))//2
+        parents = parents[:level] + [m.group(2)]
+        r[m.group(2)] = {
+            "period"    : float(m.group(3)),
+            "frequency" : float(m.group(4)),
+            "parent"    : parents[-2] if level else None,
+        }
+    return r
+
+def parse_clock_timing(text):
+    """Parse the per-clock tables of a `report_timing_summary` report.
+
+    Returns {"clocks": {clock: metrics}} (Intra Clock Table) and {"interactions": [{path_group, from,
+    to, **metrics}]} (Inter Clock Table and Other Path Groups Table, e.g. **async_default**).
+    """
+    sections = _sections(text)
+    r = {"clocks": {}, "interactions": []}
+    for (clock,), values in _parse_timing_table(sections.get("Intra Clock Table", ""), names=1):
+        r["clocks"][clock] = values
+    for (src, dst), values in _parse_timing_table(sections.get("Inter Clock Table", ""), names=2):
+        r["interactions"].append({"path_group": None, "from": src, "to": dst, **values})
+    for (group, src, dst), values in _parse_timing_table(sections.get("Other Path Groups Table", ""), names=3):
+        r["interactions"].append({"path_group": group, "from": src, "to": dst, **values})
+    return r
+
+def _ns(s):
+    return None if s is None else float(s)
+
+def parse_timing_paths(text):
+    """Parse the detailed paths of a `report_timing_summary` report (-max_paths per path group).
+
+    Returns a list of {slack, met, source, destination, source_clock, destination_clock, path_group,
+    path_type ("Setup"/"Hold"), requirement, data_path_delay, logic_delay, route_delay (ns),
+    logic_levels}.
+    """
+    r = []
+    for block in re.split(r"^(?=Slack)", text, flags=re.MULTILINE)[1:]:
+        m = re.match(r"Slack(?: \((\w+)\))?\s*:\s*(-?[\d.]+|inf)ns", block)
+        if m is None:
+            continue
+        def field(name, pattern=r"(\S+)"):
+            m = re.search(r"^  " + name + r":\s+" + pattern, block, re.MULTILINE)
+            return m.groups() if m else (None,)*re.compile(pattern).groups
+        source,      source_clock      = field("Source",      r"(\S+)\s+\(.*?clocked by (\S+)")
+        destination, destination_clock = field("Destination", r"(\S+)\s+\(.*?clocked by (\S+)")
+        if source is None:
+            source,      = field("Source")
+        if destination is None:
+            destination, = field("Destination")
+        data_path_delay, logic_delay, route_delay = field("Data Path Delay",
+            r"(-?[\d.]+)ns\s+\(logic (-?[\d.]+)ns.*?route (-?[\d.]+)ns")
+        logic_levels, = field("Logic Levels", r"(\d+)")
+        r.append({
+            "slack"             : float(m.group(2)),
+            "met"               : m.group(1) != "VIOLATED",
+            "source"            : source,
+            "destination"       : destination,
+            "source_clock"      : source_clock,
+            "destination_clock" : destination_clock,
+            "path_group"        : field("Path Group")[0],
+            "path_type"         : field("Path Type")[0],
+            "requirement"       : _ns(field("Requirement", r"(-?[\d.]+)ns")[0]),
+            "data_path_delay"   : _ns(data_path_delay),
+            "logic_delay"       : _ns(logic_delay),
+            "route_delay"       : _ns(route_delay),
+            "logic_levels"      : None if logic_levels is None else int(logic_levels),
+        })
+    return r
+
+# Utilization --------------------------------------------------------------------------------------
+
+def parse_utilization(text):
+    """Parse a `report_utilization` report into {site_type: {"used", "available", "util"}}."""
+    r      = {}
+    header = None
+    for line in text.splitlines():
+        if not line.startswith("|"):
+            continue
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        if cells[0] == "Site Type":
+            header = cells
+            continue
+        if header is None or len(cells) != len(header):
+            continue
+        row = dict(zip(header, cells))
+        r.setdefault(row["Site Type"], {
+            "used"      : _to_number(row.get("Used", "")),
+            "available" : _to_number(row.get("Available", "")),
+            "util"      : _to_number(row.get("Util%", "").lstrip("<")),
+        })
+    return r
+
+_utilization_summary = {
+    "lut"  : ["Slice LUTs", "Slice LUTs*", "CLB LUTs", "CLB LUTs*"],
+    "ff"   : ["Slice Registers", "CLB Registers"],
+    "bram" : ["Block RAM Tile"],
+    "dsp"  : ["DSPs"],
+    "mmcm" : ["MMCME2_ADV", "MMCME3_ADV", "MMCME4_ADV"],
+    "pll"  : ["PLLE2_ADV", "PLLE3_ADV", "PLLE4_ADV"],
+}
+
+def utilization_summary(utilization):
+    """Reduce a parsed utilization report to LUT/FF/BRAM/DSP/MMCM/PLL usage."""
+    r = {}
+    for name, site_types in _utilization_summary.items():
+        for site_type in site_types:
+            if site_type in utilization:
+                r[name]           = utilization[site_type]["used"]
+                r[name + "_util"] = utilization[site_type]["util"]
+                break
+        else:
+            r[name]           = None
+            r[name + "_util"] = None
+    return r
+
+# Vivado Log ---------------------------------------------------------------------------------------
+
+# Implementation stage of the Vivado commands (others: None).
+_log_stages = {
+    "synth_design"    : "synthesis",
+    "opt_design"      : "placement",
+    "place_design"    : "placement",
+    "phys_opt_design" : "placement",
+    "route_design"    : "routing",
+    "write_bitstream" : "bitstream",
+}
+
+def _to_seconds(s):
+    seconds = 0
+    for part in s.split(":"):
+        seconds = seconds*60 + int(part)
+    return seconds
+
+def parse_vivado_log(text):
+    """Parse the "<command>: Time (s): cpu = ... ; elapsed = ... . Memory (MB): peak = ..." lines
+    of a Vivado log into a list of {command, stage, cpu, elapsed (s), peak_memory (MB)}."""
+    r = []
+    for m in re.finditer(r"^(\w+): Time \(s\): cpu = ([\d:]+) ; elapsed = ([\d:]+) \. Memory \(MB\): peak = ([\d.]+)", text, re.MULTILINE):
+        r.append({
+            "command"     : m.group(1),
+            "stage"       : _log_stages.get(m.group(1)),
+            "cpu"         : _to_seconds(m.group(2)),
+            "elapsed"     : _to_seconds(m.group(3)),
+            "peak_memory" : float(m.group(4)),
+        })
+    return r
+
+# Build Reports ------------------------------------------------------------------------------------
+
+def read_build_reports(gateware_dir, build_name):
+    """Collect timing/utilization of a LiteX Vivado build directory (None when not available)."""
+    r = {"timing": None, "utilization": None}
+    timing      = os.path.join(gateware_dir, f"{build_name}_timing.rpt")
+    utilization = os.path.join(gateware_dir, f"{build_name}_utilization_place.rpt")
+    if os.path.exists(timing):
+        with open(timing, "r", errors="replace") as f:
+            r["timing"] = parse_timing_summary(f.read())
+    if os.path.exists(utilization):
+        with open(utilization, "r", errors="replace") as f:
+            r["utilization"] = utilization_summary(parse_utilization(f.read()))
+    return r
+
+def _worst(*values):
+    values = [v for v in values if v is not None]
+    return min(values) if values else None
+
+def read_timing_reports(gateware_dir, build_name, clocks=None, max_paths=10):
+    """Collect the detailed timing of a LiteX Vivado build directory: design summary, per-clock
+    metrics, clock interactions, worst failing paths (at most `max_paths`) and utilization.
+
+    Besides their own paths metrics, clocks get the worst setup/hold slacks of the interactions they
+    are part of (inter_wns/inter_whs), e.g. the input paths of the `eth_clocks:rx` constraint.
+
+    Vivado clocks are renamed to their LiteX clock domains/constraints with `clocks` ({vivado_name:
+    name}, default: `<build_name>_clocks.json` written by the target, when available).
+    """
+    r = read_build_reports(gateware_dir, build_name)
+    r.update({"clocks": {}, "interactions": [], "paths": []})
+    if clocks is None:
+        clocks   = {}
+        filename = os.path.join(gateware_dir, f"{build_name}_clocks.json")
+        if os.path.exists(filename):
+            with open(filename, "r") as f:
+                clocks = json.load(f)
+    rename = lambda name: clocks.get(name, name)
+    timing = os.path.join(gateware_dir, f"{build_name}_timing.rpt")
+    if os.path.exists(timing):
+        with open(timing, "r", errors="replace") as f:
+            text = f.read()
+        summary = parse_clock_summary(text)
+        timing  = parse_clock_timing(text)
+        for name, values in timing["clocks"].items():
+            r["clocks"][rename(name)] = {"vivado_name": name, **summary.get(name, {}), **values}
+        for interaction in timing["interactions"]:
+            interaction.update({"from": rename(interaction["from"]), "to": rename(interaction["to"])})
+            r["interactions"].append(interaction)
+            for name in {interaction["from"], interaction["to"]}:
+                clock = r["clocks"].setdefault(name, {v: None for v in _timing_columns.values()})
+                for metric in ["wns", "whs"]:
+                    clock["inter_" + metric] = _worst(clock.get("inter_" + metric), interaction[metric])
+        paths = [p for p in parse_timing_paths(text) if not p["met"]]
+        for path in sorted(paths, key=lambda p: p["slack"])[:max_paths]:
+            for k in ["source_clock", "destination_clock", "path_group"]:
+                path[k] = rename(path[k])
+            r["paths"].append(path)
+    return r
+
+def print_timing_reports(reports):
+    print("{:<28} {:>10} {:>9} {:>9} {:>9} {:>9} {:>9} {:>9}".format("clock", "freq(MHz)",
+        "WNS(ns)", "TNS(ns)", "WHS(ns)", "THS(ns)", "inter WNS", "inter WHS"))
+    fmt = lambda v: "-" if v is None else f"{v:.3f}"
+    for name, clock in reports["clocks"].items():
+        print("{:<28} {:>10} {:>9} {:>9} {:>9} {:>9} {:>9} {:>9}".format(name, fmt(clock.get("frequency")),
+            fmt(clock["wns"]), fmt(clock["tns"]), fmt(clock["whs"]), fmt(clock["ths"]),
+            fmt(clock.get("inter_wns")), fmt(clock.get("inter_whs"))))
+    for interaction in reports["interactions"]:
+        if min(interaction["wns"] or 0, interaction["whs"] or 0) < 0:
+            print("{:<28} {:>10} {:>9} {:>9} {:>9} {:>9}".format(
+                f"{interaction['from']} -> {interaction['to']}", interaction["path_group"] or "",
+                fmt(interaction["wns"]), fmt(interaction["tns"]), fmt(interaction["whs"]), fmt(interaction["ths"])))
+    if reports["utilization"] is not None:
+        print(" ".join(f"{k.upper()}: {reports['utilization'][k]} ({reports['utilization'][k + '_util']}%)"
+            for k in _utilization_summary))
+    for path in reports["paths"]:
+        print(f"{path['slack']:7.3f}ns {path['path_type']:<5} {path['source_clock']} -> {path['destination_clock']}, "
+            f"{path['logic_levels']} levels: {path['source']} -> {path['destination']}")
+
+# History ------------------------------------------------------------------------------------------
+
+# WNS/WHS minimum (ns) and WNS decrease (ns) per clock, utilization maximum (%) and usage increase
+# (% of the previous build) per resource. Each limit is either a value or {clock/resource: value}
+# (others using the default), None disabling the check.
+default_limits = {
+    "wns"                  : 0.0,
+    "whs"                  : 0.0,
+    "wns_drop"             : 0.2,
+    "utilization"          : 80.0,
+    "utilization_increase" : 10.0,
+}
+
+def history_entry(reports, **meta):
+    """Compact history entry: design/per-clock WNS/TNS/WHS/THS, utilization and failing paths.
+    Clocks WNS/WHS are the worst of their own and interactions paths, clocks without timed paths
+    (MMCM feedbacks, pulse width only) are not recorded."""
+    metrics = ["wns", "tns", "whs", "ths"]
+    clocks  = {}
+    for name, clock in reports["clocks"].items():
+        entry = {k: clock[k] for k in metrics}
+        entry["wns"] = _worst(clock["wns"], clock.get("inter_wns"))
+        entry["whs"] = _worst(clock["whs"], clock.get("inter_whs"))
+        if any(v is not None for v in entry.values()):
+            clocks[name] = entry
+    return {
+        "date"          : time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "meta"          : meta,
+        "timing"        : {k: (reports["timing"] or {}).get(k) for k in metrics + ["met"]},
+        "clocks"        : clocks,
+        "utilization"   : reports["utilization"],
+        "failing_paths" : len(reports["paths"]),
+        "worst_path"    : reports["paths"][0] if reports["paths"] else None,
+    }
+
+def read_history(filename):
+    if not os.path.exists(filename):
+        return []
+    with open(filename) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def append_history(filename, entry):
+    with open(filename, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+def _limit(limits, name, key):
+    limit = limits.get(name)
+    return limit.get(key, default_limits[name]) if isinstance(limit, dict) else limit
+
+def check_limits(entry, previous=None, limits=default_limits):
+    """Warnings for the clocks/resources of history `entry` past `limits` (absolute, and relative to
+    the `previous` entry)."""
+    limits   = {**default_limits, **limits}
+    warnings = []
+    for name, clock in entry["clocks"].items():
+        for metric in ["wns", "whs"]:
+            limit = _limit(limits, metric, name)
+            if None not in [limit, clock[metric]] and clock[metric] < limit:
+                warnings.append(f"{name}: {metric.upper()} {clock[metric]:.3f}ns < {limit:.3f}ns.")
+        last  = (previous or {"clocks": {}})["clocks"].get(name, {}).get("wns")
+        limit = _limit(limits, "wns_drop", name)
+        if None not in [limit, last, clock["wns"]] and last - clock["wns"] > limit:
+            warnings.append(f"{name}: WNS {last:.3f}ns -> {clock['wns']:.3f}ns (> {limit:.3f}ns drop).")
+    utilization = entry["utilization"] or {}
+    for resource in _utilization_summary:
+        used, util = utilization.get(resource), utilization.get(resource + "_util")
+        limit = _limit(limits, "utilization", resource)
+        if None not in [limit, util] and util > limit:
+            warnings.append(f"{resource.upper()}: {util}% utilization > {limit}%.")
+        last  = ((previous or {}).get("utilization") or {}).get(resource)
+        limit = _limit(limits, "utilization_increase", resource)
+        if None not in [limit, last, used] and last and (used - last)/last*100 > limit:
+            warnings.append(f"{resource.upper()}: {last} -> {used} (> {limit}% increase).")
+    return warnings
+
+def history_table(history, last=10):
+    history = history[-last:]
+    clocks  = []
+    for entry in history:
+        clocks += [name for name in entry["clocks"] if name not in clocks]
+    fmt = lambda v: "-" if v is None else f"{v:.3f}"
+    print("{:<24} ".format("WNS(ns)") + " ".join("{:>11}".format(entry["date"][5:16].replace("T", " ")) for entry in history))
+    for name in clocks:
+        print("{:<24} ".format(name[-24:]) + " ".join(
+            "{:>11}".format(fmt(entry["clocks"].get(name, {}).get("wns"))) for entry in history))
+    for resource in _utilization_summary:
+        print("{:<24} ".format(resource.upper()) + " ".join(
+            "{:>11}".format(str((entry["utilization"] or {}).get(resource, "-"))) for entry in history))
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Bochen Kintex7 Base Vivado timing/utilization reports.")
+    parser.add_argument("gateware_dir", nargs="?", default=None,          help="Build gateware directory.")
+    parser.add_argument("--build-name", default="bochen_kintex7_base",    help="Build name.")
+    parser.add_argument("--max-paths",  default=10,   type=int,           help="Maximum failing paths to report.")
+    parser.add_argument("--history",    default=None,                     help="Append results to JSON Lines history file (and check limits).")
+    parser.add_argument("--limits",     default=None,                     help="JSON file with limits (overrides defaults).")
+    parser.add_argument("--label",      default=None,                     help="Build label (stored in history).")
+    parser.add_argument("--show",       default=None,                     help="Show WNS/utilization history of a history file.")
+    parser.add_argument("--last",       default=10,   type=int,           help="Number of builds to show.")
+    parser.add_argument("--json",       default=None,                     help="Write results to JSON file.")
+    args = parser.parse_args()
+
+    if args.show is not None:
+        history_table(read_history(args.show), last=args.last)
+        return
+    if args.gateware_dir is None:
+        parser.error("gateware_dir is required.")
+
+    reports = read_timing_reports(args.gateware_dir, args.build_name, max_paths=args.max_paths)
+    if reports["timing"] is None:
+        parser.error(f"No timing report in {args.gateware_dir}.")
+    print_timing_reports(reports)
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=4)
+    if args.history is not None:
+        limits = {}
+        if args.limits is not None:
+            with open(args.limits, "r") as f:
+                limits = json.load(f)
+        history = read_history(args.history)
+        entry   = history_entry(reports, label=args.label)
+        for warning in check_limits(entry, history[-1] if history else None, limits):
+            print(f"WARNING: {warning}")
+        append_history(args.history, entry)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#
+# This file is part of LiteX-Boards.
+
+# Vivado results build cache: key normalization, store/restore and eviction, with a fake
+# builder/toolchain.
+
+import os
+import time
+import tempfile
+import unittest
+
+from litex_boards_vacajk.tools.build_cache import BuildCache
+
+# Helpers ------------------------------------------------------------------------------------------
+
+verilog = """// -----------------------------------------------------------------------------
+// Auto-Generated by:        __   _ __      _  __
+// Date: {date}
+// -----------------------------------------------------------------------------
+module top(input clk, output led);
+assign led = {led};
+endmodule
+"""
+
+tcl = """# Auto-Generated by LiteX on {date}
+read_verilog {{{path}/top.v}}
+synth_design -directive default -top top -part xc7k325tffg900-2
+"""
+
+def write(filename, data):
+    with open(filename, "w") as f:
+        f.write(data)
+
+def write_sources(gateware_dir, date="2024-01-01", path="/home/a/build", led="clk"):
+    os.makedirs(gateware_dir, exist_ok=True)
+    write(os.path.join(gateware_dir, "top.v"),   verilog.format(date=date, led=led))
+    write(os.path.join(gateware_dir, "top.tcl"), tcl.format(date=date, path=path))
+    write(os.path.join(gateware_dir, "top.xdc"), "# Date: {}\nset_property PACKAGE_PIN G22 [get_ports clk]\n".format(date))
+
+class FakeToolchain:
+    def __init__(self):
+        self.runs = 0
+
+    def run_script(self, script):
+        self.runs += 1
+        write("top.bit", f"bitstream{self.runs}")
+        write("top_timing.rpt", "WNS 0.100")
+
+class FakePlatform:
+    device  = "xc7k325tffg900-2"
+    sources = []
+    def __init__(self):
+        self.toolchain = FakeToolchain()
+
+class FakeSoC:
+    def __init__(self):
+        self.platform = FakePlatform()
+
+    def get_build_name(self):
+        return "top"
+
+class FakeBuilder:
+    def __init__(self, gateware_dir, **sources):
+        self.soc          = FakeSoC()
+        self.gateware_dir = gateware_dir
+        self.sources      = sources
+
+    def build(self, run=True, **kwargs):
+        assert not run
+        write_sources(self.gateware_dir, **self.sources)
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestBuildCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache     = BuildCache(os.path.join(self.directory.name, "cache"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def gateware(self, name, **kwargs):
+        gateware_dir = os.path.join(self.directory.name, name)
+        write_sources(gateware_dir, **kwargs)
+        return gateware_dir
+
+    def test_key(self):
+        key = self.cache.key(self.gateware("a"))
+        # Dates, comments and absolute source paths are not part of the key.
+        self.assertEqual(self.cache.key(self.gateware("b", date="2025-06-30", path="/tmp/other")), key)
+        # Netlist changes and toolchain settings are.
+        self.assertNotEqual(self.cache.key(self.gateware("c", led="~clk")), key)
+        self.assertNotEqual(self.cache.key(self.gateware("a"), settings={"kwargs": {"vivado_synth_directive": "AreaOptimized_high"}}), key)
+        self.assertEqual(self.cache.key(self.gateware("a"), settings={"a": 1, "b": 2}),
+                         self.cache.key(self.gateware("a"), settings={"b": 2, "a": 1}))
+        # External sources are hashed on their contents.
+        source = os.path.join(self.directory.name, "cpu.v")
+        write(source, "module cpu(); endmodule\n")
+        key_source = self.cache.key(self.gateware("a"), sources=[source])
+        self.assertNotEqual(key_source, key)
+        write(source, "module cpu(input a); endmodule\n")
+        self.assertNotEqual(self.cache.key(self.gateware("a"), sources=[source]), key_source)
+
+    def test_store_restore(self):
+        gateware_dir = self.gateware("a")
+        write(os.path.join(gateware_dir, "top.bit"), "bitstream")
+        write(os.path.join(gateware_dir, "top_timing.rpt"), "WNS 0.100")
+        self.assertFalse(self.cache.restore("k", gateware_dir))
+        self.cache.store("k", gateware_dir)
+        self.assertEqual(self.cache.entries()["k"]["files"], ["top.bit", "top_timing.rpt"])
+        self.assertEqual([f for f in os.listdir(self.cache.path) if f.startswith(".")], [])
+        other = self.gateware("b")
+        self.assertTrue(self.cache.restore("k", other))
+        with open(os.path.join(other, "top.bit")) as f:
+            self.assertEqual(f.read(), "bitstream")
+        self.assertEqual(self.cache.entries()["k"]["hits"], 1)
+        # Entry with missing files: miss (and dropped), not an error.
+        os.remove(os.path.join(self.cache.path, "k", "top.bit"))
+        self.assertFalse(self.cache.restore("k", self.gateware("c")))
+        self.assertNotIn("k", self.cache.entries())
+
+    def test_evict(self):
+        gateware_dir = self.gateware("a")
+        write(os.path.join(gateware_dir, "top.bit"), "x"*1000)
+        for key in ["a", "b", "c"]:
+            self.cache.store(key, gateware_dir)
+        entries = self.cache.entries()
+        size    = entries["a"]["size"]
+        # Least recently used first: "b" is the oldest once "a" is restored.
+        for key, age in [("a", 300), ("b", 200), ("c", 100)]:
+            meta = entries[key]
+            meta["last_used"] = time.time() - age
+            self.cache._write_meta(self.cache._entry_dir(key), meta)
+        self.cache.restore("a", self.gateware("b"))
+        self.cache.max_size = 2*size
+        self.assertEqual(self.cache.evict(), ["b"])
+        # By age.
+        self.cache.max_size = None
+        self.cache.max_age  = 50
+        self.assertEqual(self.cache.evict(), ["c"])
+        self.assertEqual(list(self.cache.entries()), ["a"])
+
+    def test_build(self):
+        builder = FakeBuilder(os.path.join(self.directory.name, "build", "gateware"))
+        cwd     = os.getcwd()
+        self.assertFalse(self.cache.build(builder))
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertTrue(self.cache.build(FakeBuilder(builder.gateware_dir, date="2030-01-01")))
+        self.assertEqual(builder.soc.platform.toolchain.runs, 1)
+        # Changed netlist: toolchain run.
+        builder = FakeBuilder(builder.gateware_dir, led="~clk")
+        self.assertFalse(self.cache.build(builder))
+        self.assertEqual(builder.soc.platform.toolchain.runs, 1)
+        self.assertEqual(len(self.cache.entries()), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#
+# This file is part of LiteX-Boards.
+
+# Build-phase profiling: phase nesting, instrumentation, outputs and Vivado log parsing.
+
+import os
+import json
+import tempfile
+import unittest
+
+from litex_boards_vacajk.tools.build_profile import BuildProfile
+from litex_boards_vacajk.tools.vivado_reports import parse_vivado_log
+
+vivado_log = """\
+Command: synth_design -directory AutoIncremental/... -top bochen_kintex7_base -part xc7k325tffg676-2
+synth_design: Time (s): cpu = 00:01:02 ; elapsed = 00:00:58 . Memory (MB): peak = 2811.543 ; gain = 1024.000
+opt_design: Time (s): cpu = 00:00:04 ; elapsed = 00:00:03 . Memory (MB): peak = 2900.000 ; gain = 0.000
+place_design: Time (s): cpu = 00:02:10 ; elapsed = 00:01:15 . Memory (MB): peak = 3500.250 ; gain = 600.000
+route_design: Time (s): cpu = 00:03:00 ; elapsed = 00:01:40 . Memory (MB): peak = 3800.000 ; gain = 300.000
+write_bitstream: Time (s): cpu = 00:00:30 ; elapsed = 00:00:25 . Memory (MB): peak = 3900.000 ; gain = 100.000
+"""
+
+class Dummy:
+    def __init__(self):
+        self.n = 0
+
+    def add_foo(self, n):
+        self.n += n
+        return self.n
+
+class DummyChild(Dummy):
+    pass
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestBuildProfile(unittest.TestCase):
+    def test_phases(self):
+        profile = BuildProfile()
+        with profile.phase("build"):
+            with profile.phase("verilog", "generation", lines=10):
+                pass
+        self.assertEqual([p["path"] for p in profile.phases], ["build", "build/verilog"])
+        build, verilog = profile.phases
+        self.assertGreaterEqual(build["duration"], verilog["duration"])
+        self.assertGreaterEqual(verilog["start"], build["start"])
+        self.assertGreater(build["peak_rss"], 0)
+        self.assertIs(profile.find("verilog"), verilog)
+
+    def test_instrument(self):
+        profile = BuildProfile()
+        original = Dummy.add_foo
+        with profile.instrument(DummyChild, ["add_foo", "add_bar"], "elaboration"):
+            with profile.instrument(DummyChild, ["__init__"], rename={"__init__": "DummyChild"}):
+                with profile.phase("elaboration"):
+                    dummy = DummyChild()
+                    self.assertEqual(dummy.add_foo(2), 2)
+        # Originals restored (inherited methods not shadowed).
+        self.assertIs(Dummy.add_foo, original)
+        self.assertNotIn("add_foo",  DummyChild.__dict__)
+        self.assertNotIn("__init__", DummyChild.__dict__)
+        self.assertEqual([p["path"] for p in profile.phases],
+            ["elaboration", "elaboration/DummyChild", "elaboration/add_foo"])
+
+    def test_outputs(self):
+        profile = BuildProfile()
+        profile.add_phase("arguments", 0, 0.5)
+        for _ in range(2):
+            with profile.phase("verilog", "generation"):
+                pass
+        trace = profile.to_chrome_trace()
+        self.assertEqual(len(trace["traceEvents"]), 3)
+        self.assertEqual(trace["traceEvents"][0]["dur"], 0.5e6)
+        self.assertEqual(trace["traceEvents"][1]["ph"], "X")
+        entry = profile.history_entry(argv=["--build"])
+        self.assertEqual(set(entry["phases"]), {"arguments", "verilog"})
+        self.assertEqual(entry["meta"], {"argv": ["--build"]})
+        with tempfile.TemporaryDirectory() as d:
+            history = os.path.join(d, "history.jsonl")
+            for _ in range(2):
+                profile.write(os.path.join(d, "profile.json"), os.path.join(d, "trace.json"), history)
+            with open(history) as f:
+                self.assertEqual(len(f.readlines()), 2)
+            with open(os.path.join(d, "trace.json")) as f:
+                self.assertIn("traceEvents", json.load(f))
+
+    def test_vivado_log(self):
+        commands = parse_vivado_log(vivado_log)
+        self.assertEqual([c["command"] for c in commands],
+            ["synth_design", "opt_design", "place_design", "route_design", "write_bitstream"])
+        self.assertEqual(commands[2]["elapsed"], 75)
+        self.assertEqual(commands[2]["cpu"], 130)
+        self.assertEqual(commands[2]["peak_memory"], 3500.25)
+        profile = BuildProfile()
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "vivado.log")
+            with profile.phase("vivado", "vivado"):
+                with open(filename, "w") as f:
+                    f.write(vivado_log)
+            profile.add_vivado_log(filename)
+        self.assertEqual(profile.find("route_design")["path"], "vivado/route_design")
+        self.assertEqual(profile.find("route_design")["start"], profile.find("vivado")["start"] + 58 + 3 + 75)
+
+if __name__ == "__main__":
+    unittest.main()
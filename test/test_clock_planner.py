@@ -0,0 +1,66 @@
+#
+# This file is part of LiteX-Boards.
+
+# MMCM solver/clock planner of the bochen_kintex7_base CRG.
+
+import unittest
+import importlib.util
+
+# Test ---------------------------------------------------------------------------------------------
+
+@unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+class TestClockPlanner(unittest.TestCase):
+    def test_solve(self):
+        from litex_boards_vacajk.cores.clock_planner import solve_mmcm
+        clocks = ((100e6, 1e-2, False), (200e6, 1e-2, True), (400e6, 1e-2, False))
+        mmcm   = solve_mmcm(50e6, clocks)
+        self.assertEqual(mmcm["freqs"], [100e6, 200e6, 400e6])
+        self.assertEqual(mmcm["divclk_divide"], 1) # Highest phase detector frequency (lowest jitter).
+        self.assertIsNone(mmcm["fractional"])
+        hits = solve_mmcm.cache_info().hits
+        self.assertIs(solve_mmcm(50e6, clocks), mmcm)
+        self.assertEqual(solve_mmcm.cache_info().hits, hits + 1)
+        # 480MHz from a 100MHz multiple VCO needs the fractional divider.
+        mmcm = solve_mmcm(50e6, ((100e6, 1e-6, False), (480e6, 1e-6, True)))
+        self.assertEqual(mmcm["fractional"], 1)
+        self.assertNotEqual(mmcm["divides"][1] % 1, 0)
+        self.assertIsNone(solve_mmcm(50e6, ((100e6, 1e-6, False), (480e6, 1e-6, False))))
+        # 720p pixel clock (not reachable with integer CLKFBOUT multipliers).
+        mmcm = solve_mmcm(50e6, ((74.25e6, 1e-3, False), (371.25e6, 1e-3, False)))
+        self.assertNotEqual(mmcm["clkfbout_mult"] % 1, 0)
+
+    def test_plan(self):
+        from litex_boards_vacajk.cores.clock_planner import plan_clocks
+        from litex_boards_vacajk.targets.bochen_kintex7_base import crg_clocks
+        # Video clocks share the sys MMCM when compatible, else get their own MMCM.
+        plan = plan_clocks(50e6, *crg_clocks(125e6, with_sdram=True, with_ethernet=True, with_hdmi=True, hdmi_clk_freq=25e6))
+        self.assertEqual([mmcm["clocks"] for mmcm in plan], [["sys", "idelay", "sys4x", "hdmi", "hdmi5x"]])
+        plan = plan_clocks(50e6, *crg_clocks(100e6, with_sdram=True, with_ethernet=True, with_hdmi=True, hdmi_clk_freq=25.2e6))
+        self.assertEqual([mmcm["clocks"] for mmcm in plan], [["sys", "idelay", "sys4x"], ["hdmi", "hdmi5x"]])
+        for mmcm in plan:
+            self.assertTrue(all(abs(e) < 1e-6 for e in mmcm["errors"]))
+            self.assertTrue(all(50 < j < 500 for j in mmcm["jitters"]))
+        with self.assertRaises(ValueError):
+            plan_clocks(50e6, {"sys": (1.5e9, 1e-2, False)})
+
+    def test_achievable(self):
+        from litex_boards_vacajk.cores.clock_planner import achievable_frequencies
+        freqs = achievable_frequencies(50e6, 100e6, 200e6, ratios=[1, 4])
+        self.assertIn(100e6, freqs)
+        self.assertIn(150e6, freqs)
+        self.assertNotIn(101e6, freqs)
+
+    def test_mmcm(self):
+        from migen import ClockDomain, Signal
+        from litex_boards_vacajk.cores.clock_planner import PlannedS7MMCM
+        mmcm = PlannedS7MMCM(speedgrade=-2)
+        mmcm.register_clkin(Signal(), 50e6)
+        mmcm.create_clkout(ClockDomain("a"), 100e6, margin=1e-6)
+        mmcm.create_clkout(ClockDomain("b"), 480e6, margin=1e-6, fractional=True)
+        config = mmcm.compute_config()
+        # Fractional clock moved to CLKOUT0.
+        self.assertEqual(mmcm.clkouts[0][1], 480e6)
+        self.assertEqual((config["clkout0_divide"], config["clkout1_divide"]), (2.5, 12))
+
+if __name__ == "__main__":
+    unittest.main()
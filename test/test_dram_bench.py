@@ -0,0 +1,89 @@
+#
+# This file is part of LiteX-Boards.
+
+# DRAM benchmark core, simulated against a fixed read latency DRAM native port model, and host side
+# latency percentiles.
+
+import random
+import unittest
+import importlib.util
+
+from litex_boards_vacajk.tools.sdram_bench import percentiles
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def dram_model(port, log, latency=12, seed=0):
+    """Native port model: random command backpressure, reads returned `latency` cycles after their
+    command, write data accepted immediately."""
+    rng   = random.Random(seed)
+    reads = []
+    cycle = 0
+    yield port.wdata.ready.eq(1)
+    while True:
+        ready = rng.random() > 0.3
+        yield port.cmd.ready.eq(ready)
+        yield port.rdata.valid.eq(bool(reads) and reads[0] <= cycle)
+        yield
+        cycle += 1
+        if reads and reads[0] < cycle and (yield port.rdata.ready):
+            reads.pop(0)
+        if ready and (yield port.cmd.valid):
+            we = (yield port.cmd.we)
+            log.append((we, (yield port.cmd.addr)))
+            if not we:
+                reads.append(cycle + latency - 1)
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestSDRAMBench(unittest.TestCase):
+    def test_percentiles(self):
+        hist = [0, 10, 80, 9, 0, 0, 0, 1]
+        self.assertEqual(percentiles(hist, 2), {50: 11, 90: 11, 99: 15})
+        self.assertEqual(percentiles(hist, 2, ps=[100], latency_min=5, latency_max=40), {100: 40})
+        self.assertEqual(percentiles([0]*8, 2), {50: None, 90: None, 99: None})
+
+    @unittest.skipIf(importlib.util.find_spec("litedram") is None, "LiteDRAM not installed.")
+    def test_bench(self):
+        from migen import run_simulation, passive
+        from litedram.common import LiteDRAMNativePort
+        from litex_boards_vacajk.cores.dram_bench import DRAMBench
+
+        latency = 12
+        port    = LiteDRAMNativePort("both", address_width=20, data_width=64)
+        dut     = DRAMBench(port, nbins=8)
+        log     = []
+        r       = {}
+        def generator():
+            yield dut._base.storage.eq(0x800)
+            yield dut._length.storage.eq(256)
+            yield dut._burst.storage.eq(4)
+            yield dut._write_ratio.storage.eq(64) # 25% writes.
+            yield dut._hist_shift.storage.eq(2)
+            yield
+            yield dut._start.re.eq(1)
+            yield
+            yield dut._start.re.eq(0)
+            yield
+            while not (yield dut._done.status):
+                yield
+            for name in ["cycles", "reads", "writes", "latency_min", "latency_max", "latency_sum"]:
+                r[name] = (yield getattr(dut, "_" + name).status)
+            r["hist"] = []
+            for i in range(8):
+                yield dut._hist_index.storage.eq(i)
+                yield
+                r["hist"].append((yield dut._hist_count.status))
+        run_simulation(dut, [generator(), passive(dram_model)(port, log, latency)])
+
+        # Sequential accesses from base, one write burst every 4 bursts.
+        self.assertEqual([adr for we, adr in log], list(range(0x800//8, 0x800//8 + 256)))
+        self.assertEqual([we for we, adr in log], ([0]*12 + [1]*4)*16)
+        self.assertEqual((r["reads"], r["writes"]), (192, 64))
+        self.assertGreaterEqual(r["cycles"], 256)
+        # Fixed latency: all reads in the same histogram bin.
+        self.assertEqual((r["latency_min"], r["latency_max"]), (latency, latency))
+        self.assertEqual(r["latency_sum"], 192*latency)
+        self.assertEqual(r["hist"], [192 if i == latency >> 2 else 0 for i in range(8)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#
+# This file is part of LiteX-Boards.
+
+# Batched/pipelined Etherbone client against the local stand-in server.
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+import contextlib
+import importlib.util
+
+from litex_boards_vacajk.tools.etherbone_client import *
+
+csr_csv = """\
+#--------------------------------------------------------------------------------
+# Auto-generated by LiteX
+#--------------------------------------------------------------------------------
+csr_base,ctrl,0xf0000000,,
+csr_register,ctrl_reset,0xf0000000,1,rw
+csr_register,ctrl_scratch,0xf0000004,1,rw
+csr_register,timer0_value,0xf0000808,2,ro
+constant,config_clock_frequency,100000000,,
+constant,config_csr_data_width,32,,
+memory_region,sram,0x10000000,8192,cached
+"""
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestEtherboneClient(unittest.TestCase):
+    def setUp(self):
+        self.server = EtherboneServer().start()
+        fd, self.csr_csv = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write(csr_csv)
+
+    def tearDown(self):
+        self.server.stop()
+        os.remove(self.csr_csv)
+
+    def client(self, **kwargs):
+        return EtherboneClient(*self.server.address, csr_csv=self.csr_csv, **kwargs)
+
+    def test_registers(self):
+        client = self.client()
+        self.assertEqual(client.index.registers["timer0_value"], (0xf0000808, 2))
+        self.assertEqual(client.index.constants["config_clock_frequency"], 100000000)
+        client.write_regs({"ctrl_scratch": 0x12345678, "timer0_value": 0x0123456789abcdef})
+        self.assertEqual(client.read_regs(["ctrl_scratch", "timer0_value"]),
+            {"ctrl_scratch": 0x12345678, "timer0_value": 0x0123456789abcdef})
+        self.assertEqual(self.server.mem[0xf0000808], 0x01234567) # MSW first.
+        self.assertEqual(client.read("ctrl_scratch"), 0x12345678)
+        client.close()
+
+    def test_batch(self):
+        client = self.client(window=4, retries=0)
+        # Scattered writes (one record each, the last one also carrying the first 255 reads), 600
+        # reads (2 more records) then a write/read back (1 record), in program order.
+        batch = client.batch()
+        for i in range(8):
+            batch.write(0x1000 + 0x100*i, i)
+        reads = [batch.read(0x1000 + 0x100*(i % 8)) for i in range(600)]
+        batch.write(0x1000, 0xdead)
+        last = batch.read(0x1000)
+        results = batch.execute()
+        self.assertEqual([results[i] for i in reads], [i % 8 for i in range(600)])
+        self.assertEqual(results[last], 0xdead)
+        self.assertEqual(self.server.stats["records"], 8 + 2 + 1)
+        client.close()
+
+    def test_records_per_packet(self):
+        client = self.client(records_per_packet=16)
+        client.write_many([(4*i, i) for i in range(1000)]) # Consecutive: 4 records, 1 packet.
+        self.assertEqual(client.read_many([4*i for i in range(1000)]), list(range(1000)))
+        self.assertEqual(self.server.stats["packets"], 2)
+        client.close()
+
+    def test_read_mem(self):
+        for i in range(2048):
+            self.server.mem[0x10000000 + 4*i] = i
+        client = self.client(window=8)
+        buf    = bytearray(8192)
+        client.read_mem("sram", buf)
+        self.assertEqual(list(memoryview(buf).cast("I")), list(range(2048)))
+        client.close()
+
+    def test_retries(self):
+        self.server.drop = 3
+        client = self.client(window=4, timeout=0.05)
+        self.assertEqual(client.read_many([0]*255*12), [0]*255*12)
+        self.assertGreater(client.stats["retries"], 0)
+        # Reads get their own records/packets, only these are re-sent (writes are not repeated).
+        self.server.drop    = 4
+        self.server.replies = 0
+        retries = client.stats["retries"]
+        batch   = client.batch()
+        for i in range(4):
+            batch.write(0x100*i, i)
+            batch.read(0x100*i)
+        self.assertEqual(batch.execute(), list(range(4)))
+        self.assertEqual(self.server.stats["writes"], 4)
+        self.assertEqual(client.stats["retries"], retries + 1)
+        self.assertTrue(all(not record.writes or not record.reads for record in batch.records))
+        # Mixed record built by hand: not re-sent.
+        self.server.drop = 1
+        with self.assertRaises(TimeoutError):
+            client.transact([(EtherboneRecord(base_addr=0x100, writes=[1], reads=[0x100]), None)])
+        client.close()
+
+    def test_bench_mem_addr(self):
+        # csr.csv without sram/rom region: burst read address required.
+        with open(self.csr_csv, "w") as f:
+            f.write("\n".join(l for l in csr_csv.splitlines() if not l.startswith("memory_region")))
+        argv   = sys.argv
+        stderr = io.StringIO()
+        try:
+            sys.argv = ["etherbone_client.py", "--csr-csv", self.csr_csv, "--bench"]
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(stderr):
+                main()
+        finally:
+            sys.argv = argv
+        self.assertIn("--mem-addr", stderr.getvalue())
+
+    @unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+    def test_litex_packets(self):
+        from litex.tools.remote.etherbone import EtherbonePacket
+        # Same encoding as LiteX's Etherbone packets.
+        record = EtherboneRecord(base_addr=0x100, writes=[1, 2, 3], base_ret_addr=0x200, reads=[0x10, 0x20])
+        packet = EtherbonePacket(init=encode_packet([record]))
+        packet.decode()
+        self.assertEqual(packet.records[0].writes.base_addr, 0x100)
+        self.assertEqual(packet.records[0].writes.get_datas(), [1, 2, 3])
+        self.assertEqual(packet.records[0].reads.get_addrs(), [0x10, 0x20])
+        from litex.tools.remote.etherbone import EtherboneRecord as LiteXRecord, EtherboneReads
+        packet = EtherbonePacket()
+        litex_record = LiteXRecord()
+        litex_record.reads = EtherboneReads(base_ret_addr=0x300, addrs=[0x40])
+        packet.records = [litex_record]
+        packet.encode()
+        record = decode_packet(bytes(packet.bytes))[0]
+        self.assertEqual((record.base_ret_addr, record.reads), (0x300, [0x40]))
+
+if __name__ == "__main__":
+    unittest.main()
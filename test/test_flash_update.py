@@ -0,0 +1,121 @@
+#
+# This file is part of LiteX-Boards.
+
+# Differential SPI Flash update plans, applied to file-backed flash images.
+
+import os
+import random
+import tempfile
+import unittest
+
+from litex_boards_vacajk.tools.flash_update import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def random_bytes(seed, length):
+    return random.Random(seed).getrandbits(8*length).to_bytes(length, "little")
+
+class CorruptFileFlash(FileFlash):
+    """File flash flipping a bit of the first byte of each write."""
+    def execute(self, erases=[], writes=[], reads=[]):
+        writes = [(address, bytes([data[0] ^ 0x01]) + data[1:]) for address, data in writes]
+        return FileFlash.execute(self, erases, writes, reads)
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestFlashUpdate(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.image     = os.path.join(self.directory.name, "flash.bin")
+        self.manifest  = os.path.join(self.directory.name, "manifest.json")
+        self.bitstream = random_bytes(0, 300*1024 + 100)
+        self.firmware  = firmware_image(random_bytes(1, 40*1024))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, offset, length):
+        with open(self.image, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def test_plan(self):
+        offset, size = spiflash_regions["bitstream"]
+        # Unknown previous contents: whole image, 64KB block erases except for the last block.
+        plan = plan_region("bitstream", self.bitstream, offset, size)
+        self.assertEqual(plan["sectors"], 76)
+        self.assertEqual(plan["erases"], [(0, 4*64*1024, 64*1024), (4*64*1024, 12*4*1024, 4*1024)])
+        self.assertEqual(plan["writes"], [(0, self.bitstream)])
+        # Changes in two sectors of a block and in a whole block.
+        data = bytearray(self.bitstream)
+        data[5000]  ^= 0xff
+        data[13000] ^= 0xff
+        data[2*64*1024:3*64*1024] = random_bytes(2, 64*1024)
+        plan = plan_region("bitstream", bytes(data), offset, size, plan["manifest"])
+        self.assertEqual(plan["changed"], 2 + 16)
+        self.assertEqual(plan["erases"], [(4096, 4096, 4096), (12288, 4096, 4096), (2*64*1024, 64*1024, 64*1024)])
+        self.assertEqual([address for address, _ in plan["writes"]], [4096, 12288, 2*64*1024])
+        # Blank sectors are erased but not written.
+        data[8*4096:9*4096] = b"\xff"*4096
+        plan = plan_region("bitstream", bytes(data), offset, size, plan["manifest"])
+        self.assertEqual((plan["changed"], plan["writes"]), (1, []))
+        with self.assertRaises(ValueError):
+            plan_region("firmware", bytes(5*1024*1024), *spiflash_regions["firmware"])
+
+    def test_update(self):
+        flash = FileFlash(self.image)
+        images = {"bitstream": self.bitstream, "firmware": self.firmware}
+        update(flash, images, self.manifest)
+        self.assertEqual(self.read(0, len(self.bitstream)), self.bitstream)
+        self.assertEqual(self.read(spiflash_regions["firmware"][0], len(self.firmware)), self.firmware)
+        # Up to date.
+        erased = flash.erased
+        plans  = update(flash, images, self.manifest)
+        self.assertEqual([plan["changed"] for plan in plans], [0, 0])
+        self.assertEqual(flash.erased, erased)
+        # Firmware only (bitstream region untouched).
+        firmware = firmware_image(random_bytes(1, 40*1024)[:-1] + b"\x00")
+        plans    = update(flash, {"firmware": firmware}, self.manifest)
+        self.assertEqual(plans[0]["changed"], 2) # Header and last sector.
+        self.assertEqual(flash.erased, erased + 2*4096)
+        self.assertEqual(self.read(spiflash_regions["firmware"][0], len(firmware)), firmware)
+        self.assertEqual(read_manifest(self.manifest)["bitstream"]["sectors"], sector_checksums(self.bitstream))
+
+    def test_readback(self):
+        # Stale manifest (board programmed by other means): diff against the flash contents.
+        update(FileFlash(self.image), {"bitstream": self.bitstream}, self.manifest)
+        other = FileFlash(os.path.join(self.directory.name, "other.bin"))
+        # Manifest of another board: nothing to update according to it, but whole image verify fails.
+        with self.assertRaises(OSError):
+            update(other, {"bitstream": self.bitstream}, self.manifest)
+        plans = update(other, {"bitstream": self.bitstream}, self.manifest, readback=True)
+        self.assertEqual(plans[0]["changed"], plans[0]["sectors"])
+        # Board with a sector differing from the manifest (programmed without it): stale sector.
+        bitstream = bytearray(self.bitstream)
+        bitstream[100*1024] ^= 0xff
+        update(other, {"bitstream": bytes(bitstream)})
+        manifest = read_manifest(self.manifest)
+        with self.assertRaises(OSError):
+            update(other, {"bitstream": self.bitstream}, self.manifest)
+        self.assertEqual(read_manifest(self.manifest), manifest)
+
+    def test_verify(self):
+        flash = CorruptFileFlash(self.image)
+        with self.assertRaises(OSError):
+            update(flash, {"firmware": self.firmware}, self.manifest)
+        self.assertFalse(os.path.exists(self.manifest))
+
+    def test_openocd_script(self):
+        plan     = plan_region("bitstream", self.bitstream, *spiflash_regions["bitstream"])
+        flash    = OpenOCDFlash(programmer=None)
+        commands = flash.script("proxy.bit", plan["erases"], plan["writes"], [(0, 4096)], self.directory.name)
+        self.assertEqual(commands[:3], ["init", "jtagspi_init 0 {proxy.bit}",
+            "jtagspi set 0 mx25l25645g 0x2000000 0x100 0x13 0 0x12 0xc7 0x10000 0xdc"])
+        self.assertIn("flash erase_address 0x00000000 0x40000", commands)
+        self.assertIn("0x1000 0x21", commands[4])
+        self.assertEqual(commands[-2:], ["fpga_program", "exit"])
+        with open(os.path.join(self.directory.name, "write0.bin"), "rb") as f:
+            self.assertEqual(f.read(), self.bitstream)
+
+if __name__ == "__main__":
+    unittest.main()
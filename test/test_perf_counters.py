@@ -0,0 +1,100 @@
+#
+# This file is part of LiteX-Boards.
+
+# Performance counters, simulated on a stream endpoint with a known busy/stall pattern, and host
+# side decoding.
+
+import unittest
+import importlib.util
+
+from litex_boards_vacajk.tools.perf_counters import decode
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestPerfCounters(unittest.TestCase):
+    def test_decode(self):
+        r = decode({"busy": 512, "transactions": 128, "stalls": 384, "bytes": 4096}, period=1024, clk_freq=100e6)
+        self.assertEqual(r["utilization"], 0.5)
+        self.assertEqual(r["stall_ratio"], 0.75)
+        self.assertEqual(r["bandwidth"], 400e6)
+        self.assertEqual(r["cycles_per_transaction"], 4)
+        r = decode({"busy": 0, "transactions": 0, "stalls": 0, "bytes": 0}, period=1024, clk_freq=100e6)
+        self.assertEqual((r["stall_ratio"], r["cycles_per_transaction"]), (0, 0))
+
+    @unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+    def test_counters(self):
+        from migen import run_simulation
+        from litex.soc.interconnect import stream
+        from litex_boards_vacajk.cores.perf_counters import PerfCounters
+
+        period_shift = 5 # 32 cycles.
+        endpoint     = stream.Endpoint([("data", 32)])
+        dut          = PerfCounters()
+        dut.add_stream_probe("probe", endpoint)
+        r = {"snapshots": []}
+        def generator():
+            yield dut._period_shift.storage.eq(period_shift)
+            # Wait for the new period to be applied.
+            snapshot = (yield dut._snapshot.status)
+            while (yield dut._snapshot.status) < snapshot + 2:
+                yield
+            # 3 periods: valid 3/4 of the cycles, accepted 1/4 of the cycles.
+            for cycle in range(3*2**period_shift):
+                yield endpoint.valid.eq(cycle % 4 != 3)
+                yield endpoint.ready.eq(cycle % 4 == 0)
+                yield
+                if (yield dut.sample):
+                    snapshot = []
+                    for c in ["busy", "transactions", "stalls", "bytes"]:
+                        snapshot.append((yield getattr(dut.probe, "_" + c).status))
+                    r["snapshots"].append(snapshot)
+            yield endpoint.valid.eq(0)
+            for _ in range(2**period_shift + 2):
+                yield
+            r["hist"] = []
+            for i in range(8):
+                yield dut._hist_index.storage.eq(i)
+                yield
+                r["hist"].append((yield dut.probe._hist_count.status))
+        run_simulation(dut, generator())
+
+        # Snapshots (read on sample, so from the previous period: first one is from the idle period).
+        self.assertEqual(r["snapshots"], [[0, 0, 0, 0]] + [[24, 8, 16, 32]]*2)
+        # 75% busy periods in bin 6, idle ones in bin 0.
+        self.assertEqual(r["hist"][6], 3)
+        self.assertGreaterEqual(r["hist"][0], 2)
+
+    @unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+    def test_period_shift_min(self):
+        from migen import run_simulation
+        from litex.soc.interconnect import stream
+        from litex.soc.interconnect.csr import GenericBank
+        from litex_boards_vacajk.cores.perf_counters import PerfCounters
+
+        endpoint = stream.Endpoint([("data", 32)])
+        dut      = PerfCounters(nbins=8)
+        dut.add_stream_probe("probe", endpoint)
+        dut.bank = GenericBank(dut.get_csrs(), busword=32) # CSR device writes, as in the SoC.
+        r = {}
+        def generator():
+            yield from dut._period_shift.write(1) # Below log2(nbins): raised to 3 (8 cycles).
+            yield endpoint.valid.eq(1)
+            for _ in range(8*8 + 4):
+                yield
+            r["period_shift"] = (yield from dut._period_shift.read())
+            r["busy"]         = (yield dut.probe._busy.status)
+            r["hist"]         = []
+            for i in range(8):
+                yield dut._hist_index.storage.eq(i)
+                yield
+                r["hist"].append((yield dut.probe._hist_count.status))
+        run_simulation(dut, generator())
+
+        self.assertEqual(r["period_shift"], 3)
+        self.assertEqual(r["busy"], 8)
+        # Fully busy periods in the last bin.
+        self.assertGreaterEqual(r["hist"][7], 6)
+        self.assertEqual(sum(r["hist"][1:7]), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+#
+# This file is part of LiteX-Boards.
+
+# SDCard transfer timer and block I/O benchmark patterns/results.
+
+import unittest
+import importlib.util
+
+from litex_boards_vacajk.tools.sdcard_bench import patterns, summarize
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestSDCardBench(unittest.TestCase):
+    def test_patterns(self):
+        p = patterns(size=100*1024, span=1024*1024, transfer_size=64*1024, nrandom=16, block=1000)
+        self.assertEqual(p["sequential"], [(1000, 128), (1128, 72)])
+        self.assertEqual(len(p["random"]), 16)
+        self.assertTrue(all(1000 <= b < 1000 + 2048 and n == 1 for b, n in p["random"]))
+        self.assertEqual(p["random"], patterns(100*1024, 1024*1024, nrandom=16, block=1000)["random"])
+
+    def test_summarize(self):
+        r = {"payload": 1024*1024, "cycles": 100000, "link_cycles": 50000, "commands": 16, "elapsed": 2.0}
+        s = summarize(r, sys_clk_freq=100e6)
+        self.assertAlmostEqual(s["throughput"], 1024*1024*1000)
+        self.assertAlmostEqual(s["link_throughput"], 1024*1024*2000)
+        self.assertAlmostEqual(s["transfer_time"], 1e-3/16)
+        self.assertAlmostEqual(s["host_throughput"], 512*1024)
+
+    @unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+    def test_timer(self):
+        from migen import passive, run_simulation
+        from litex_boards_vacajk.cores.sdcard_bench import SDCardTimer
+        dut = SDCardTimer()
+
+        def generator():
+            # Two transfers of 10 cycles, 4 data beats each, with idle cycles between them.
+            for _ in range(2):
+                yield dut.start.eq(1)
+                yield
+                yield dut.start.eq(0)
+                for i in range(9):
+                    yield dut.data.eq(i % 2)
+                    yield dut.done.eq(i == 8)
+                    yield
+                yield dut.data.eq(0)
+                yield dut.done.eq(0)
+                for _ in range(20):
+                    yield
+            self.assertEqual((yield dut._cycles.status), 2*10)
+            self.assertEqual((yield dut._transfers.status), 2)
+            self.assertEqual((yield dut._bytes.status), 2*4)
+            yield from dut._clear.write(1)
+            yield
+            self.assertEqual((yield dut._cycles.status), 0)
+
+        run_simulation(dut, generator())
+
+    @unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+    def test_timer_spi(self):
+        from migen import Signal, run_simulation
+        from litex_boards_vacajk.cores.sdcard_bench import SDCardTimer
+
+        class SPIMaster:
+            def __init__(self):
+                self.cs   = Signal(reset=1)
+                self.done = Signal(reset=1)
+                self.irq  = Signal()
+
+        spi = SPIMaster()
+        dut = SDCardTimer()
+        dut.add_spi(spi)
+
+        def generator():
+            yield spi.cs.eq(0)
+            yield
+            yield from dut._clear.write(1)
+            # Selection of 40 cycles: 2 bytes of 8 shift cycles, software handling in between.
+            yield spi.cs.eq(1)
+            for i in range(40):
+                yield spi.done.eq(not (10 <= i < 18 or 25 <= i < 33))
+                yield spi.irq.eq(i in [17, 32])
+                yield
+            yield spi.cs.eq(0)
+            yield spi.irq.eq(0)
+            for _ in range(20):
+                yield
+            self.assertEqual((yield dut._cycles.status), 40)
+            self.assertEqual((yield dut._link_cycles.status), 2*8)
+            self.assertEqual((yield dut._transfers.status), 1)
+            self.assertEqual((yield dut._bytes.status), 2)
+
+        run_simulation(dut, generator())
+
+    @unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+    def test_dram_dma(self):
+        from litex_boards_vacajk.targets.bochen_kintex7_base import BaseSoC, _dram_port_name
+        kwargs = dict(with_sdram=True, with_sdcard=True, sdcard_dma="dram", integrated_rom_size=0x10000)
+        # The BIOS flushes the L2 cache over DMA data.
+        with self.assertRaises(ValueError):
+            BaseSoC(**kwargs)
+        soc = BaseSoC(l2_size=0, **kwargs)
+        # main_ram buffers on (named) LiteDRAM ports, others on the main bus.
+        for name in ["sdcard_block2mem", "sdcard_mem2block"]:
+            self.assertIn(name, soc.bus.masters)
+            self.assertTrue(hasattr(soc, f"{name}_dram"))
+        self.assertEqual([_dram_port_name(soc, port) for port in soc.sdram.crossbar.masters[1:]],
+                         ["sdcard_block2mem_dram", "sdcard_mem2block_dram"])
+        self.assertNotIn("SDCARD_CMD18_SUPPORT", soc.constants)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+#
+# This file is part of LiteX-Boards.
+
+# Elaboration of the bochen_kintex7_base simulation twin (no Verilator build/run).
+
+import os
+import tempfile
+import unittest
+import importlib.util
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def sim_soc(**kwargs):
+    from litex_boards_vacajk.targets.bochen_kintex7_base_sim import SimSoC
+    soc = SimSoC(uart_name="sim", integrated_rom_size=0x10000, **kwargs)
+    soc.finalize()
+    return soc
+
+# Test ---------------------------------------------------------------------------------------------
+
+@unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+class TestSim(unittest.TestCase):
+    def test_sdram(self):
+        soc = sim_soc(with_sdram=True)
+        self.assertIn("sdram", soc.csr.locs)
+        self.assertEqual(soc.constants["MEMTEST_DATA_SIZE"], 8*1024)
+        soc = sim_soc(with_sdram=True, sdram_skip_test=True)
+        self.assertIn("SDRAM_TEST_DISABLE", soc.constants)
+        self.assertNotIn("MEMTEST_DATA_SIZE", soc.constants)
+
+    def test_sdram_init(self):
+        with tempfile.TemporaryDirectory() as directory:
+            firmware = os.path.join(directory, "firmware.bin")
+            with open(firmware, "wb") as f:
+                f.write(bytes(range(256)))
+            soc = sim_soc(with_sdram=True, sdram_init=firmware)
+        self.assertIn("SDRAM_TEST_DISABLE", soc.constants)
+        self.assertEqual(soc.constants["ROM_BOOT_ADDRESS"], soc.mem_map["main_ram"])
+
+    def test_ethernet(self):
+        soc = sim_soc(with_ethernet=True)
+        self.assertIn("ethmac", soc.csr.locs)
+        self.assertEqual(soc.constants["REMOTEIP4"], 100)
+        soc = sim_soc(with_ethernet=True, eth_dynamic_ip=True)
+        self.assertIn("ETH_DYNAMIC_IP", soc.constants)
+        soc = sim_soc(with_ethernet=True, with_etherbone=True)
+        self.assertIn("ethmac", soc.csr.locs)
+        self.assertIn("etherbone", soc.bus.masters)
+
+    def test_video(self):
+        soc = sim_soc(with_sdram=True, with_video_framebuffer=True)
+        self.assertIn("video_framebuffer", soc.csr.locs)
+        with self.assertRaises(ValueError):
+            sim_soc(with_video_framebuffer=True)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#
+# This file is part of LiteX-Boards.
+
+# SPI Flash read modes of the bochen_kintex7_base target, checked on the LiteSPI flash model with
+# the read benchmark core.
+
+import random
+import unittest
+import importlib.util
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def reverse_bytes(word):
+    return int.from_bytes(word.to_bytes(4, "big"), "little")
+
+def bench_run(read_mode, init, length, burst=1, random=False, mask=0):
+    """Run the read benchmark on the flash model and return {cycles, latency, checksum}."""
+    from migen import run_simulation
+    from litex.gen import LiteXModule
+    from litespi import LiteSPI
+    from litespi.phy.model import LiteSPIPHYModel
+    from litex_boards_vacajk.targets.bochen_kintex7_base import spiflash_module
+    from litex_boards_vacajk.cores.read_bench import WishboneReadBench
+
+    class DUT(LiteXModule):
+        def __init__(self):
+            module = spiflash_module(read_mode)
+            module.total_size = 4*len(init) # Keep simulated memory small.
+            self.phy   = LiteSPIPHYModel(module, init=init)
+            self.core  = LiteSPI(self.phy, mmap_endianness="little")
+            self.bench = WishboneReadBench()
+            self.comb += self.bench.bus.connect(self.core.bus)
+
+    dut = DUT()
+    r   = {}
+    def generator():
+        yield dut.bench._length.storage.eq(length)
+        yield dut.bench._burst.storage.eq(burst)
+        yield dut.bench._random.storage.eq(random)
+        yield dut.bench._mask.storage.eq(mask)
+        yield dut.bench._start.re.eq(1)
+        yield
+        yield dut.bench._start.re.eq(0)
+        yield
+        while not (yield dut.bench._done.status):
+            yield
+        r["cycles"]   = (yield dut.bench._cycles.status)
+        r["latency"]  = (yield dut.bench._latency.status)
+        r["checksum"] = (yield dut.bench._checksum.status)
+    run_simulation(dut, generator())
+    return r
+
+# Test ---------------------------------------------------------------------------------------------
+
+@unittest.skipIf(importlib.util.find_spec("litespi") is None, "LiteSPI not installed.")
+class TestSPIFlash(unittest.TestCase):
+    init = [random.Random(i).getrandbits(32) for i in range(256)]
+
+    def test_module(self):
+        from litespi.opcodes import SpiNorFlashOpCodes as Codes
+        from litex_boards_vacajk.targets.bochen_kintex7_base import spiflash_module
+        for read_mode, opcode, dummy_bits in [
+            ("1-1-1", Codes.READ_1_1_1, 0),
+            ("1-1-4", Codes.READ_1_1_4, 8),
+            ("1-4-4", Codes.READ_1_4_4, 6*4),
+        ]:
+            module = spiflash_module(read_mode)
+            self.assertEqual(module.read_opcode, opcode)
+            self.assertEqual(module.dummy_cycles*module.addr_width if module.fast_mode else 0, dummy_bits)
+            # Quad capability (BIOS QE bit setup) only advertised for quad reads.
+            self.assertEqual(Codes.READ_1_1_4 in module.supported_opcodes, read_mode != "1-1-1")
+        self.assertEqual(spiflash_module("1-4-4", dummy_cycles=10).dummy_cycles, 10)
+        with self.assertRaises(ValueError):
+            spiflash_module("1-1-1", dummy_cycles=8)
+
+    def test_read_modes(self):
+        length   = 32
+        checksum = sum(reverse_bytes(w) for w in self.init[:length]) & 0xffffffff
+        cycles   = {}
+        for read_mode in ["1-1-1", "1-1-4", "1-4-4"]:
+            with self.subTest(read_mode=read_mode):
+                r = bench_run(read_mode, self.init, length)
+                self.assertEqual(r["checksum"], checksum)
+                cycles[read_mode] = r["cycles"]
+        self.assertLess(cycles["1-1-4"], cycles["1-1-1"])
+        self.assertLess(cycles["1-4-4"], cycles["1-1-1"])
+
+    def test_random_bursts(self):
+        # With a null mask, every burst restarts at base.
+        burst, bursts = 8, 4
+        r = bench_run("1-4-4", self.init, burst*bursts, burst=burst, random=True, mask=0)
+        self.assertEqual(r["checksum"], bursts*sum(reverse_bytes(w) for w in self.init[:burst]) & 0xffffffff)
+
+if __name__ == "__main__":
+    unittest.main()
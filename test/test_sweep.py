@@ -0,0 +1,103 @@
+#
+# This file is part of LiteX-Boards.
+
+# Configuration/fmax sweep orchestration and results aggregation, with a stub target writing the
+# Vivado report fixtures (WNS from the requested sys_clk_freq, Ethernet builds failing).
+
+import os
+import csv
+import sys
+import json
+import tempfile
+import unittest
+
+from litex_boards_vacajk.tools.sweep import *
+
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Helpers ------------------------------------------------------------------------------------------
+
+stub_target = """
+import os, sys, json, time, shutil
+args       = sys.argv[1:]
+output_dir = args[args.index("--output-dir") + 1]
+freq       = float(args[args.index("--sys-clk-freq") + 1])
+with open(os.path.join(output_dir, "stub.json"), "w") as f:
+    json.dump({{"args": args, "start": time.time()}}, f)
+time.sleep(0.2)
+if "--with-ethernet" in args:
+    sys.exit(1)
+gateware_dir = os.path.join(output_dir, "gateware")
+os.makedirs(gateware_dir, exist_ok=True)
+with open(os.path.join({fixtures!r}, "bochen_kintex7_base_timing.rpt")) as f:
+    timing = f.read().replace("     -0.412       -3.210", "{{:11.3f}}       -3.210".format(1e9/freq - 8.0))
+with open(os.path.join(gateware_dir, "bochen_kintex7_base_timing.rpt"), "w") as f:
+    f.write(timing)
+shutil.copy(os.path.join({fixtures!r}, "bochen_kintex7_base_utilization_place.rpt"), gateware_dir)
+"""
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.directory  = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.directory.name, "sweep")
+        self.stub       = os.path.join(self.directory.name, "target.py")
+        with open(self.stub, "w") as f:
+            f.write(stub_target.format(fixtures=fixtures))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matrix(self):
+        points = expand_matrix({"with_sdram": [False, True], "l2_size": [0, 8192], "video": [None, "framebuffer"]})
+        # l2_size is dropped without SDRAM, framebuffer needs SDRAM.
+        self.assertEqual([point_name(p) for p in points], [
+            "sys100MHz", "sys100MHz-sdram-l2_0", "sys100MHz-sdram-l2_8192",
+            "sys100MHz-sdram-l2_0-video_framebuffer", "sys100MHz-sdram-l2_8192-video_framebuffer"])
+        with self.assertRaises(ValueError):
+            expand_matrix({"with_pcie": [True]})
+
+    def test_sweep(self):
+        points  = expand_matrix({"sys_clk_freq": [100e6, 125e6, 150e6], "with_ethernet": [False, True]})
+        results = run_sweep(points, self.output_dir, jobs=3, target_cmd=[sys.executable, self.stub])
+        write_results(results, self.output_dir)
+
+        # Per-point build directories, target arguments and concurrent builds.
+        names = [r["name"] for r in results]
+        self.assertEqual(names, [point_name(p) for p in points])
+        starts = []
+        for result in results:
+            with open(os.path.join(self.output_dir, result["name"], "stub.json")) as f:
+                stub = json.load(f)
+            self.assertEqual(stub["args"][-len(point_args(result["point"])):], point_args(result["point"]))
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, result["name"], "sweep.log")))
+            starts.append(stub["start"])
+        self.assertLess(sorted(starts)[2] - sorted(starts)[0], 0.2)
+
+        # WNS/utilization/runtime aggregation, failing (Ethernet) points without reports.
+        results = {r["name"]: r for r in results}
+        self.assertAlmostEqual(results["sys100MHz"]["timing"]["wns"], 2.0)
+        self.assertAlmostEqual(results["sys150MHz"]["timing"]["wns"], -1.333)
+        self.assertEqual(results["sys100MHz"]["utilization"]["lut"], 12051)
+        self.assertEqual(results["sys100MHz"]["utilization"]["bram"], 23.5)
+        self.assertGreaterEqual(results["sys100MHz"]["runtime"], 0.2)
+        failed = results["sys100MHz-eth0"]
+        self.assertEqual(failed["returncode"], 1)
+        self.assertIsNone(failed["timing"])
+
+        # JSON/CSV results and fmax table.
+        with open(os.path.join(self.output_dir, "sweep.json")) as f:
+            sweep = json.load(f)
+        self.assertEqual(len(sweep["results"]), 6)
+        fmax = {entry["config"]["with_ethernet"]: entry["fmax"] for entry in sweep["fmax"]}
+        self.assertEqual(fmax, {False: 125e6, True: None})
+        with open(os.path.join(self.output_dir, "sweep.csv")) as f:
+            rows = {row["name"]: row for row in csv.DictReader(f)}
+        self.assertEqual(float(rows["sys125MHz"]["wns"]), 0.0)
+        self.assertEqual(rows["sys125MHz"]["lut"], "12051")
+        self.assertEqual(rows["sys150MHz-eth0"]["returncode"], "1")
+        self.assertEqual(rows["sys150MHz-eth0"]["wns"], "")
+
+if __name__ == "__main__":
+    unittest.main()
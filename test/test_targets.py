@@ -0,0 +1,226 @@
+#
+# This file is part of LiteX-Boards.
+
+# Elaboration regression/benchmark of the bochen_kintex7_base target: combinations of options are
+# elaborated down to Verilog (no software/gateware compilation), in parallel, and the peak memory
+# and netlist size are checked against the recorded baseline (elaboration_baseline.json). A smoke
+# subset runs by default, the full matrix (hours on a single CPU) is opt-in. Elaboration time
+# depends on the machine and its load: its check is opt-in and relative to the `base` combination
+# elaborated in the same run. Combinations without baseline (video_terminal ones need the Terminus
+# font download) are skipped.
+#
+# Environment:
+# - BOCHEN_TEST_ALL             : Run every valid combination.
+# - BOCHEN_TEST_TIME            : Also check elaboration times (relative to `base`).
+# - BOCHEN_TEST_JOBS            : Parallel elaborations (default: CPU count).
+# - BOCHEN_TEST_FILTER          : Regex selecting the combinations to run (from the full matrix).
+# - BOCHEN_TEST_OUTPUT_DIR      : Build/results directory (default: temporary directory).
+# - BOCHEN_TEST_UPDATE_BASELINE : Record the measurements as new baseline.
+# - BOCHEN_TEST_TOLERANCE       : Allowed regression factors "time,memory,netlist" (default: 1.5,1.2,1.1).
+
+import os
+import re
+import json
+import time
+import resource
+import tempfile
+import unittest
+import itertools
+import importlib.util
+import multiprocessing
+
+baseline_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "elaboration_baseline.json")
+
+# Combinations -------------------------------------------------------------------------------------
+
+def combinations():
+    """Yield (name, target arguments) for every valid option combination."""
+    ethernet_modes = [None] + [(mode, phy) for phy in [0, 1, "dual"] for mode in ["ethernet", "etherbone", "ethernet+etherbone"]]
+    video_modes    = [None, "terminal", "framebuffer", "colorbars"]
+    for with_sdram, with_spi_flash, sdcard, ethernet, video in itertools.product(
+        [False, True], [False, True], [None, "spi-sdcard", "sdcard"], ethernet_modes, video_modes):
+        # Framebuffer needs SDRAM.
+        if video == "framebuffer" and not with_sdram:
+            continue
+        name = []
+        args = []
+        if with_sdram:
+            name.append("sdram")
+            args.append("--with-sdram")
+        if with_spi_flash:
+            name.append("spiflash")
+            args.append("--with-spi-flash")
+        if sdcard is not None:
+            name.append(sdcard.replace("-", ""))
+            args.append(f"--with-{sdcard}")
+        if ethernet is not None:
+            mode, phy = ethernet
+            name.append(f"{mode.replace('+', '_')}{phy}")
+            args += [f"--with-{m}" for m in mode.split("+")] + (["--eth-dual"] if phy == "dual" else ["--eth-phy", str(phy)])
+        if video is not None:
+            name.append(f"video_{video}")
+            args.append(f"--with-video-{video}")
+        yield "-".join(name) or "base", args
+    yield from extra_combinations.items()
+
+# Options outside of the matrix above (DRAM clients, SPI Flash read modes, instrumentation).
+extra_combinations = {
+    "sdram-l2_0-spiflash_144-sdcard_dram-video_capture-perf-sdram_bench" : [
+        "--with-sdram", "--l2-size", "0", "--with-spi-flash", "--spi-flash-read-mode", "1-4-4",
+        "--with-sdcard", "--sdcard-dma", "dram", "--with-video-capture", "--with-perf-counters",
+        "--with-sdram-bench"],
+    "sdram-etherbone0-udp_streamer-perf" : [
+        "--with-sdram", "--with-etherbone", "--with-udp-streamer", "--with-perf-counters"],
+}
+
+# Combinations elaborated by default (small/large SoCs, all Ethernet/SDCard/Video families).
+smoke_combinations = [
+    "base",
+    "sdram-ethernetdual",
+    "spisdcard-etherbonedual-video_colorbars",
+    "sdram-spiflash-sdcard-ethernet_etherbone0-video_framebuffer",
+    *extra_combinations,
+]
+
+# Elaboration --------------------------------------------------------------------------------------
+
+def peak_memory():
+    """Peak RSS of the process in bytes: VmHWM (Linux) when available, ru_maxrss otherwise (which
+    keeps the parent's peak through fork/exec)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])*1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*1024
+
+def elaborate(work):
+    """Elaborate one combination down to Verilog through the target's main(); runs in its own process."""
+    name, args, output_dir = work
+    import sys
+    import warnings
+    import logging
+    warnings.simplefilter("ignore")
+    logging.disable(logging.CRITICAL)
+
+    build_dir = os.path.join(output_dir, name)
+    os.makedirs(build_dir, exist_ok=True)
+    os.chdir(build_dir) # Target/cores write (csr.csv, video terminal font) to the current directory.
+    try:
+        from litex_boards_vacajk.targets import bochen_kintex7_base
+
+        sys.argv = ["bochen_kintex7_base", "--build", "--no-compile", "--output-dir", build_dir] + args
+        start = time.perf_counter()
+        bochen_kintex7_base.main()
+        elapsed = time.perf_counter() - start
+
+        netlist = os.path.join(build_dir, "gateware", "bochen_kintex7_base.v")
+        return name, {
+            "time"    : elapsed,
+            "memory"  : peak_memory(),
+            "netlist" : os.path.getsize(netlist),
+        }
+    except BaseException as e:
+        return name, {"error": f"{type(e).__name__}: {e}"}
+
+def elaborate_all(combos, output_dir, jobs=None):
+    jobs = jobs or os.cpu_count()
+    work = [(name, args, output_dir) for name, args in combos]
+    # One spawned process per combination so peak memory/time are measured per configuration, not
+    # inherited from the test runner (other tests already run in it).
+    with multiprocessing.get_context("spawn").Pool(processes=jobs, maxtasksperchild=1) as pool:
+        return dict(pool.imap_unordered(elaborate, work))
+
+# Baseline -----------------------------------------------------------------------------------------
+
+def load_baseline():
+    if not os.path.exists(baseline_file):
+        return {}
+    with open(baseline_file, "r") as f:
+        return json.load(f)
+
+def save_baseline(results):
+    baseline = load_baseline()
+    baseline.update({name: r for name, r in results.items() if "error" not in r})
+    with open(baseline_file, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=4)
+
+def regressions(result, baseline, tolerance, metrics=("memory", "netlist")):
+    r = []
+    for metric in metrics:
+        if metric in baseline and result[metric] > baseline[metric]*tolerance[metric]:
+            r.append(f"{metric}: {result[metric]:.6g} > {baseline[metric]:.6g} x {tolerance[metric]}")
+    return r
+
+# Test ---------------------------------------------------------------------------------------------
+
+@unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+class TestTargets(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        full           = "BOCHEN_TEST_ALL" in os.environ or "BOCHEN_TEST_FILTER" in os.environ
+        combos_filter  = re.compile(os.environ.get("BOCHEN_TEST_FILTER", ""))
+        cls.time       = "BOCHEN_TEST_TIME" in os.environ
+        cls.combos     = [(n, a) for n, a in combinations() if (full or n in smoke_combinations) and
+            (combos_filter.search(n) or (cls.time and n == "base"))] # Time reference.
+        cls.tmp_dir    = None
+        if "BOCHEN_TEST_OUTPUT_DIR" in os.environ:
+            cls.output_dir = os.path.abspath(os.environ["BOCHEN_TEST_OUTPUT_DIR"])
+        else:
+            cls.tmp_dir    = tempfile.TemporaryDirectory()
+            cls.output_dir = cls.tmp_dir.name
+        jobs           = int(os.environ.get("BOCHEN_TEST_JOBS", "0")) or None
+        cls.results    = elaborate_all(cls.combos, cls.output_dir, jobs)
+
+        # Write results (and optionally update baseline).
+        os.makedirs(cls.output_dir, exist_ok=True)
+        with open(os.path.join(cls.output_dir, "elaboration.json"), "w") as f:
+            json.dump(dict(sorted(cls.results.items())), f, indent=4)
+        if os.environ.get("BOCHEN_TEST_UPDATE_BASELINE"):
+            save_baseline(cls.results)
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.tmp_dir is not None:
+            cls.tmp_dir.cleanup()
+
+    def test_combinations(self):
+        names = [name for name, args in combinations()]
+        self.assertEqual(len(names), len(set(names)))
+        for name, args in combinations():
+            if "--with-video-framebuffer" in args:
+                self.assertIn("--with-sdram", args, name)
+        for name in smoke_combinations:
+            self.assertIn(name, names)
+
+    def test_elaboration(self):
+        for name, args in self.combos:
+            with self.subTest(name=name):
+                self.assertNotIn("error", self.results[name], self.results[name].get("error"))
+
+    def test_regressions(self):
+        tolerance = dict(zip(["time", "memory", "netlist"],
+            map(float, os.environ.get("BOCHEN_TEST_TOLERANCE", "1.5,1.2,1.1").split(","))))
+        baseline  = load_baseline()
+        metrics   = ["memory", "netlist"]
+        if self.time:
+            self.assertIn("base", baseline)
+            self.assertNotIn("error", self.results["base"])
+            metrics.append("time")
+        for name, args in self.combos:
+            result = self.results[name]
+            if "error" in result: # Reported by test_elaboration.
+                continue
+            with self.subTest(name=name):
+                if name not in baseline:
+                    self.skipTest(f"No baseline for {name}, record it with BOCHEN_TEST_UPDATE_BASELINE=1.")
+                reference = baseline[name]
+                if self.time:
+                    result    = dict(result,    time=result["time"]/self.results["base"]["time"])
+                    reference = dict(reference, time=reference["time"]/baseline["base"]["time"])
+                self.assertEqual(regressions(result, reference, tolerance, metrics), [])
+
+if __name__ == "__main__":
+    unittest.main()
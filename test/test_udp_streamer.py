@@ -0,0 +1,134 @@
+#
+# This file is part of LiteX-Boards.
+
+# DRAM UDP Streamer core, simulated against a DRAM native port model and a UDP port sink.
+
+import random
+import unittest
+import importlib.util
+
+# Models -------------------------------------------------------------------------------------------
+
+def dram_model(port, mem):
+    """Native port read model: in-order read data, one word per cycle."""
+    queue   = []
+    current = None
+    yield port.cmd.ready.eq(1)
+    while True:
+        if (yield port.cmd.valid):
+            queue.append((yield port.cmd.addr))
+        if current is not None and (yield port.rdata.ready):
+            current = None
+        if current is None and queue:
+            current = queue.pop(0)
+        yield port.rdata.valid.eq(current is not None)
+        yield port.rdata.data.eq(0 if current is None else mem[current])
+        yield
+
+def udp_sink_model(sink, packets, seed=0):
+    """UDP port sink with random backpressure, collecting packets as (params, bytes)."""
+    rng  = random.Random(seed)
+    data = b""
+    while True:
+        yield sink.ready.eq(rng.random() > 0.3)
+        yield
+        if (yield sink.valid) and (yield sink.ready):
+            data += (yield sink.data).to_bytes(len(sink.data)//8, "little")
+            if (yield sink.last):
+                params = {
+                    "ip_address" : (yield sink.ip_address),
+                    "dst_port"   : (yield sink.dst_port),
+                    "length"     : (yield sink.length),
+                    "last_be"    : (yield sink.last_be),
+                }
+                packets.append((params, data))
+                data = b""
+
+# Test ---------------------------------------------------------------------------------------------
+
+@unittest.skipIf(importlib.util.find_spec("liteeth") is None or importlib.util.find_spec("litedram") is None,
+    "LiteEth/LiteDRAM not installed.")
+class TestUDPStreamer(unittest.TestCase):
+    def stream(self, base, length, packet_size, max_packet_size=1472, dram_dw=64, udp_dw=32):
+        from migen import passive, run_simulation
+        from litex.gen import LiteXModule
+        from litex.soc.interconnect import stream
+        from litedram.common import LiteDRAMNativePort
+        from liteeth.common import eth_udp_user_description
+        from litex_boards_vacajk.cores.udp_streamer import DRAMUDPStreamer
+
+        class UDPPort:
+            def __init__(self):
+                self.sink = stream.Endpoint(eth_udp_user_description(udp_dw))
+
+        rng = random.Random(1)
+        mem = [rng.getrandbits(dram_dw) for _ in range(64)]
+
+        port     = LiteDRAMNativePort("both", address_width=16, data_width=dram_dw)
+        udp_port = UDPPort()
+        dut      = DRAMUDPStreamer(port, udp_port, ip_address=0xc0a8016a, dst_port=5000,
+            packet_size=max_packet_size, max_packet_size=max_packet_size)
+
+        packets = []
+        r       = {}
+        def generator():
+            yield dut._base.storage.eq(base)
+            yield dut._length.storage.eq(length)
+            yield dut._packet_size.storage.eq(packet_size)
+            yield dut._start.re.eq(1)
+            yield
+            yield dut._start.re.eq(0)
+            yield
+            for _ in range(10000):
+                if (yield dut._done.status):
+                    break
+                yield
+            r["done"]    = (yield dut._done.status)
+            r["packets"] = (yield dut._packets.status)
+        run_simulation(dut, [generator(), passive(dram_model)(port, mem), passive(udp_sink_model)(udp_port.sink, packets)])
+
+        mem_bytes = b"".join(w.to_bytes(dram_dw//8, "little") for w in mem)
+        return r, packets, mem_bytes
+
+    def test_stream(self):
+        base, length, packet_size = 16, 200, 64
+        r, packets, mem_bytes = self.stream(base, length, packet_size)
+        self.assertTrue(r["done"])
+        self.assertEqual(r["packets"], 4)
+        self.assertEqual([len(d) for p, d in packets], [64, 64, 64, 8])
+        for params, data in packets:
+            self.assertEqual(params["length"], len(data))
+            self.assertEqual(params["ip_address"], 0xc0a8016a)
+            self.assertEqual(params["dst_port"], 5000)
+            self.assertEqual(params["last_be"], 0b1000)
+        self.assertEqual(b"".join(d for p, d in packets), mem_bytes[base:base + length])
+
+    def test_alignment(self):
+        # Base/Length truncated to DRAM words, packet size to UDP words.
+        r, packets, mem_bytes = self.stream(base=21, length=60, packet_size=30)
+        self.assertEqual([len(d) for p, d in packets], [28, 28])
+        self.assertEqual(b"".join(d for p, d in packets), mem_bytes[16:16 + 56])
+
+    def test_packet_size_clamp(self):
+        # Below one UDP word: one word packets (instead of never ending the packet).
+        r, packets, mem_bytes = self.stream(base=0, length=16, packet_size=0)
+        self.assertTrue(r["done"])
+        self.assertEqual([len(d) for p, d in packets], [4, 4, 4, 4])
+        # Above the MTU payload: max_packet_size packets.
+        r, packets, mem_bytes = self.stream(base=0, length=200, packet_size=0xffff, max_packet_size=64)
+        self.assertTrue(r["done"])
+        self.assertEqual([len(d) for p, d in packets], [64, 64, 64, 8])
+        self.assertEqual(b"".join(d for p, d in packets), mem_bytes[:200])
+
+    @unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+    def test_target(self):
+        from litex_boards_vacajk.targets.bochen_kintex7_base import BaseSoC
+        soc = BaseSoC(with_sdram=True, with_udp_streamer=True, integrated_rom_size=0x10000)
+        self.assertTrue(hasattr(soc, "udp_streamer"))
+        self.assertFalse(hasattr(soc, "ethphy1"))
+        # Second PHY without consumer.
+        with self.assertRaises(ValueError):
+            BaseSoC(with_sdram=True, with_udp_streamer=True, eth_dual=True, integrated_rom_size=0x10000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+#
+# This file is part of LiteX-Boards.
+
+# Video timings support of the bochen_kintex7_base target: HDMI clocks and DDR3 bandwidth budget.
+
+import unittest
+import importlib.util
+
+# Test ---------------------------------------------------------------------------------------------
+
+@unittest.skipIf(importlib.util.find_spec("litex") is None, "LiteX not installed.")
+class TestVideo(unittest.TestCase):
+    def test_clk_freq(self):
+        from litex.soc.cores.video import video_timings
+        from litex_boards_vacajk.targets.bochen_kintex7_base import video_clk_freq
+        for name in ["640x480@60Hz", "800x600@60Hz", "1280x720@60Hz", "1920x1080@30Hz"]:
+            with self.subTest(timings=name):
+                pix_clk = video_timings[name]["pix_clk"]
+                freq    = video_clk_freq(pix_clk)
+                self.assertLess(abs(freq/pix_clk - 1), 1e-2)
+                self.assertLess(abs(freq/pix_clk - 1), 0.5e-2) # CEA-861 tolerance.
+                # hdmi5x from the same VCO: integer 5x divider of a VCO multiple (by 1/8 steps) of clkin.
+                self.assertTrue(any(abs(50e6*m/8/d - 5*freq*n) < 1 for d in range(1, 6) for m in range(16, 513) for n in range(1, 26)))
+        with self.assertRaises(ValueError):
+            video_clk_freq(video_timings["1920x1080@60Hz"]["pix_clk"])
+
+    def test_bandwidth(self):
+        from litex_boards_vacajk.targets.bochen_kintex7_base import video_bandwidth
+        budget = video_bandwidth(100e6, l2_size=8192, framebuffer_timings="1280x720@60Hz")
+        self.assertEqual(budget["framebuffer"], 4*74.25e6)
+        self.assertGreater(budget["headroom"], 0)
+        # Without L2 cache, each CPU access is a full DRAM word.
+        self.assertGreater(video_bandwidth(100e6, l2_size=0)["cpu"], budget["cpu"])
+        # Capture and framebuffer both at 720p do not fit at a low sys_clk_freq.
+        self.assertLess(video_bandwidth(25e6, l2_size=0,
+            framebuffer_timings = "1280x720@60Hz",
+            capture_timings     = "1280x720@60Hz")["headroom"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+#
+# This file is part of LiteX-Boards.
+
+# HDMI input capture datapath, simulated from synthetic (unaligned/skewed) TMDS words to a DRAM
+# native port model.
+
+import random
+import unittest
+import importlib.util
+
+# Helpers ------------------------------------------------------------------------------------------
+
+small_timings = {
+    "pix_clk"       : 1e6,
+    "h_active"      : 16,
+    "h_blanking"    : 24,
+    "h_sync_offset" : 4,
+    "h_sync_width"  : 4,
+    "v_active"      : 4,
+    "v_blanking"    : 3,
+    "v_sync_offset" : 1,
+    "v_sync_width"  : 1,
+}
+
+color_bars = [0xffffff, 0xffff00, 0x00ffff, 0x00ff00, 0xff00ff, 0xff0000, 0x0000ff, 0x000000]
+
+def dram_write_model(port, mem):
+    """Native port write model: writes are accepted immediately, in order."""
+    queue = []
+    yield port.cmd.ready.eq(1)
+    yield port.wdata.ready.eq(1)
+    while True:
+        yield
+        if (yield port.cmd.valid) and (yield port.cmd.we):
+            queue.append((yield port.cmd.addr))
+        if (yield port.wdata.valid) and queue:
+            mem[queue.pop(0)] = (yield port.wdata.data)
+
+def i2c_read(pads, address, offset, length, period=8):
+    """Bit-banged I2C master: random read of `length` bytes at `offset`."""
+    data = []
+    def wait():
+        for _ in range(period):
+            yield
+    def set(scl, sda):
+        yield pads.scl.eq(scl)
+        yield pads.sda_master.eq(sda)
+        yield from wait()
+    def start():
+        yield from set(1, 1)
+        yield from set(1, 0)
+        yield from set(0, 0)
+    def byte(value):
+        for i in range(8):
+            bit = (value >> (7 - i)) & 1
+            yield from set(0, bit)
+            yield from set(1, bit)
+            yield from set(0, bit)
+        # Ack from slave.
+        yield from set(0, 1)
+        yield from set(1, 1)
+        ack = not (yield pads.sda_line)
+        yield from set(0, 1)
+        return ack
+    def read(last):
+        value = 0
+        for i in range(8):
+            yield from set(0, 1)
+            yield from set(1, 1)
+            value = (value << 1) | (yield pads.sda_line)
+            yield from set(0, 1)
+        yield from set(0, int(last))
+        yield from set(1, int(last))
+        yield from set(0, 1)
+        return value
+    acks = []
+    yield from start()
+    acks.append((yield from byte(address << 1)))
+    acks.append((yield from byte(offset)))
+    yield from start()
+    acks.append((yield from byte((address << 1) | 1)))
+    for i in range(length):
+        data.append((yield from read(last=(i == length - 1))))
+    yield from set(0, 0)
+    yield from set(1, 0)
+    yield from set(1, 1) # Stop.
+    return acks, data
+
+# Test ---------------------------------------------------------------------------------------------
+
+@unittest.skipIf(importlib.util.find_spec("litedram") is None, "LiteDRAM not installed.")
+class TestVideoCapture(unittest.TestCase):
+    def test_edid(self):
+        from migen import Signal, run_simulation
+        from litex.gen import LiteXModule
+        from litex.soc.cores.video import video_timings
+        from litex_boards_vacajk.cores.video_capture import edid_data, EDID
+
+        edid = edid_data(video_timings["1280x720@60Hz"])
+        self.assertEqual(len(edid), 128)
+        self.assertEqual(sum(edid) & 0xff, 0)
+        self.assertEqual(edid[54:56], [7425 & 0xff, 7425 >> 8]) # Preferred: 74.25MHz.
+
+        class Pads:
+            def __init__(self):
+                self.scl        = Signal(reset=1)
+                self.sda_master = Signal(reset=1)
+                self.sda_line   = Signal()
+
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.pads = pads = Pads()
+                self.edid = EDID(edid)
+                # Open-Drain bus.
+                self.comb += [
+                    pads.sda_line.eq(pads.sda_master & ~self.edid.sda_oe),
+                    self.edid.scl.eq(pads.scl),
+                    self.edid.sda_i.eq(pads.sda_line),
+                ]
+
+        dut = DUT()
+        r   = {}
+        def generator():
+            r["acks"], r["data"] = yield from i2c_read(dut.pads, 0x50, 8, 16)
+        run_simulation(dut, generator())
+        self.assertEqual(r["acks"], [True]*3)
+        self.assertEqual(r["data"], edid[8:24])
+
+    def test_decoder(self):
+        from migen import run_simulation
+        from litex.gen import LiteXModule
+        from litex.soc.cores.code_tmds import TMDSEncoder
+        from litex_boards_vacajk.cores.video_capture import TMDSDecoder
+
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.encoder = TMDSEncoder()
+                self.decoder = TMDSDecoder()
+                self.comb += self.decoder.raw.eq(self.encoder.out)
+
+        rng     = random.Random(0)
+        symbols = [(1, 0, rng.randrange(256)) if rng.random() > 0.2 else (0, rng.randrange(4), 0) for _ in range(256)]
+        latency = 5 # Encoder (4) + Decoder (1).
+        dut     = DUT()
+        decoded = []
+        def generator():
+            for de, c, d in symbols + [(0, 0, 0)]*latency:
+                yield dut.encoder.de.eq(de)
+                yield dut.encoder.c.eq(c)
+                yield dut.encoder.d.eq(d)
+                yield
+                de, c, d = (yield dut.decoder.de), (yield dut.decoder.c), (yield dut.decoder.d)
+                decoded.append((de, c if not de else 0, d if de else 0))
+        run_simulation(dut, generator())
+        self.assertEqual(decoded[latency:latency + len(symbols)], symbols)
+
+    def test_capture(self):
+        from migen import ClockDomain, run_simulation, passive
+        from litex.gen import LiteXModule
+        from litedram.common import LiteDRAMNativePort
+        from litex_boards_vacajk.cores.video_capture import TMDSPatternGenerator, VideoCapture
+
+        hres, vres, dram_dw = small_timings["h_active"], small_timings["v_active"], 64
+
+        class DUT(LiteXModule):
+            def __init__(self):
+                self.cd_hdmi_in = ClockDomain()
+                self.port       = LiteDRAMNativePort("write", address_width=16, data_width=dram_dw)
+                self.source     = TMDSPatternGenerator(small_timings)
+                self.capture    = VideoCapture(self.source, self.port, hres=hres, vres=vres, nbuffers=2,
+                    align_timeout = 64,
+                    cdc_depth     = 16,
+                )
+
+        dut = DUT()
+        mem = {}
+        r   = {}
+        def generator():
+            dma = dut.capture.dma
+            yield dma._base.storage.eq(0x100)
+            yield dma._enable.storage.eq(1)
+            for _ in range(4000):
+                yield
+                if (yield dma._frame_count.status) >= 3:
+                    break
+            for name in ["frame_count", "frame_index", "frame_words", "frame_ready"]:
+                r[name] = (yield getattr(dma, "_" + name).status)
+            for name in ["aligned", "synced", "hres", "vres"]:
+                r[name] = (yield getattr(dut.capture, "_" + name).status)
+        run_simulation(dut, [generator(), passive(dram_write_model)(dut.port, mem)],
+            clocks={"sys": 10, "hdmi_in": 14})
+
+        self.assertEqual(r["aligned"], 0b111)
+        self.assertEqual(r["synced"], 1)
+        self.assertEqual((r["hres"], r["vres"]), (hres, vres))
+        self.assertEqual(r["frame_count"], 3)
+        self.assertEqual(r["frame_ready"], 1)
+        self.assertEqual(r["frame_words"], hres*vres)
+        # Both ring buffers hold a color bars frame.
+        ratio = dram_dw//32
+        for index in range(2):
+            base   = 0x100//(dram_dw//8) + index*(4*hres*vres)//(dram_dw//8)
+            pixels = []
+            for i in range(hres*vres//ratio):
+                word = mem[base + i]
+                pixels += [(word >> (32*n)) & 0xffffffff for n in range(ratio)]
+            self.assertEqual(pixels, [color_bars[x//(hres//8)] for y in range(vres) for x in range(hres)])
+
+if __name__ == "__main__":
+    unittest.main()
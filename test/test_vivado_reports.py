@@ -0,0 +1,88 @@
+#
+# This file is part of LiteX-Boards.
+
+# Vivado timing/utilization reports ingestion and history limits, on saved report fixtures.
+
+import os
+import copy
+import tempfile
+import unittest
+
+from litex_boards_vacajk.tools.vivado_reports import *
+
+fixtures   = os.path.join(os.path.dirname(__file__), "fixtures")
+build_name = "bochen_kintex7_base"
+
+# Test ---------------------------------------------------------------------------------------------
+
+class TestVivadoReports(unittest.TestCase):
+    def setUp(self):
+        self.reports = read_timing_reports(fixtures, build_name)
+
+    def test_timing_summary(self):
+        with open(os.path.join(fixtures, f"{build_name}_timing.rpt")) as f:
+            text = f.read()
+        timing = parse_timing_summary(text)
+        self.assertEqual((timing["wns"], timing["tns"], timing["whs"]), (-0.412, -3.21, 0.052))
+        self.assertFalse(timing["met"])
+        clocks = parse_clock_summary(text)
+        self.assertEqual(clocks["main_crg_s7mmcm0_clkout2"], {"period": 2.0, "frequency": 500.0, "parent": "clk50"})
+        self.assertIsNone(clocks["eth_rx_clk"]["parent"])
+
+    def test_clocks(self):
+        clocks = self.reports["clocks"]
+        # Clock domains (from the target's clocks map).
+        self.assertEqual(clocks["sys"]["wns"], -0.412)
+        self.assertEqual(clocks["sys"]["frequency"], 125.0)
+        self.assertEqual(clocks["hdmi"]["vivado_name"], "main_crg_s7mmcm1_clkout0")
+        self.assertIsNone(clocks["sys4x"]["wns"])
+        self.assertEqual(clocks["sys4x"]["inter_whs"], -0.021)
+        self.assertEqual(clocks["eth_clocks:rx"]["inter_wns"], -0.24)
+        interactions = [(i["path_group"], i["from"], i["to"]) for i in self.reports["interactions"]]
+        self.assertIn((None, "sys4x", "sys"), interactions)
+        self.assertIn(("**async_default**", "sys", "sys"), interactions)
+
+    def test_paths(self):
+        paths = self.reports["paths"]
+        self.assertEqual([p["slack"] for p in paths], [-0.412, -0.305, -0.24])
+        self.assertEqual(paths[0]["source"], "main_sdram_bankmachine3_row_reg[11]/C")
+        self.assertEqual(paths[0]["destination_clock"], "sys")
+        self.assertEqual((paths[0]["path_type"], paths[0]["logic_levels"]), ("Setup", 9))
+        self.assertEqual((paths[0]["logic_delay"], paths[0]["route_delay"]), (2.101, 6.211))
+        self.assertEqual(paths[2]["source_clock"], "eth_clocks:rx")
+        self.assertEqual(len(read_timing_reports(fixtures, build_name, max_paths=1)["paths"]), 1)
+
+    def test_utilization(self):
+        utilization = self.reports["utilization"]
+        self.assertEqual((utilization["lut"], utilization["ff"], utilization["bram"]), (12051, 14720, 23.5))
+        self.assertEqual((utilization["dsp"], utilization["mmcm"], utilization["mmcm_util"]), (4, 2, 20.0))
+
+    def test_history(self):
+        entry = history_entry(self.reports, label="test")
+        self.assertNotIn("clk50", entry["clocks"])
+        self.assertEqual(entry["clocks"]["sys"]["whs"], -0.021)
+        self.assertEqual(entry["failing_paths"], 3)
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "timing.jsonl")
+            self.assertEqual(read_history(filename), [])
+            append_history(filename, entry)
+            append_history(filename, entry)
+            self.assertEqual(read_history(filename)[-1]["clocks"], entry["clocks"])
+
+    def test_limits(self):
+        entry    = history_entry(self.reports)
+        warnings = check_limits(entry, limits={"wns": {"sys": -0.5, "eth_clocks:rx": -0.5, "eth_rx_clk": -0.5}, "whs": None})
+        self.assertEqual(warnings, [])
+        # WNS drop and utilization increase from the previous build.
+        previous = copy.deepcopy(entry)
+        previous["clocks"]["hdmi"]["wns"] = 2.8
+        previous["utilization"]["lut"]    = 10000
+        warnings = check_limits(entry, previous, limits={"wns": None, "whs": None})
+        self.assertEqual(len(warnings), 2)
+        self.assertTrue(warnings[0].startswith("hdmi: WNS"))
+        self.assertTrue(warnings[1].startswith("LUT: 10000 -> 12051"))
+        warnings = check_limits(entry, limits={"wns": None, "whs": None, "utilization": {"mmcm": 15}})
+        self.assertEqual(warnings, ["MMCM: 20.0% utilization > 15%."])
+
+if __name__ == "__main__":
+    unittest.main()